@@ -0,0 +1,42 @@
+"""add cases deadline check constraint
+
+Revision ID: 0b6d4e8a2c57
+Revises: f5c8a2d91e67
+Create Date: 2026-10-17 17:21:06.385912
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b6d4e8a2c57"
+down_revision: str | Sequence[str] | None = "f5c8a2d91e67"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дедлайн — процессуальный срок: неверные даты миграция не исправляет сама, а останавливается со списком дел
+    invalid = op.get_bind().execute(sa.text("SELECT id FROM cases WHERE deadline < start_date ORDER BY id")).scalars().all()
+    if invalid:
+        sample = ", ".join(str(case_id) for case_id in invalid[:10])
+        raise RuntimeError(
+            f"{len(invalid)} case(s) have deadline before start_date, e.g. {sample}. "
+            "Fix their dates, then rerun the migration to add ck_cases_deadline_after_start."
+        )
+
+    # NOT VALID + VALIDATE: проверка существующих строк идёт без блокировки записи в cases.
+    # VALIDATE — в отдельной транзакции: иначе блокировка ACCESS EXCLUSIVE от ADD CONSTRAINT держалась бы до конца проверки.
+    op.execute("ALTER TABLE cases ADD CONSTRAINT ck_cases_deadline_after_start CHECK (deadline >= start_date) NOT VALID")
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE cases VALIDATE CONSTRAINT ck_cases_deadline_after_start")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ck_cases_deadline_after_start", "cases", type_="check")
@@ -0,0 +1,44 @@
+"""add cases deadline reminders
+
+Revision ID: 1c7f3a9e5d24
+Revises: 0b6d4e8a2c57
+Create Date: 2026-10-17 18:40:17.526093
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1c7f3a9e5d24"
+down_revision: str | Sequence[str] | None = "0b6d4e8a2c57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("cases", sa.Column("deadline_notified_at", sa.DateTime(timezone=True), nullable=True))
+    # Новое значение "deadline" длиннее прежних: VARCHAR(7) -> VARCHAR(8), без перезаписи таблицы
+    op.alter_column("case_events", "event_type", existing_type=sa.String(length=7), type_=sa.String(length=8), existing_nullable=False)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_cases_deadline_pending",
+            "cases",
+            ["deadline"],
+            unique=False,
+            postgresql_where=sa.text("deleted_at IS NULL AND deadline_notified_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_cases_deadline_pending", table_name="cases", postgresql_concurrently=True)
+    op.execute("DELETE FROM case_events WHERE event_type = 'deadline'")
+    op.alter_column("case_events", "event_type", existing_type=sa.String(length=8), type_=sa.String(length=7), existing_nullable=False)
+    op.drop_column("cases", "deadline_notified_at")
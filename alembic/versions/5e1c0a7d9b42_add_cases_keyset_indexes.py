@@ -0,0 +1,31 @@
+"""add cases keyset indexes
+
+Revision ID: 5e1c0a7d9b42
+Revises: 40aad378fece
+Create Date: 2026-10-17 10:12:41.218334
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e1c0a7d9b42"
+down_revision: str | Sequence[str] | None = "40aad378fece"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_cases_deadline_id", "cases", ["deadline", "id"], unique=False, postgresql_where=sa.text("deleted_at IS NULL"))
+    op.create_index("ix_cases_created_at_id", "cases", ["created_at", "id"], unique=False, postgresql_where=sa.text("deleted_at IS NULL"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_cases_created_at_id", table_name="cases", postgresql_where=sa.text("deleted_at IS NULL"))
+    op.drop_index("ix_cases_deadline_id", table_name="cases", postgresql_where=sa.text("deleted_at IS NULL"))
@@ -0,0 +1,94 @@
+"""add case_stats table
+
+Revision ID: 9a3f6c2e81d5
+Revises: 5e1c0a7d9b42
+Create Date: 2026-10-17 11:04:27.530915
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9a3f6c2e81d5"
+down_revision: str | Sequence[str] | None = "5e1c0a7d9b42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CASE_STATUSES = ("archive", "in_work", "debt", "executed", "withdrawn", "cancelled", "fssp")
+
+# assigned_user_id без внешнего ключа: строки удалённого пользователя не удаляются каскадом,
+# а переходят в группу без эксперта — как и его дела (ON DELETE SET NULL)
+FOLD_EXPERT_FUNCTION = """
+CREATE OR REPLACE FUNCTION case_stats_fold_expert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO case_stats AS s (id, status, assigned_user_id, client_id, month, cases_count,
+                                 cost, bank_transfer_amount, cash_amount, remaining_debt)
+    SELECT gen_random_uuid(), status, NULL, client_id, month, cases_count,
+           cost, bank_transfer_amount, cash_amount, remaining_debt
+    FROM case_stats
+    WHERE assigned_user_id = OLD.id
+    ON CONFLICT (status, assigned_user_id, client_id, month) DO UPDATE SET
+        cases_count = s.cases_count + excluded.cases_count,
+        cost = s.cost + excluded.cost,
+        bank_transfer_amount = s.bank_transfer_amount + excluded.bank_transfer_amount,
+        cash_amount = s.cash_amount + excluded.cash_amount,
+        remaining_debt = s.remaining_debt + excluded.remaining_debt;
+    DELETE FROM case_stats WHERE assigned_user_id = OLD.id;
+    RETURN OLD;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "case_stats",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("status", sa.Enum(*CASE_STATUSES, name="casestatus", native_enum=False), nullable=False),
+        sa.Column("assigned_user_id", sa.UUID(), nullable=True),
+        sa.Column("client_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("cases_count", sa.Integer(), nullable=False),
+        sa.Column("cost", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("bank_transfer_amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("cash_amount", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("remaining_debt", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.ForeignKeyConstraint(["client_id"], ["clients.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_case_stats_group",
+        "case_stats",
+        ["status", "assigned_user_id", "client_id", "month"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+    op.execute(FOLD_EXPERT_FUNCTION)
+    op.execute("CREATE TRIGGER users_fold_case_stats AFTER DELETE ON users FOR EACH ROW EXECUTE FUNCTION case_stats_fold_expert()")
+    # Начальное заполнение по существующим делам; дальше свод ведёт CaseService
+    op.execute(
+        """
+        INSERT INTO case_stats (id, status, assigned_user_id, client_id, month, cases_count,
+                                cost, bank_transfer_amount, cash_amount, remaining_debt)
+        SELECT gen_random_uuid(), status, assigned_user_id, client_id,
+               date_trunc('month', start_date AT TIME ZONE 'UTC')::date, count(*),
+               coalesce(sum(cost), 0), coalesce(sum(bank_transfer_amount), 0),
+               coalesce(sum(cash_amount), 0), coalesce(sum(remaining_debt), 0)
+        FROM cases
+        WHERE deleted_at IS NULL
+        GROUP BY 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER users_fold_case_stats ON users")
+    op.execute("DROP FUNCTION case_stats_fold_expert()")
+    op.drop_index("uq_case_stats_group", table_name="case_stats", postgresql_nulls_not_distinct=True)
+    op.drop_table("case_stats")
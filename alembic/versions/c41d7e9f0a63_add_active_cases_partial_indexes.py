@@ -0,0 +1,43 @@
+"""add active cases partial indexes
+
+Revision ID: c41d7e9f0a63
+Revises: 9a3f6c2e81d5
+Create Date: 2026-10-17 12:21:09.447102
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c41d7e9f0a63"
+down_revision: str | Sequence[str] | None = "9a3f6c2e81d5"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACTIVE = sa.text("deleted_at IS NULL")
+
+INDEXES = {
+    "ix_cases_active_status_deadline": ["status", "deadline"],
+    "ix_cases_active_expert_deadline": ["assigned_user_id", "deadline"],
+    "ix_cases_active_client_start_date": ["client_id", "start_date"],
+    "ix_cases_active_start_date": ["start_date"],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в cases на время построения, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "cases", columns, unique=False, postgresql_where=ACTIVE, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="cases", postgresql_concurrently=True)
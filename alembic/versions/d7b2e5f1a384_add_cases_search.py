@@ -0,0 +1,65 @@
+"""add cases full-text and trigram search
+
+Revision ID: d7b2e5f1a384
+Revises: c41d7e9f0a63
+Create Date: 2026-10-17 14:05:31.218604
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d7b2e5f1a384"
+down_revision: str | Sequence[str] | None = "c41d7e9f0a63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+ACTIVE = sa.text("deleted_at IS NULL")
+
+# Копия CASE_SEARCH_VECTOR_SQL и CASE_SEARCH_TEXT_SQL из src/app/services/case/models.py на момент миграции
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(number, '') || ' ' || coalesce(case_number, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(plaintiff, '') || ' ' || coalesce(defendant, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(object_address, '')), 'C') || "
+    "setweight(to_tsvector('russian', coalesce(authority, '')), 'D')"
+)
+SEARCH_TEXT_SQL = (
+    "coalesce(number, '') || ' ' || coalesce(case_number, '') || ' ' || coalesce(plaintiff, '') || ' ' || "
+    "coalesce(defendant, '') || ' ' || coalesce(object_address, '') || ' ' || coalesce(authority, '')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Генерируемые STORED-колонки: таблица переписывается один раз, дальше значения считает сам PostgreSQL при записи
+    op.add_column("cases", sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    op.add_column("cases", sa.Column("search_text", sa.Text(), sa.Computed(SEARCH_TEXT_SQL, persisted=True)))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_cases_search_vector", "cases", ["search_vector"], postgresql_using="gin", postgresql_where=ACTIVE, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_cases_search_text",
+            "cases",
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+            postgresql_where=ACTIVE,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_cases_search_text", table_name="cases", postgresql_concurrently=True)
+        op.drop_index("ix_cases_search_vector", table_name="cases", postgresql_concurrently=True)
+    op.drop_column("cases", "search_text")
+    op.drop_column("cases", "search_vector")
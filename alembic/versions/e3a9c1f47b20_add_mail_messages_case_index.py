@@ -0,0 +1,38 @@
+"""add mail messages case index
+
+Revision ID: e3a9c1f47b20
+Revises: d7b2e5f1a384
+Create Date: 2026-10-17 15:12:44.903518
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3a9c1f47b20"
+down_revision: str | Sequence[str] | None = "d7b2e5f1a384"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_mail_messages_case_processed",
+            "mail_messages",
+            ["case_id", "processed_at"],
+            unique=False,
+            postgresql_where=sa.text("case_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_mail_messages_case_processed", table_name="mail_messages", postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""add case_events table
+
+Revision ID: f5c8a2d91e67
+Revises: e3a9c1f47b20
+Create Date: 2026-10-17 16:03:52.114870
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f5c8a2d91e67"
+down_revision: str | Sequence[str] | None = "e3a9c1f47b20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+CASE_EVENT_TYPES = ("created", "updated", "deleted")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "case_events",
+        sa.Column("id", sa.BigInteger(), sa.Identity(always=False), nullable=False),
+        sa.Column("case_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.Enum(*CASE_EVENT_TYPES, name="caseeventtype", native_enum=False), nullable=False),
+        sa.Column("changes", sa.JSON(none_as_null=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=True),
+        sa.ForeignKeyConstraint(["case_id"], ["cases.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_case_events_case_created", "case_events", ["case_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_case_events_case_created", table_name="case_events")
+    op.drop_table("case_events")
@@ -0,0 +1,46 @@
+"""
+Пропускная способность bcrypt на этом хосте.
+
+Для каждого cost factor считает хеши в секунду на одном ядре и на всех воркерах пула процессов.
+По числу «хешей в секунду на ядро» оценивается, сколько логинов в секунду выдержит под.
+
+Использование:
+    uv run python benchmarks/bcrypt_throughput.py --rounds 10 11 12 13 --duration 3 --workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.app.core.auth.security import hash_password
+
+
+def hash_for(rounds: int, duration: float) -> int:
+    """Хеширует в цикле duration секунд, возвращает число готовых хешей"""
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        hash_password("benchmark-password", rounds)
+        done += 1
+    return done
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"{'rounds':>6} {'ms/hash':>9} {'hash/s/core':>12} {'hash/s total':>13} ({args.workers} workers)")
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for rounds in args.rounds:
+            single = hash_for(rounds, args.duration) / args.duration
+            futures = [executor.submit(hash_for, rounds, args.duration) for _ in range(args.workers)]
+            total = sum(future.result() for future in futures) / args.duration
+            print(f"{rounds:>6} {1000 / single:>9.1f} {total / args.workers:>12.1f} {total:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Нагрузочный сценарий «утренний шторм логинов».
+
+Параллельно шлёт поток логинов и измеряет задержку несвязанного эндпоинта.
+Пока bcrypt выполнялся прямо в event loop, p99 пробного запроса рос до сотен миллисекунд.
+
+Использование:
+    uv run python benchmarks/login_storm.py --base-url http://localhost:8000 \\
+        --email admin@example.com --password secret --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def login_storm(client: httpx.AsyncClient, email: str, password: str, logins: int, concurrency: int) -> list[int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    codes: list[int] = []
+
+    async def one_login() -> None:
+        async with semaphore:
+            response = await client.post("/api/users/login", json={"email": email, "password": password})
+            codes.append(response.status_code)
+
+    await asyncio.gather(*(one_login() for _ in range(logins)))
+    return codes
+
+
+async def probe(client: httpx.AsyncClient, path: str, stop: asyncio.Event, interval: float) -> list[float]:
+    latencies: list[float] = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probe-path", default="/docs")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        baseline_stop = asyncio.Event()
+        baseline_task = asyncio.create_task(probe(client, args.probe_path, baseline_stop, args.probe_interval))
+        await asyncio.sleep(2)
+        baseline_stop.set()
+        baseline = await baseline_task
+
+        storm_stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_path, storm_stop, args.probe_interval))
+        started = time.perf_counter()
+        codes = await login_storm(client, args.email, args.password, args.logins, args.concurrency)
+        elapsed = time.perf_counter() - started
+        storm_stop.set()
+        during_storm = await probe_task
+
+    print(f"Логинов: {len(codes)} за {elapsed:.2f} с ({len(codes) / elapsed:.1f}/с), коды: {sorted(set(codes))}")
+    for title, values in (("Без нагрузки", baseline), ("Во время шторма", during_storm)):
+        print(
+            f"{title}: {args.probe_path} n={len(values)} "
+            f"p50={statistics.median(values):.1f} мс p95={percentile(values, 95):.1f} мс p99={percentile(values, 99):.1f} мс"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.app.core.auth.session import SessionUser, get_session_manager
+from src.app.core.config import settings
+from src.app.services.user.models import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+
+class SessionUserCache:
+    """
+    LRU-кэш снимков пользователей по session_id внутри процесса.
+    TTL записи ограничивает устаревание, если сообщение об инвалидации не дошло.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, SessionUser]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, session_id: str) -> SessionUser | None:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[session_id]
+            return None
+
+        self._entries.move_to_end(session_id)
+        return user
+
+    def set(self, session_id: str, user: SessionUser) -> None:
+        self._entries[session_id] = (time.monotonic() + self.ttl_seconds, user)
+        self._entries.move_to_end(session_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, session_id: str) -> None:
+        self._entries.pop(session_id, None)
+
+    def discard_user(self, user_id: uuid.UUID) -> None:
+        stale = [session_id for session_id, (_, user) in self._entries.items() if user.id == user_id]
+        for session_id in stale:
+            del self._entries[session_id]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+session_user_cache = SessionUserCache(max_size=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def apply_invalidation(message: str) -> None:
+    kind, _, value = message.partition(":")
+    if kind == "user":
+        session_user_cache.discard_user(uuid.UUID(value))
+    elif kind == "session":
+        session_user_cache.discard(value)
+    else:
+        raise ValueError(f"Unknown invalidation message: {message!r}")
+
+
+async def invalidate_user(redis: Redis, user: User) -> None:
+    """Записывает актуальный снимок пользователя во все его сессии и сбрасывает кэши всех воркеров"""
+    session_manager = await get_session_manager()
+    await session_manager.update_user_sessions(SessionUser.from_user(user))
+    message = f"user:{user.id}"
+    apply_invalidation(message)
+    await redis.publish(INVALIDATION_CHANNEL, message)
+
+
+async def revoke_user(redis: Redis, user_id: uuid.UUID) -> None:
+    """Завершает все сессии пользователя и сбрасывает кэши всех воркеров"""
+    session_manager = await get_session_manager()
+    await session_manager.revoke_user_sessions(user_id)
+    message = f"user:{user_id}"
+    apply_invalidation(message)
+    await redis.publish(INVALIDATION_CHANNEL, message)
+
+
+async def invalidate_session(redis: Redis, session_id: str) -> None:
+    message = f"session:{session_id}"
+    apply_invalidation(message)
+    await redis.publish(INVALIDATION_CHANNEL, message)
+
+
+async def listen_for_invalidations(redis: Redis, reconnect_delay: float = 1.0) -> None:
+    """Фоновая задача воркера: применяет инвалидации, опубликованные другими воркерами"""
+    while True:
+        try:
+            async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Пока подписки не было, сообщения могли потеряться
+                session_user_cache.clear()
+                async for message in pubsub.listen():
+                    try:
+                        apply_invalidation(message["data"])
+                    except (TypeError, ValueError):
+                        logger.warning("Skipping malformed auth invalidation message: %r", message.get("data"))
+        except RedisError as e:
+            logger.warning("Auth invalidation listener disconnected: %s", e)
+            session_user_cache.clear()
+            await asyncio.sleep(reconnect_delay)
+
+
+def _log_listener_exit(task: asyncio.Task[None]) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Auth invalidation listener stopped unexpectedly", exc_info=exc)
+    else:
+        logger.error("Auth invalidation listener exited unexpectedly")
+
+
+def start_invalidation_listener(redis: Redis) -> asyncio.Task[None]:
+    task = asyncio.create_task(listen_for_invalidations(redis), name="auth-invalidation-listener")
+    task.add_done_callback(_log_listener_exit)
+    return task
@@ -1,32 +1,53 @@
 from fastapi import Depends, HTTPException, Request, status
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.session import SessionManager
+from src.app.core.auth.cache import session_user_cache
+from src.app.core.auth.session import SessionUser, get_session_manager
 from src.app.core.database.session import get_db
-from src.app.core.redis import get_redis_client
 from src.app.services.user.models import User
 
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)) -> User:
+async def get_session_user(request: Request, db: AsyncSession = Depends(get_db, scope="function")) -> SessionUser:
+    """
+    Аутентификация по снимку пользователя из сессии.
+    Снимок обновляется при изменении прав или доступа пользователя, поэтому в БД
+    обращаемся только для сессий, созданных до появления снимков.
+    Попадание в локальный кэш не продлевает сессию в Redis: TTL кэша на порядки меньше срока жизни сессии.
+    """
     session_id = request.cookies.get("session_id")
     if not session_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Не авторизован")
 
-    redis_client = await get_redis_client()
-    session_manager = SessionManager(redis_client)
+    session_user = session_user_cache.get(session_id)
+    if session_user is None:
+        session_manager = await get_session_manager()
 
-    session_data = await session_manager.get_session(session_id)
-    if not session_data:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Сессия истекла или недействительна")
+        state = await session_manager.get_session(session_id)
+        if not state:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Сессия истекла или недействительна")
 
-    result = await db.execute(select(User).where(User.id == session_data["user_id"]))
-    user = result.scalar_one_or_none()
+        session_user = state.snapshot
+        if session_user is None:
+            user = await db.get(User, state.user_id)
+            if not user:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден")
 
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден")
+            session_user = SessionUser.from_user(user)
+            await session_manager.update_session_user(session_id, session_user)
+
+        session_user_cache.set(session_id, session_user)
 
-    if not user.can_authenticate:
+    if not session_user.can_authenticate:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Ваш аккаунт заблокирован")
 
+    return session_user
+
+
+async def get_current_user(session_user: SessionUser = Depends(get_session_user), db: AsyncSession = Depends(get_db, scope="function")) -> User:
+    """Полная ORM-модель текущего пользователя. Нужна только эндпоинтам, которые читают или меняют запись пользователя."""
+    user = await db.get(User, session_user.id)
+
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Пользователь не найден")
+
     return user
@@ -1,26 +1,42 @@
+from collections.abc import Iterable
+
 from fastapi import Depends, HTTPException, status
 
-from src.app.core.auth.deps import get_current_user
-from src.app.services.user.models import User, UserRole
+from src.app.core.auth.deps import get_session_user
+from src.app.core.auth.session import SessionUser
+from src.app.services.user.models import UserRole
 from src.app.services.user.schemas import ROLE_PERMISSIONS
 
+# Роли и права компилируются в битовые маски один раз при импорте
+ROLE_BITS: dict[UserRole, int] = {role: 1 << index for index, role in enumerate(UserRole)}
+
+
+def roles_mask(roles: Iterable[UserRole]) -> int:
+    mask = 0
+    for role in roles:
+        mask |= ROLE_BITS[role]
+    return mask
+
+
+# Какими ролями может управлять каждая роль (создавать и видеть в списке пользователей)
+MANAGEABLE_ROLES_MASK: dict[UserRole, int] = {role: roles_mask(ROLE_PERMISSIONS.get(role, [])) for role in UserRole}
+MANAGEABLE_ROLES: dict[UserRole, tuple[UserRole, ...]] = {role: tuple(ROLE_PERMISSIONS.get(role, [])) for role in UserRole}
+
 
 class RoleChecker:
+    """Проверяет роль по снимку пользователя из сессии, не загружая пользователя из БД"""
+
     def __init__(self, allowed_roles: list[UserRole]) -> None:
         self.allowed_roles = allowed_roles
+        self.allowed_mask = roles_mask(allowed_roles)
+        self.detail = f"Недостаточно прав. Требуемые роли: {[r.value for r in allowed_roles]}"
 
-    def __call__(self, current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in self.allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail=f"Недостаточно прав. Требуемые роли: {[r.value for r in self.allowed_roles]}"
-            )
-
-        if not current_user.can_authenticate:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Ваш аккаунт заблокирован")
+    def __call__(self, current_user: SessionUser = Depends(get_session_user)) -> SessionUser:
+        if not ROLE_BITS[current_user.role] & self.allowed_mask:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=self.detail)
 
         return current_user
 
 
 def check_hierarchy(creator_role: UserRole, target_role: UserRole) -> bool:
-    allowed_to_manage = ROLE_PERMISSIONS.get(creator_role, [])
-    return target_role in allowed_to_manage
+    return bool(MANAGEABLE_ROLES_MASK[creator_role] & ROLE_BITS[target_role])
@@ -1,12 +1,147 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Literal
+
 import bcrypt
 
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BCRYPT_ROUNDS = 12
+
 
-def hash_password(password: str) -> str:
+class PasswordHasherOverloadedError(RuntimeError):
+    """Очередь задач хеширования паролей переполнена"""
+
+
+def hash_password(password: str, rounds: int = DEFAULT_BCRYPT_ROUNDS) -> str:
     pwd_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode("utf-8")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def get_hash_rounds(hashed_password: str) -> int | None:
+    """Cost factor из хеша вида $2b$12$...; None — строка не похожа на bcrypt-хеш"""
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str, rounds: int) -> bool:
+    """
+    Хеш пересчитывается, только если его cost ниже целевого. Воркеры калибруются независимо и могут получить разный cost:
+    при сравнении на равенство хеш переписывался бы при каждом входе через соседний воркер.
+    """
+    current = get_hash_rounds(hashed_password)
+    return current is None or current < rounds
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """Лучшее из нескольких измерений времени одного хеширования, в миллисекундах"""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hash_password("calibration-password", rounds)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def calibrate_bcrypt_rounds(target_ms: float, min_rounds: int, max_rounds: int) -> int:
+    """
+    Подбирает наибольший cost factor, при котором хеширование укладывается в target_ms на этом хосте.
+    Замеряется только min_rounds: каждый следующий раунд удваивает время, остальное экстраполируется.
+    """
+    elapsed_ms = measure_hash_ms(min_rounds)
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+class PasswordHasher:
+    """
+    Выполняет bcrypt вне event loop в ограниченном пуле воркеров.
+    Если в очереди уже max_pending задач, новая задача сразу отклоняется,
+    чтобы всплеск логинов не копил бесконечную очередь и не тормозил остальные запросы.
+    """
+
+    def __init__(
+        self, executor_kind: Literal["thread", "process"], max_workers: int, max_pending: int, rounds: int = DEFAULT_BCRYPT_ROUNDS
+    ) -> None:
+        self.executor_kind = executor_kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run[T](self, func: Callable[..., T], *args: str | int) -> T:
+        if self._pending >= self.max_pending:
+            raise PasswordHasherOverloadedError("Слишком много одновременных операций с паролями")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def calibrate(self) -> None:
+        """Выставляет cost factor: фиксированный из настроек или подобранный под BCRYPT_TARGET_MS"""
+        if settings.BCRYPT_ROUNDS is not None:
+            self.rounds = settings.BCRYPT_ROUNDS
+            return
+
+        self.rounds = await asyncio.to_thread(
+            calibrate_bcrypt_rounds, settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS
+        )
+        logger.info("bcrypt cost factor calibrated to %d (target %.0f ms)", self.rounds, settings.BCRYPT_TARGET_MS)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor_kind=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_hasher.hash(password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.verify(plain_password, hashed_password)
@@ -1,31 +1,177 @@
 import json
 import secrets
-from typing import Any
+import uuid
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from typing import Any, cast
 
+import msgpack
 from redis.asyncio import Redis
 
+from src.app.core.redis import get_binary_redis_client
+from src.app.services.user.models import User, UserRole
+
+
+@dataclass(frozen=True, slots=True)
+class SessionUser:
+    """Снимок пользователя, хранящийся вместе с сессией. Достаточен для аутентификации без обращения к БД."""
+
+    id: uuid.UUID
+    role: UserRole
+    company_id: uuid.UUID
+    can_authenticate: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> SessionUser:
+        return cls(id=user.id, role=user.role, company_id=user.company_id, can_authenticate=user.can_authenticate)
+
+    @classmethod
+    def from_session(cls, data: dict[str, Any]) -> SessionUser | None:
+        """Возвращает None, если в данных сессии нет полного снимка"""
+        try:
+            return cls(
+                id=uuid.UUID(bytes=data["user_id"]),
+                role=UserRole(data["role"]),
+                company_id=uuid.UUID(bytes=data["company_id"]),
+                can_authenticate=bool(data["can_authenticate"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def to_session(self) -> dict[str, Any]:
+        return {
+            "user_id": self.id.bytes,
+            "role": self.role.value,
+            "company_id": self.company_id.bytes,
+            "can_authenticate": self.can_authenticate,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class SessionState:
+    user_id: uuid.UUID
+    snapshot: SessionUser | None  # None — сессия старого формата, снимок нужно собрать из БД
+
 
 class SessionManager:
+    """
+    Сессии хранятся в msgpack под ключом session:<id> со скользящим сроком жизни:
+    каждое чтение продлевает TTL тем же запросом (GETEX).
+    Множество user_sessions:<user_id> индексирует сессии пользователя,
+    чтобы отзывать и обновлять их без SCAN по всем ключам.
+    """
+
     def __init__(self, redis: Redis) -> None:
         self.redis = redis
         self.session_prefix = "session:"
-        self.expire_seconds = 60 * 60 * 24 * 7  # 1 неделя
+        self.user_index_prefix = "user_sessions:"
+        self.expire_seconds = 60 * 60 * 24 * 7  # 1 неделя без активности
+
+    def _session_key(self, session_id: str) -> str:
+        return f"{self.session_prefix}{session_id}"
+
+    def _index_key(self, user_id: uuid.UUID) -> str:
+        return f"{self.user_index_prefix}{user_id}"
+
+    async def _user_session_ids(self, user_id: uuid.UUID) -> list[str]:
+        members = await cast(Awaitable[set[bytes]], self.redis.smembers(self._index_key(user_id)))
+        return [member.decode() for member in members]
+
+    @staticmethod
+    def _decode(data: bytes) -> SessionState | None:
+        # Сессии, записанные до перехода на msgpack, лежат в JSON — их снимок всегда пересобираем из БД
+        if data[:1] == b"{":
+            try:
+                return SessionState(user_id=uuid.UUID(json.loads(data)["user_id"]), snapshot=None)
+            except (KeyError, TypeError, ValueError):
+                return None
 
-    async def create_session(self, user_id: str, data: dict[str, Any]) -> str:
+        try:
+            payload = msgpack.unpackb(data)
+            user_id = uuid.UUID(bytes=payload["user_id"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return SessionState(user_id=user_id, snapshot=SessionUser.from_session(payload))
+
+    async def create_session(self, user: User) -> str:
         session_id = secrets.token_urlsafe(32)
-        key = f"{self.session_prefix}{session_id}"
+        snapshot = SessionUser.from_user(user)
 
-        session_data = {"user_id": user_id, **data}
-        await self.redis.setex(key, self.expire_seconds, json.dumps(session_data))
+        await self.prune_user_sessions(user.id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._session_key(session_id), msgpack.packb(snapshot.to_session()), ex=self.expire_seconds)
+            pipe.sadd(self._index_key(user.id), session_id)
+            await pipe.execute()
         return session_id
 
-    async def get_session(self, session_id: str) -> dict[str, Any] | None:
-        data = await self.redis.get(f"{self.session_prefix}{session_id}")
+    async def get_session(self, session_id: str) -> SessionState | None:
+        """Читает сессию и продлевает её срок жизни одной командой. None — сессии нет или она повреждена."""
+        data = await self.redis.getex(self._session_key(session_id), ex=self.expire_seconds)
         if not data:
             return None
+        return self._decode(data)
+
+    async def update_session_user(self, session_id: str, snapshot: SessionUser) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._session_key(session_id), msgpack.packb(snapshot.to_session()), keepttl=True, xx=True)
+            pipe.sadd(self._index_key(snapshot.id), session_id)
+            await pipe.execute()
+
+    async def update_user_sessions(self, snapshot: SessionUser) -> None:
+        """Записывает свежий снимок во все сессии пользователя. Истёкшие сессии убираются из индекса."""
+        session_ids = await self._user_session_ids(snapshot.id)
+        if not session_ids:
+            return
+
+        payload = msgpack.packb(snapshot.to_session())
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.set(self._session_key(session_id), payload, keepttl=True, xx=True)
+            results = await pipe.execute()
+
+        expired = [session_id for session_id, updated in zip(session_ids, results, strict=True) if not updated]
+        if expired:
+            await cast(Awaitable[int], self.redis.srem(self._index_key(snapshot.id), *expired))
+
+    async def prune_user_sessions(self, user_id: uuid.UUID) -> None:
+        """Убирает из индекса сессии, истёкшие по TTL"""
+        session_ids = await self._user_session_ids(user_id)
+        if not session_ids:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.exists(self._session_key(session_id))
+            results = await pipe.execute()
+
+        expired = [session_id for session_id, exists in zip(session_ids, results, strict=True) if not exists]
+        if expired:
+            await cast(Awaitable[int], self.redis.srem(self._index_key(user_id), *expired))
+
+    async def revoke_user_sessions(self, user_id: uuid.UUID) -> list[str]:
+        """Удаляет все сессии пользователя. Возвращает идентификаторы удалённых сессий."""
+        session_ids = await self._user_session_ids(user_id)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for session_id in session_ids:
+                pipe.delete(self._session_key(session_id))
+            pipe.delete(self._index_key(user_id))
+            await pipe.execute()
+        return session_ids
+
+    async def delete_session(self, session_id: str, user_id: uuid.UUID) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self._session_key(session_id))
+            pipe.srem(self._index_key(user_id), session_id)
+            await pipe.execute()
+
+
+_session_manager: SessionManager | None = None
 
-        result: dict[str, Any] = json.loads(data)
-        return result
 
-    async def delete_session(self, session_id: str) -> None:
-        await self.redis.delete(f"{self.session_prefix}{session_id}")
+async def get_session_manager() -> SessionManager:
+    """Общий для процесса SessionManager поверх бинарного пула Redis"""
+    global _session_manager
+    if _session_manager is None:
+        _session_manager = SessionManager(await get_binary_redis_client())
+    return _session_manager
@@ -0,0 +1,106 @@
+import math
+import secrets
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import HTTPException, status
+from redis.asyncio import Redis
+from redis.typing import EncodableT
+
+from src.app.core.config import settings
+from src.app.core.redis import get_redis_client
+
+# Скользящее окно по нескольким ключам сразу: попытка засчитывается во все окна, только если ни одно не переполнено.
+# KEYS — окна (ZSET с временем попыток); ARGV[1] — ширина окна в мс, ARGV[2] — уникальный член, ARGV[2 + i] — лимит KEYS[i].
+# Возвращает 0, если попытка разрешена, иначе через сколько мс освободится место.
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= tonumber(ARGV[2 + i]) then
+        local oldest = redis.call('ZRANGE', key, 0, 0, 'WITHSCORES')
+        retry_after = math.max(retry_after, tonumber(oldest[2]) + window - now)
+    end
+end
+if retry_after > 0 then
+    return retry_after
+end
+for _, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, ARGV[2])
+    redis.call('PEXPIRE', key, window)
+end
+return 0
+"""
+
+# Аренда слота проверки пароля. Слоты упавших воркеров освобождаются сами по истечении аренды.
+# KEYS[1] — ZSET активных проверок; ARGV[1] — срок аренды в мс, ARGV[2] — лимит, ARGV[3] — токен слота.
+ACQUIRE_SLOT_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[1]))
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[3])
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class LoginThrottle:
+    """
+    Защита логина от перебора и всплесков нагрузки:
+    скользящее окно попыток по email и по IP и общий для всех воркеров лимит одновременных проверок пароля.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.rate_prefix = "login_rate:"
+        self.slots_key = "login_verifications"
+        self._sliding_window = redis.register_script(SLIDING_WINDOW_SCRIPT)
+        self._acquire_slot = redis.register_script(ACQUIRE_SLOT_SCRIPT)
+
+    async def check_rate(self, email: str, ip: str) -> None:
+        keys = [f"{self.rate_prefix}email:{email.lower()}", f"{self.rate_prefix}ip:{ip}"]
+        args: list[EncodableT] = [
+            settings.LOGIN_RATE_WINDOW_SECONDS * 1000,
+            secrets.token_hex(8),
+            settings.LOGIN_RATE_LIMIT_PER_EMAIL,
+            settings.LOGIN_RATE_LIMIT_PER_IP,
+        ]
+        retry_after_ms = int(await self._sliding_window(keys=keys, args=args))
+        if retry_after_ms:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Слишком много попыток входа, повторите позже",
+                headers={"Retry-After": str(math.ceil(retry_after_ms / 1000))},
+            )
+
+    @asynccontextmanager
+    async def verification_slot(self) -> AsyncIterator[None]:
+        token = secrets.token_hex(8)
+        args: list[EncodableT] = [int(settings.LOGIN_VERIFICATION_LEASE_SECONDS * 1000), settings.LOGIN_MAX_CONCURRENT_VERIFICATIONS, token]
+        if not await self._acquire_slot(keys=[self.slots_key], args=args):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Сервер перегружен входами, повторите попытку позже",
+                headers={"Retry-After": "1"},
+            )
+
+        try:
+            yield
+        finally:
+            await self.redis.zrem(self.slots_key, token)
+
+
+_login_throttle: LoginThrottle | None = None
+
+
+async def get_login_throttle() -> LoginThrottle:
+    global _login_throttle
+    if _login_throttle is None:
+        _login_throttle = LoginThrottle(await get_redis_client())
+    return _login_throttle
@@ -1,3 +1,6 @@
+from typing import Literal
+
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,6 +8,24 @@ class Settings(BaseSettings):
     DB_URL: str
     DEBUG: bool = False
 
+    DB_POOL_SIZE: int = Field(5, ge=1)
+    DB_MAX_OVERFLOW: int = Field(10, ge=0)
+    DB_POOL_TIMEOUT: float = Field(30.0, gt=0)
+    DB_POOL_RECYCLE: int = 1800  # -1 — не пересоздавать соединения
+    DB_POOL_PRE_PING: bool = True
+    # Кэш подготовленных выражений asyncpg на соединение; 0 — для pgbouncer в режиме transaction
+    DB_STATEMENT_CACHE_SIZE: int = Field(100, ge=0)
+
+    # Реплика для тяжёлых чтений; без неё все чтения идут на primary
+    DB_REPLICA_URL: str | None = None
+    DB_REPLICA_RETRY_SECONDS: float = Field(30.0, gt=0)
+    # Сколько секунд после изменения данных чтения клиента идут на primary
+    DB_READ_YOUR_WRITES_SECONDS: int = Field(5, ge=1)
+
+    # Запросы дольше порога пишутся в лог; в DEBUG повтор одного запроса больше порога раз за запрос считается N+1
+    SQL_SLOW_QUERY_MS: float = Field(200.0, ge=0)
+    SQL_N_PLUS_ONE_THRESHOLD: int = Field(10, ge=1)
+
     S3_ENDPOINT_URL: str
     S3_ACCESS_KEY: str
     S3_SECRET_KEY: str
@@ -19,5 +40,46 @@ class Settings(BaseSettings):
     ADMIN_FULL_NAME: str
     ADMIN_PASSWORD: str
 
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = Field(4, ge=1)
+    PASSWORD_HASH_MAX_PENDING: int = Field(64, ge=1)
+
+    # Cost factor bcrypt подбирается при старте под BCRYPT_TARGET_MS; BCRYPT_ROUNDS фиксирует его явно
+    BCRYPT_ROUNDS: int | None = Field(None, ge=4, le=31)
+    BCRYPT_TARGET_MS: float = Field(250.0, gt=0)
+    BCRYPT_MIN_ROUNDS: int = Field(10, ge=4, le=31)
+    BCRYPT_MAX_ROUNDS: int = Field(14, ge=4, le=31)
+
+    LOGIN_RATE_WINDOW_SECONDS: int = Field(60, ge=1)
+    LOGIN_RATE_LIMIT_PER_EMAIL: int = Field(10, ge=1)
+    LOGIN_RATE_LIMIT_PER_IP: int = Field(100, ge=1)
+    # Общий для всех воркеров лимит одновременных проверок пароля; слот упавшего воркера освобождается по истечении аренды
+    LOGIN_MAX_CONCURRENT_VERIFICATIONS: int = Field(64, ge=1)
+    LOGIN_VERIFICATION_LEASE_SECONDS: float = Field(10.0, gt=0)
+
+    STARTUP_CHECK_TIMEOUT_SECONDS: float = Field(10.0, gt=0)
+
+    # Сводка списка дел в Redis. Запись живёт не дольше этого срока и не дольше ближайшего дедлайна активного дела.
+    CASE_SUMMARY_CACHE_TTL_SECONDS: float = Field(60.0, gt=0)
+    # Размер пачки при импорте дел: столько строк проверяется и отправляется одним COPY
+    CASE_IMPORT_CHUNK_SIZE: int = Field(5000, ge=1)
+    # Столько строк выгрузки читается из серверного курсора за раз
+    CASE_EXPORT_BATCH_SIZE: int = Field(1000, ge=1)
+    # Сколько последних писем по делу отдаёт карточка дела
+    CASE_DETAILS_MAIL_LIMIT: int = Field(20, ge=1)
+    # Сколько последних событий журнала отдаёт карточка дела
+    CASE_DETAILS_HISTORY_LIMIT: int = Field(50, ge=1)
+    # Напоминание о дедлайне срабатывает за столько секунд до него. Лидер читает из БД дедлайны на окно вперёд одним запросом.
+    CASE_DEADLINE_REMIND_BEFORE_SECONDS: int = Field(86400, ge=0)
+    CASE_DEADLINE_WINDOW_SECONDS: int = Field(3600, ge=1)
+    # Аренда лидерства планировщика в Redis; лидер продлевает её каждую треть срока, остальные воркеры с тем же шагом пробуют её занять
+    CASE_DEADLINE_LEADER_TTL_SECONDS: float = Field(30.0, ge=1)
+
+    # Отчёт по дебиторке в Redis; изменения дел сбрасывают его сразу, а срок ограничивает сдвиг корзин просрочки со временем
+    REPORT_RECEIVABLES_CACHE_TTL_SECONDS: int = Field(300, ge=1)
+
+    AUTH_CACHE_SIZE: int = 10_000
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+
 
 settings = Settings()
@@ -1,4 +1,5 @@
 from src.app.core.database.base import Base
+from src.app.core.database.replica import get_read_db, is_replica_session
 from src.app.core.database.session import engine, get_db
 
-__all__ = ["Base", "Case", "Client", "Contact", "engine", "get_db", "init_database"]
+__all__ = ["Base", "Case", "Client", "Contact", "engine", "get_db", "get_read_db", "init_database", "is_replica_session"]
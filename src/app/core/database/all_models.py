@@ -1,5 +1,5 @@
 from src.app.core.database.base import Base
-from src.app.services.case import Case
+from src.app.services.case import Case, CaseEvent, CaseStats
 from src.app.services.client import Client, Contact
 from src.app.services.company.models import Company
 from src.app.services.document import Document, Folder
@@ -10,6 +10,8 @@ __all__ = [
     "Base",
     "User",
     "Case",
+    "CaseStats",
+    "CaseEvent",
     "Client",
     "Contact",
     "Document",
@@ -12,3 +12,6 @@ POSTGRES_NAMING_CONVENTION = {
 
 class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=POSTGRES_NAMING_CONVENTION)
+    # Серверные значения (created_at, updated_at, server_default) возвращаются тем же INSERT/UPDATE через RETURNING,
+    # поэтому после commit не нужен refresh, который заново занимал бы соединение до конца запроса
+    __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,85 @@
+import logging
+import time
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+from fastapi import Request, Response
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.core.config import settings
+from src.app.core.database.session import AsyncSessionLocal, engine_options
+from src.app.core.monitoring.sql import install_sql_instrumentation
+
+logger = logging.getLogger(__name__)
+
+PRIMARY_PIN_COOKIE = "db_primary"
+CONSISTENCY_HEADER = "X-Consistency"
+MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+# Отметка в Session.info: сессия читает с реплики
+REPLICA_SESSION_KEY = "replica"
+
+read_engine = create_async_engine(settings.DB_REPLICA_URL, **engine_options(settings.DB_REPLICA_URL)) if settings.DB_REPLICA_URL else None
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession) if read_engine else None
+if read_engine is not None:
+    install_sql_instrumentation(read_engine.sync_engine)
+
+_replica_down_until = 0.0
+
+
+def replica_is_available() -> bool:
+    return ReadSessionLocal is not None and time.monotonic() >= _replica_down_until
+
+
+def mark_replica_down() -> None:
+    """После ошибки соединения с репликой читаем с primary, пока не истечёт пауза"""
+    global _replica_down_until
+    _replica_down_until = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """
+    Данные сессии могут отставать от primary. Кэши, которые сбрасываются по поколению дел,
+    не должны заполняться из неё: устаревший ответ записался бы под новое поколение и жил бы до истечения TTL.
+    """
+    return bool(session.info.get(REPLICA_SESSION_KEY, False))
+
+
+def wants_primary(request: Request) -> bool:
+    """Клиент просит читать свои записи: заголовком или cookie, выставленной после изменения данных"""
+    return request.headers.get(CONSISTENCY_HEADER, "").lower() == "primary" or PRIMARY_PIN_COOKIE in request.cookies
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession]:
+    """
+    Сессия для тяжёлых чтений. Идёт на реплику, если она настроена и доступна,
+    иначе — на primary. Соединение с репликой берётся сразу, чтобы при её недоступности
+    переключиться на primary ещё до выполнения обработчика.
+    """
+    if ReadSessionLocal is not None and replica_is_available() and not wants_primary(request):
+        async with ReadSessionLocal() as session:
+            try:
+                await session.connection()
+                connected = True
+            except (SQLAlchemyError, OSError):
+                logger.warning("Read replica is unavailable, falling back to primary", exc_info=True)
+                mark_replica_down()
+                connected = False
+
+            if connected:
+                session.info[REPLICA_SESSION_KEY] = True
+                yield session
+                return
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def pin_primary_after_write(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    После успешного изменяющего запроса на несколько секунд направляет чтения клиента на primary,
+    чтобы он увидел свои изменения несмотря на отставание реплики.
+    """
+    response = await call_next(request)
+    if ReadSessionLocal is not None and request.method in MUTATING_METHODS and response.status_code < 400:
+        response.set_cookie(PRIMARY_PIN_COOKIE, "1", max_age=settings.DB_READ_YOUR_WRITES_SECONDS, httponly=True, secure=True, samesite="lax")
+    return response
@@ -1,13 +1,39 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.app.core.config import settings
+from src.app.core.monitoring.pool import InstrumentedQueuePool
+from src.app.core.monitoring.sql import install_sql_instrumentation
 
-engine = create_async_engine(settings.DB_URL, echo=settings.DEBUG)
+
+def engine_options(url: str) -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if make_url(url).get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    return options
+
+
+engine = create_async_engine(settings.DB_URL, **engine_options(settings.DB_URL))
+install_sql_instrumentation(engine.sync_engine)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
 async def get_db() -> AsyncGenerator[AsyncSession]:
+    """
+    Сессия берёт соединение из пула только при первом запросе к БД и отдаёт его после commit/rollback.
+    Эндпоинты подключают её с Depends(get_db, scope="function"): сессия закрывается сразу после выхода
+    из обработчика, а не после отправки ответа клиенту.
+    """
     async with AsyncSessionLocal() as session:
         yield session
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from src.app.core.auth.rbac import RoleChecker
+from src.app.core.database.session import engine
+from src.app.core.monitoring.pool import collect_pool_stats
+from src.app.core.monitoring.schemas import PoolStats
+from src.app.services.user.models import UserRole
+
+router = APIRouter(prefix="/internal", tags=["Internal"], dependencies=[Depends(RoleChecker([UserRole.ADMIN]))])
+
+
+@router.get("/db/pool", response_model=PoolStats)
+async def get_db_pool_stats() -> PoolStats:
+    """Состояние пула соединений воркера, обработавшего запрос"""
+    return collect_pool_stats(engine.pool)
@@ -0,0 +1,54 @@
+import os
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+from src.app.core.monitoring.schemas import PoolStats
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Очередь соединений, которая считает время ожидания свободного соединения и таймауты.
+    Статистика своя у каждого воркера и сбрасывается при пересоздании пула (engine.dispose()).
+    """
+
+    checkouts = 0
+    timeouts = 0
+    total_wait = 0.0
+    max_wait = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+        self.checkouts += 1
+        return connection
+
+
+def collect_pool_stats(pool: Pool) -> PoolStats:
+    """Снимок состояния пула текущего воркера. Для неинструментированных пулов счётчики ожидания нулевые."""
+    stats = PoolStats(pid=os.getpid(), pool_class=type(pool).__name__)
+
+    if isinstance(pool, QueuePool):
+        stats.size = pool.size()
+        stats.checked_out = pool.checkedout()
+        stats.checked_in = pool.checkedin()
+        stats.overflow = pool.overflow()
+
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.checkouts = pool.checkouts
+        stats.timeouts = pool.timeouts
+        attempts = pool.checkouts + pool.timeouts
+        stats.avg_wait_ms = pool.total_wait * 1000 / attempts if attempts else 0.0
+        stats.max_wait_ms = pool.max_wait * 1000
+
+    return stats
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class PoolStats(BaseModel):
+    pid: int
+    pool_class: str
+    size: int | None = None
+    checked_out: int | None = None
+    checked_in: int | None = None
+    overflow: int | None = None
+    checkouts: int = 0
+    timeouts: int = 0
+    avg_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
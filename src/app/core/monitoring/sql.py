@@ -0,0 +1,141 @@
+import logging
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine.interfaces import DBAPICursor, ExceptionContext, ExecutionContext
+
+from src.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_START_TIMES_KEY = "query_start_times"
+
+
+def parameter_shape(parameters: object, executemany: bool) -> str:
+    """Типы параметров без значений: в лог не попадают персональные данные, а одинаковые запросы выглядят одинаково"""
+    if executemany and isinstance(parameters, list | tuple):
+        first = parameter_shape(parameters[0], executemany=False) if parameters else "()"
+        return f"{len(parameters)} x {first}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, list | tuple):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Статистика SQL одного HTTP-запроса"""
+
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: str | None = None
+    slowest_parameters: str | None = None
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, parameters: str, duration_ms: float) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.statements[statement] += 1
+        if duration_ms > self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_statement = statement
+            self.slowest_parameters = parameters
+
+    def repeated_statements(self, threshold: int) -> list[tuple[str, int]]:
+        return [(statement, count) for statement, count in self.statements.most_common() if count > threshold]
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(
+    conn: Connection, cursor: DBAPICursor, statement: str, parameters: object, context: ExecutionContext | None, executemany: bool
+) -> None:
+    # Время старта по курсору: запрос с ошибкой снимает свою запись в _handle_error, не задевая чужие
+    conn.info.setdefault(_START_TIMES_KEY, {})[id(cursor)] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection, cursor: DBAPICursor, statement: str, parameters: object, context: ExecutionContext | None, executemany: bool
+) -> None:
+    duration_ms = (time.perf_counter() - conn.info[_START_TIMES_KEY].pop(id(cursor))) * 1000
+    stats = current_query_stats.get()
+    is_slow = duration_ms >= settings.SQL_SLOW_QUERY_MS
+    if stats is None and not is_slow:
+        return
+
+    shape = parameter_shape(parameters, executemany)
+    if stats is not None:
+        stats.record(statement, shape, duration_ms)
+    if is_slow:
+        logger.warning(
+            "Slow query: %.1f ms",
+            duration_ms,
+            extra={"duration_ms": round(duration_ms, 1), "statement": statement, "parameters": shape},
+        )
+
+
+def _handle_error(exception_context: ExceptionContext) -> None:
+    # after_cursor_execute для упавшего запроса не вызывается: без этого время старта копилось бы в info соединения
+    conn, context = exception_context.connection, exception_context.execution_context
+    if conn is not None and context is not None:
+        conn.info.get(_START_TIMES_KEY, {}).pop(id(context.cursor), None)
+
+
+def install_sql_instrumentation(engine: Engine) -> None:
+    """Вешает замер времени на все запросы движка. Для AsyncEngine передаётся engine.sync_engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+async def sql_stats_middleware(request: Request, call_next: Callable[[Request], Awaitable[Response]]) -> Response:
+    """
+    Собирает статистику SQL запроса и отдаёт её в заголовке Server-Timing.
+    В DEBUG дополнительно предупреждает о N+1 — одном и том же запросе, выполненном больше SQL_N_PLUS_ONE_THRESHOLD раз.
+    """
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        current_query_stats.reset(token)
+
+    if stats.count:
+        response.headers["Server-Timing"] = f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+        logger.debug(
+            "%s %s: %d queries, %.1f ms in DB",
+            request.method,
+            request.url.path,
+            stats.count,
+            stats.total_ms,
+            extra={
+                "path": request.url.path,
+                "queries": stats.count,
+                "db_ms": round(stats.total_ms, 1),
+                "slowest_ms": round(stats.slowest_ms, 1),
+                "slowest_statement": stats.slowest_statement,
+                "slowest_parameters": stats.slowest_parameters,
+            },
+        )
+
+    if settings.DEBUG:
+        for statement, count in stats.repeated_statements(settings.SQL_N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "Possible N+1: statement executed %d times in %s %s",
+                count,
+                request.method,
+                request.url.path,
+                extra={"path": request.url.path, "statement": statement, "executions": count},
+            )
+
+    return response
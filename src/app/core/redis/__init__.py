@@ -1 +1,2 @@
+from src.app.core.redis.redis import get_binary_redis_client as get_binary_redis_client
 from src.app.core.redis.redis import get_redis_client as get_redis_client
@@ -2,7 +2,13 @@ from redis.asyncio import ConnectionPool, Redis
 from src.app.core.config.settings import settings
 
 _pool: ConnectionPool = ConnectionPool.from_url(settings.REDIS_URL, decode_responses=True, max_connections=100)
+_binary_pool: ConnectionPool = ConnectionPool.from_url(settings.REDIS_URL, decode_responses=False, max_connections=100)
 
 
 async def get_redis_client() -> Redis:
     return Redis(connection_pool=_pool)
+
+
+async def get_binary_redis_client() -> Redis:
+    """Клиент без декодирования ответов — для бинарных значений (msgpack)"""
+    return Redis(connection_pool=_binary_pool)
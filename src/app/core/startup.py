@@ -0,0 +1,41 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CheckResult:
+    name: str
+    elapsed_ms: float
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_check(name: str, check: Callable[[], Awaitable[object]], timeout: float) -> CheckResult:
+    """Выполняет проверку с ограничением по времени. Ошибка не пробрасывается, а возвращается в результате."""
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            await check()
+    except Exception as e:
+        return CheckResult(name, (time.perf_counter() - started) * 1000, e)
+    return CheckResult(name, (time.perf_counter() - started) * 1000)
+
+
+async def run_checks(checks: dict[str, Callable[[], Awaitable[object]]], timeout: float) -> dict[str, CheckResult]:
+    """Запускает независимые проверки одновременно; общее время равно самой долгой из них, но не больше timeout"""
+    results = await asyncio.gather(*(run_check(name, check, timeout) for name, check in checks.items()))
+    return {result.name: result for result in results}
+
+
+def print_check(result: CheckResult) -> None:
+    if result.ok:
+        print(f"{result.name}: OK ({result.elapsed_ms:.0f} ms)")
+    elif isinstance(result.error, TimeoutError):
+        print(f"{result.name}: TIMEOUT after {result.elapsed_ms:.0f} ms")
+    else:
+        print(f"{result.name}: FAILED ({result.elapsed_ms:.0f} ms) | {result.error}")
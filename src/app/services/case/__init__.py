@@ -1,3 +1,3 @@
-from src.app.services.case.models import Case
+from src.app.services.case.models import Case, CaseEvent, CaseStats
 
-__all__ = ["Case"]
+__all__ = ["Case", "CaseEvent", "CaseStats"]
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Awaitable
+from dataclasses import asdict, dataclass
+from typing import cast
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from redis.typing import EncodableT
+
+from src.app.core.config import settings
+from src.app.services.case.schemas import GetCasesQuery
+
+logger = logging.getLogger(__name__)
+
+# Счётчик поколений дел: растёт при любом изменении дел. По нему сбрасываются и другие кэши, посчитанные по делам.
+CASES_GENERATION_KEY = "case_summary:generation"
+
+# Одно обращение к Redis на чтение: текущее поколение сводок и запись для набора фильтров в нём.
+# KEYS[1] — счётчик поколений; ARGV[1] — префикс хеша поколения, ARGV[2] — ключ набора фильтров.
+READ_SUMMARY_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('HGET', ARGV[1] .. generation, ARGV[2])}
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class SummaryEntry:
+    total: int
+    active: int
+    overdue: int
+    completed: int
+
+
+def filters_key(query_params: GetCasesQuery) -> str:
+    """Ключ набора фильтров. Пагинация и сортировка на сводку не влияют и в ключ не входят."""
+    filters = query_params.model_dump(mode="json", include={"q", "status", "expert_id", "client_id", "start_date", "end_date"})
+    if filters["status"]:
+        filters["status"] = sorted(filters["status"])
+    return hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+
+
+class CaseSummaryCache:
+    """
+    Сводки списка дел по наборам фильтров.
+    Все сводки поколения лежат в одном хеше case_summary:<generation>. Любое изменение дел увеличивает счётчик поколений,
+    и следующие чтения идут в новый, пустой хеш; старый истекает сам. Сводка, посчитанная до изменения,
+    записывается в старое поколение и никогда не будет прочитана.
+    Просрочка наступает со временем, а не от записи, поэтому у каждой сводки свой срок — до ближайшего дедлайна.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.generation_key = CASES_GENERATION_KEY
+        self.hash_prefix = "case_summary:"
+        self._read_summary = redis.register_script(READ_SUMMARY_SCRIPT)
+
+    async def get(self, key: str) -> tuple[str, SummaryEntry | None]:
+        """Возвращает поколение, в которое нужно записать пересчитанную сводку, и саму сводку, если она ещё действует"""
+        args: list[EncodableT] = [self.hash_prefix, key]
+        generation, *cached = await self._read_summary(keys=[self.generation_key], args=args)
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        # Redis обрезает массив на nil, поэтому отсутствующая запись — это пустой хвост
+        if not cached or cached[0] is None:
+            return generation, None
+
+        data = json.loads(cached[0])
+        if data.pop("expires_at") <= time.time():
+            return generation, None
+        return generation, SummaryEntry(**data)
+
+    async def set(self, generation: str, key: str, entry: SummaryEntry, ttl_seconds: float) -> None:
+        hash_key = f"{self.hash_prefix}{generation}"
+        value = json.dumps({**asdict(entry), "expires_at": time.time() + ttl_seconds})
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(hash_key, key, value)
+            # Хеш поколения живёт не дольше максимального срока сводки с момента первой записи
+            pipe.expire(hash_key, max(1, int(settings.CASE_SUMMARY_CACHE_TTL_SECONDS)), nx=True)
+            await pipe.execute()
+
+    async def invalidate(self) -> None:
+        """Сбрасывает сводки после изменения дел. Ошибка Redis не должна откатывать уже сохранённое изменение."""
+        try:
+            await cast(Awaitable[int], self.redis.incr(self.generation_key))
+        except RedisError as e:
+            logger.warning("Failed to invalidate case summaries: %s", e)
@@ -0,0 +1,240 @@
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Iterable
+from contextlib import suppress
+from datetime import UTC, datetime, timedelta
+from typing import cast
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from redis.typing import EncodableT
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.core.config import settings
+from src.app.core.database.session import AsyncSessionLocal
+from src.app.services.case.history import CaseHistoryBuffer, json_value
+from src.app.services.case.models import INACTIVE_STATUSES, Case, CaseEventType
+
+logger = logging.getLogger(__name__)
+
+# Канал, по которому воркеры сообщают лидеру о новых и изменённых дедлайнах: "<id дела> <дедлайн ISO 8601>"
+DEADLINE_CHANNEL = "case_deadlines"
+LEADER_KEY = "case_deadlines:leader"
+
+# Продление аренды, только если лидер всё ещё этот воркер. KEYS[1] — ключ лидера; ARGV[1] — токен воркера, ARGV[2] — срок в мс.
+RENEW_LEADERSHIP_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+RELEASE_LEADERSHIP_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _utc(moment: datetime) -> datetime:
+    """Наивное время (SQLite в тестах) считается UTC"""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+
+def reminder_at(deadline: datetime) -> datetime:
+    return _utc(deadline) - timedelta(seconds=settings.CASE_DEADLINE_REMIND_BEFORE_SECONDS)
+
+
+async def publish_deadlines(redis: Redis, cases: Iterable[tuple[uuid.UUID, datetime]]) -> None:
+    """
+    Сообщает лидеру о новых и изменённых дедлайнах. Ошибка Redis не должна откатывать уже сохранённое изменение:
+    пропущенный дедлайн лидер прочитает вместе со следующим окном.
+    """
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for case_id, deadline in cases:
+                pipe.publish(DEADLINE_CHANNEL, f"{case_id} {_utc(deadline).isoformat()}")
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Failed to publish case deadlines: %s", e)
+
+
+class DeadlineScheduler:
+    """
+    Напоминания о дедлайнах дел. Работает в одном воркере из всех: лидер держит аренду ключа в Redis и продлевает её.
+    Лидер читает одним запросом по ix_cases_deadline_pending дедлайны, напоминание о которых наступит в ближайшее окно,
+    и держит их в куче по времени напоминания; следующий запрос к БД — только в конце окна. Новые и перенесённые дедлайны
+    приходят по каналу DEADLINE_CHANNEL. Напоминание — это отметка deadline_notified_at и событие в журнале дела;
+    отметка ставится условным UPDATE, поэтому даже два лидера при смене аренды не напомнят об одном дедлайне дважды.
+    """
+
+    def __init__(self, redis: Redis, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self.redis = redis
+        self.session_factory = session_factory
+        self.token = uuid.uuid4().hex
+        # (время напоминания, id дела, дедлайн); записи, которых нет в _armed, устарели и пропускаются
+        self._heap: list[tuple[datetime, uuid.UUID, datetime]] = []
+        self._armed: dict[uuid.UUID, datetime] = {}
+        # Напоминания до этого момента уже в куче
+        self.horizon = datetime.min.replace(tzinfo=UTC)
+        self._renew = redis.register_script(RENEW_LEADERSHIP_SCRIPT)
+        self._release = redis.register_script(RELEASE_LEADERSHIP_SCRIPT)
+
+    @property
+    def _lease_ms(self) -> int:
+        return int(settings.CASE_DEADLINE_LEADER_TTL_SECONDS * 1000)
+
+    async def acquire_leadership(self) -> bool:
+        """Продлевает свою аренду или занимает свободную"""
+        args: list[EncodableT] = [self.token, self._lease_ms]
+        if await self._renew(keys=[LEADER_KEY], args=args):
+            return True
+        return bool(await cast(Awaitable[bool | None], self.redis.set(LEADER_KEY, self.token, nx=True, px=self._lease_ms)))
+
+    async def release_leadership(self) -> None:
+        args: list[EncodableT] = [self.token]
+        await self._release(keys=[LEADER_KEY], args=args)
+
+    async def load_window(self, now: datetime) -> None:
+        """Заново заполняет кучу напоминаниями до now + CASE_DEADLINE_WINDOW_SECONDS"""
+        horizon = now + timedelta(seconds=settings.CASE_DEADLINE_WINDOW_SECONDS)
+        stmt = select(Case.id, Case.deadline).where(
+            Case.deleted_at.is_(None),
+            Case.deadline_notified_at.is_(None),
+            Case.deadline > now,
+            Case.deadline <= horizon + timedelta(seconds=settings.CASE_DEADLINE_REMIND_BEFORE_SECONDS),
+            Case.status.not_in(INACTIVE_STATUSES),
+        )
+        async with self.session_factory() as db:
+            rows = (await db.execute(stmt)).all()
+
+        self._armed = {row.id: _utc(row.deadline) for row in rows}
+        self._heap = [(reminder_at(deadline), case_id, deadline) for case_id, deadline in self._armed.items()]
+        heapq.heapify(self._heap)
+        self.horizon = horizon
+
+    def arm(self, case_id: uuid.UUID, deadline: datetime, now: datetime) -> None:
+        """Ставит напоминание по новому дедлайну дела; прежнее, если было, больше не сработает"""
+        deadline = _utc(deadline)
+        if deadline <= now or reminder_at(deadline) > self.horizon:
+            # Прошедший дедлайн не напоминается, а дальний попадёт в одно из следующих окон
+            self._armed.pop(case_id, None)
+            return
+        if self._armed.get(case_id) == deadline:
+            return
+        self._armed[case_id] = deadline
+        heapq.heappush(self._heap, (reminder_at(deadline), case_id, deadline))
+
+    def apply_message(self, message: str, now: datetime) -> None:
+        case_id, _, deadline = message.partition(" ")
+        self.arm(uuid.UUID(case_id), datetime.fromisoformat(deadline), now)
+
+    def next_reminder(self) -> datetime | None:
+        return self._heap[0][0] if self._heap else None
+
+    async def fire_due(self, now: datetime) -> list[uuid.UUID]:
+        """Напоминает о дедлайнах, время которых наступило, одной транзакцией. Возвращает дела, о которых напомнил."""
+        due: list[uuid.UUID] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, case_id, deadline = heapq.heappop(self._heap)
+            if self._armed.get(case_id) == deadline:
+                del self._armed[case_id]
+                due.append(case_id)
+        if not due:
+            return []
+
+        # Условия повторяют окно: дело могли удалить, завершить или перенести после того, как оно попало в кучу
+        stmt = (
+            update(Case)
+            .where(
+                Case.id.in_(due),
+                Case.deleted_at.is_(None),
+                Case.deadline_notified_at.is_(None),
+                Case.deadline <= now + timedelta(seconds=settings.CASE_DEADLINE_REMIND_BEFORE_SECONDS),
+                Case.status.not_in(INACTIVE_STATUSES),
+            )
+            .values(deadline_notified_at=now)
+            .returning(Case.id, Case.deadline)
+        )
+        async with self.session_factory() as db:
+            rows = (await db.execute(stmt, execution_options={"synchronize_session": False})).all()
+            history = CaseHistoryBuffer()
+            for row in rows:
+                history.record(row.id, CaseEventType.deadline, {"deadline_notified_at": {"old": None, "new": json_value(now)}})
+            await history.flush(db)
+            await db.commit()
+
+        for row in rows:
+            logger.info("Case %s deadline reminder: deadline at %s", row.id, _utc(row.deadline).isoformat())
+        return [row.id for row in rows]
+
+    async def lead(self) -> None:
+        """Цикл лидера: возвращается, когда аренду перехватил другой воркер"""
+        renew_interval = settings.CASE_DEADLINE_LEADER_TTL_SECONDS / 3
+        async with self.redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+            # Подписка до чтения окна: дедлайн, изменённый между ними, не потеряется
+            await pubsub.subscribe(DEADLINE_CHANNEL)
+            await self.load_window(datetime.now(UTC))
+            renew_at = time.monotonic() + renew_interval
+
+            while True:
+                now = datetime.now(UTC)
+                if now >= self.horizon:
+                    await self.load_window(now)
+                await self.fire_due(now)
+
+                if time.monotonic() >= renew_at:
+                    if not await self.acquire_leadership():
+                        logger.warning("Deadline scheduler lost leadership")
+                        return
+                    renew_at = time.monotonic() + renew_interval
+
+                wake_at = min(self.horizon, self.next_reminder() or self.horizon)
+                timeout = min((wake_at - datetime.now(UTC)).total_seconds(), renew_at - time.monotonic())
+                # Ожидание сообщения — это и таймер: get_message возвращается по сообщению или по истечении timeout
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=max(timeout, 0.0))
+                if message is None:
+                    continue
+                try:
+                    self.apply_message(message["data"], datetime.now(UTC))
+                except (TypeError, ValueError):
+                    logger.warning("Skipping malformed case deadline message: %r", message.get("data"))
+
+    async def run(self) -> None:
+        """Фоновая задача каждого воркера: пытается стать лидером и, пока им остаётся, напоминает о дедлайнах"""
+        retry_delay = settings.CASE_DEADLINE_LEADER_TTL_SECONDS / 3
+        try:
+            while True:
+                try:
+                    if await self.acquire_leadership():
+                        logger.info("Deadline scheduler acquired leadership")
+                        await self.lead()
+                except (RedisError, SQLAlchemyError) as e:
+                    logger.warning("Deadline scheduler interrupted: %s", e)
+                await asyncio.sleep(retry_delay)
+        finally:
+            # Аренда освобождается сразу, чтобы другой воркер не ждал её истечения
+            with suppress(RedisError):
+                await self.release_leadership()
+
+
+def _log_scheduler_exit(task: asyncio.Task[None]) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error("Deadline scheduler stopped unexpectedly", exc_info=exc)
+    else:
+        logger.error("Deadline scheduler exited unexpectedly")
+
+
+def start_deadline_scheduler(redis: Redis) -> asyncio.Task[None]:
+    task = asyncio.create_task(DeadlineScheduler(redis, AsyncSessionLocal).run(), name="case-deadline-scheduler")
+    task.add_done_callback(_log_scheduler_exit)
+    return task
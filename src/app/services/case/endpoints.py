@@ -1,20 +1,35 @@
+import csv
 import logging
 import uuid
+from datetime import UTC, datetime
+from zipfile import BadZipFile
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from openpyxl.utils.exceptions import InvalidFileException
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.database import get_db
+from src.app.core.auth.rbac import RoleChecker
+from src.app.core.database import get_db, get_read_db
+from src.app.services.case.exporter import MEDIA_TYPES
+from src.app.services.case.importer import iter_upload_rows
 from src.app.services.case.schemas import (
+    CaseBulkUpdateRequest,
+    CaseBulkUpdateResponse,
     CaseCreateRequest,
     CaseDetailsResponse,
+    CaseExportQuery,
+    CaseImportResponse,
     CaseResponse,
+    CaseStatsQuery,
+    CaseStatsRow,
     CaseUpdateRequest,
     GetCasesQuery,
     GetCasesResponse,
 )
-from src.app.services.case.service import CaseService
+from src.app.services.case.service import CaseService, InvalidCursorError
+from src.app.services.user.models import UserRole
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +42,12 @@ router = APIRouter(prefix="/api/cases", tags=["Cases"])
     summary="Получить список дел",
     description="Возвращает список дел с фильтрацией, пагинацией и статистикой",
 )
-async def get_cases(params: GetCasesQuery = Depends(), db: AsyncSession = Depends(get_db)) -> GetCasesResponse:
+async def get_cases(params: GetCasesQuery = Query(), db: AsyncSession = Depends(get_read_db, scope="function")) -> GetCasesResponse:
     service = CaseService(db)
     try:
         return await service.get_cases(params)
+    except InvalidCursorError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Некорректный курсор пагинации") from err
     except Exception as err:
         logger.exception("Error fetching cases list")
         raise HTTPException(
@@ -39,6 +56,17 @@ async def get_cases(params: GetCasesQuery = Depends(), db: AsyncSession = Depend
         ) from err
 
 
+@router.get(
+    "/stats",
+    response_model=list[CaseStatsRow],
+    summary="Свод по делам",
+    description="Количество дел и суммы по статусу, эксперту, клиенту и месяцу начала работ",
+    dependencies=[Depends(RoleChecker([UserRole.ADMIN, UserRole.CEO, UserRole.ACCOUNTANT]))],
+)
+async def get_case_stats(params: CaseStatsQuery = Query(), db: AsyncSession = Depends(get_read_db, scope="function")) -> list[CaseStatsRow]:
+    return await CaseService(db).get_stats(params)
+
+
 @router.post(
     "",
     response_model=CaseResponse,
@@ -48,7 +76,7 @@ async def get_cases(params: GetCasesQuery = Depends(), db: AsyncSession = Depend
 )
 async def create_case(
     case_data: CaseCreateRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> CaseResponse:
     service = CaseService(db)
     try:
@@ -68,20 +96,73 @@ async def create_case(
         ) from err
 
 
+@router.get(
+    "/export",
+    summary="Выгрузка дел",
+    description="Все дела по фильтрам списка в CSV, NDJSON или XLSX. Ответ передаётся потоком.",
+    response_class=StreamingResponse,
+    dependencies=[Depends(RoleChecker([UserRole.ADMIN, UserRole.CEO, UserRole.ACCOUNTANT]))],
+)
+async def export_cases(params: CaseExportQuery = Query(), db: AsyncSession = Depends(get_read_db)) -> StreamingResponse:
+    # Сессия с областью запроса: курсор читается, пока отправляется тело, и закрывается после последнего байта
+    filename = f"cases-{datetime.now(UTC):%Y%m%d}.{params.format.value}"
+    return StreamingResponse(
+        CaseService(db).export_cases(params),
+        media_type=MEDIA_TYPES[params.format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.post(
+    "/import",
+    response_model=CaseImportResponse,
+    summary="Импорт дел из файла",
+    description="Загружает дела из CSV или XLSX. Заголовок — имена полей дела. Возвращает ошибки по номерам строк.",
+    dependencies=[Depends(RoleChecker([UserRole.ADMIN, UserRole.CEO]))],
+)
+async def import_cases(file: UploadFile = File(...), db: AsyncSession = Depends(get_db, scope="function")) -> CaseImportResponse:
+    try:
+        rows = iter_upload_rows(file.file, file.filename or "")
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+
+    try:
+        return await CaseService(db).import_cases(rows)
+    except (UnicodeDecodeError, csv.Error, InvalidFileException, BadZipFile) as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось прочитать файл") from err
+
+
+@router.patch(
+    "/bulk",
+    response_model=CaseBulkUpdateResponse,
+    summary="Массовое изменение дел",
+    description="Меняет статус и/или эксперта у списка дел одним запросом. Возвращает результат по каждому id.",
+    dependencies=[Depends(RoleChecker([UserRole.ADMIN, UserRole.CEO]))],
+)
+async def bulk_update_cases(request: CaseBulkUpdateRequest, db: AsyncSession = Depends(get_db, scope="function")) -> CaseBulkUpdateResponse:
+    try:
+        return await CaseService(db).bulk_update_cases(request)
+    except ValueError as err:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except IntegrityError as err:
+        # Например, эксперта удалили между проверкой и обновлением
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Изменение нарушает ограничения данных дел") from err
+
+
 @router.get(
     "/{case_id}",
     response_model=CaseDetailsResponse,
     summary="Детальная информация о деле",
     description="Возвращает полные данные дела, включая связи и историю",
 )
-async def get_case_details(case_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> CaseDetailsResponse:
+async def get_case_details(case_id: uuid.UUID, db: AsyncSession = Depends(get_db, scope="function")) -> CaseDetailsResponse:
     service = CaseService(db)
-    case_response = await service.get_case_by_id(str(case_id))
+    details = await service.get_case_details(case_id)
 
-    if not case_response:
+    if not details:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Дело не найдено")
 
-    return CaseDetailsResponse(case=case_response, assigned_experts=[], documents=[], events=[], history=[])
+    return details
 
 
 @router.patch(
@@ -90,15 +171,17 @@ async def get_case_details(case_id: uuid.UUID, db: AsyncSession = Depends(get_db
     summary="Обновить данные дела",
     description="Частичное обновление информации по существующему делу",
 )
-async def update_case(case_id: uuid.UUID, case_data: CaseUpdateRequest, db: AsyncSession = Depends(get_db)) -> CaseResponse:
+async def update_case(case_id: uuid.UUID, case_data: CaseUpdateRequest, db: AsyncSession = Depends(get_db, scope="function")) -> CaseResponse:
     service = CaseService(db)
     try:
         result = await service.update_case(str(case_id), case_data)
-        if not result:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Дело не найдено")
-        return result
     except ValueError as err:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(err)) from err
+    except IntegrityError as err:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Дело с таким номером уже существует или указан неверный клиент",
+        ) from err
     except Exception as err:
         logger.exception(f"Error updating case {case_id}")
         raise HTTPException(
@@ -106,6 +189,10 @@ async def update_case(case_id: uuid.UUID, case_data: CaseUpdateRequest, db: Asyn
             detail="Ошибка при обновлении данных дела",
         ) from err
 
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Дело не найдено")
+    return result
+
 
 @router.delete(
     "/{case_id}",
@@ -113,7 +200,7 @@ async def update_case(case_id: uuid.UUID, case_data: CaseUpdateRequest, db: Asyn
     summary="Удалить дело",
     description="Выполняет мягкое удаление дела (пометка deleted_at)",
 )
-async def delete_case(case_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> None:
+async def delete_case(case_id: uuid.UUID, db: AsyncSession = Depends(get_db, scope="function")) -> None:
     service = CaseService(db)
     success = await service.soft_delete_case(str(case_id))
     if not success:
@@ -0,0 +1,141 @@
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import uuid
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+from openpyxl import Workbook
+from sqlalchemy import ColumnElement, Row, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.app.core.config import settings
+from src.app.services.case.models import Case
+from src.app.services.case.schemas import ExportFormat
+
+# Заголовки совпадают с полями CaseResponse: выгрузку можно загрузить обратно через импорт
+EXPORT_COLUMNS: dict[str, InstrumentedAttribute[Any]] = {
+    "id": Case.id,
+    "number": Case.number,
+    "case_number": Case.case_number,
+    "authority": Case.authority,
+    "client_id": Case.client_id,
+    "case_type": Case.case_type,
+    "object_type": Case.object_type,
+    "object_address": Case.object_address,
+    "status": Case.status,
+    "assigned_expert_id": Case.assigned_user_id,
+    "start_date": Case.start_date,
+    "deadline": Case.deadline,
+    "completion_date": Case.completion_date,
+    "cost": Case.cost,
+    "bank_transfer_amount": Case.bank_transfer_amount,
+    "cash_amount": Case.cash_amount,
+    "remaining_debt": Case.remaining_debt,
+    "plaintiff": Case.plaintiff,
+    "defendant": Case.defendant,
+    "archive_status": Case.archive_status,
+    "remarks": Case.remarks,
+    "created_at": Case.created_at,
+    "updated_at": Case.updated_at,
+}
+HEADER = list(EXPORT_COLUMNS)
+
+MEDIA_TYPES = {
+    ExportFormat.csv: "text/csv; charset=utf-8",
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+XLSX_READ_SIZE = 64 * 1024
+
+
+async def stream_batches(db: AsyncSession, filters: list[ColumnElement[bool]]) -> AsyncIterator[Sequence[Row[tuple[object, ...]]]]:
+    """
+    Дела пачками по CASE_EXPORT_BATCH_SIZE через серверный курсор.
+    Читаются кортежи колонок, а не ORM-объекты: в памяти одновременно только одна пачка.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS.values())
+        .where(*filters)
+        .order_by(Case.deadline, Case.id)
+        .execution_options(yield_per=settings.CASE_EXPORT_BATCH_SIZE)
+    )
+    result = await db.stream(stmt)
+    async for partition in result.partitions():
+        yield partition
+
+
+def _text(value: object) -> object:
+    """Значение для CSV и NDJSON: JSON-совместимый тип без потери точности сумм"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID | Decimal):
+        return str(value)
+    return value
+
+
+def _cell(value: object) -> object:
+    """Значение ячейки XLSX: Excel не хранит часовой пояс, поэтому даты приводятся к UTC"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(UTC).replace(tzinfo=None)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+async def export_csv(batches: AsyncIterator[Sequence[Row[tuple[object, ...]]]]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM: Excel иначе открывает UTF-8 как cp1251
+    buffer.write("\ufeff")
+    writer.writerow(HEADER)
+    async for batch in batches:
+        writer.writerows([_text(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def export_ndjson(batches: AsyncIterator[Sequence[Row[tuple[object, ...]]]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        lines = (json.dumps(dict(zip(HEADER, map(_text, row), strict=True)), ensure_ascii=False) for row in batch)
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def export_xlsx(batches: AsyncIterator[Sequence[Row[tuple[object, ...]]]]) -> AsyncIterator[bytes]:
+    """
+    XLSX — zip-архив, и отдать его можно только целиком. Книга в режиме write_only пишет строки во временный файл,
+    поэтому память не растёт с числом дел; готовый файл отдаётся кусками.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Дела")
+    sheet.append(HEADER)
+    async for batch in batches:
+        for row in batch:
+            sheet.append([_cell(value) for value in row])
+
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+        while chunk := await asyncio.to_thread(file.read, XLSX_READ_SIZE):
+            yield chunk
+
+
+EXPORTERS = {
+    ExportFormat.csv: export_csv,
+    ExportFormat.ndjson: export_ndjson,
+    ExportFormat.xlsx: export_xlsx,
+}
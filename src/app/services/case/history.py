@@ -0,0 +1,52 @@
+import uuid
+from collections.abc import Iterable, Mapping
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import Select, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.services.case.models import Case, CaseEvent, CaseEventType
+
+
+def json_value(value: object) -> object:
+    """Значение поля для журнала: JSON-совместимое, суммы без потери точности"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID | Decimal):
+        return str(value)
+    return value
+
+
+def field_changes(fields: Iterable[str], old: Mapping[str, object], new: Mapping[str, object]) -> dict[str, object]:
+    """Изменения для журнала: только поля, значение которых действительно стало другим"""
+    return {field: {"old": json_value(old[field]), "new": json_value(new[field])} for field in fields if old[field] != new[field]}
+
+
+class CaseHistoryBuffer:
+    """
+    События дел в рамках одной транзакции.
+    Копятся в памяти и пишутся одной многострочной вставкой перед коммитом: журнал добавляет к изменению один запрос,
+    сколько бы дел и полей ни изменилось.
+    """
+
+    def __init__(self) -> None:
+        self._rows: list[dict[str, object]] = []
+
+    def record(self, case_id: uuid.UUID, event_type: CaseEventType, changes: dict[str, object] | None = None) -> None:
+        self._rows.append({"case_id": case_id, "event_type": event_type, "changes": changes})
+
+    async def flush(self, db: AsyncSession) -> None:
+        if not self._rows:
+            return
+        await db.execute(insert(CaseEvent).values(self._rows))
+        self._rows = []
+
+
+async def record_created_cases(db: AsyncSession, case_ids: Select[tuple[uuid.UUID]]) -> None:
+    """События создания для только что вставленных дел одним INSERT ... SELECT — для массовой загрузки"""
+    events = select(Case.id, literal(CaseEventType.created.value)).where(Case.id.in_(case_ids))
+    await db.execute(insert(CaseEvent).from_select(["case_id", "event_type"], events))
@@ -0,0 +1,256 @@
+import asyncio
+import codecs
+import csv
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import IO
+
+from openpyxl import load_workbook
+from pydantic import ValidationError
+from sqlalchemy import Uuid, column, exists, select, table, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import settings
+from src.app.services.case.history import CaseHistoryBuffer, record_created_cases
+from src.app.services.case.models import Case, CaseEventType
+from src.app.services.case.schemas import CaseCreateRequest, CaseImportError
+from src.app.services.case.stats import CaseStatsDelta, add_cases_to_stats
+from src.app.services.client.models import Client
+
+# Колонки cases, которые заполняет импорт; остальные (created_at, updated_at) берутся из DEFAULT
+IMPORT_COLUMNS = (
+    "id",
+    "client_id",
+    "number",
+    "case_number",
+    "authority",
+    "case_type",
+    "object_type",
+    "object_address",
+    "status",
+    "assigned_user_id",
+    "start_date",
+    "deadline",
+    "completion_date",
+    "cost",
+    "bank_transfer_amount",
+    "cash_amount",
+    "remaining_debt",
+    "plaintiff",
+    "defendant",
+    "archive_status",
+    "remarks",
+)
+
+RawRow = dict[str, object]
+
+# Временная таблица загрузки; row_number — номер строки в файле для отчёта об ошибках
+staging_table = table("case_import", column("id", Uuid()))
+
+
+def _iter_csv(file: IO[bytes]) -> Iterator[RawRow]:
+    # utf-8-sig: Excel сохраняет CSV с BOM
+    yield from csv.DictReader(codecs.iterdecode(file, "utf-8-sig"))
+
+
+def _iter_xlsx(file: IO[bytes]) -> Iterator[RawRow]:
+    # read_only: строки читаются потоково, без загрузки всего листа в память
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for values in rows:
+            yield dict(zip(header, values, strict=False))
+    finally:
+        workbook.close()
+
+
+def iter_upload_rows(file: IO[bytes], filename: str) -> Iterator[RawRow]:
+    """Строки загруженного файла в виде словарей по заголовку. Формат определяется по расширению."""
+    if filename.lower().endswith(".xlsx"):
+        return _iter_xlsx(file)
+    if filename.lower().endswith(".csv"):
+        return _iter_csv(file)
+    raise ValueError("Поддерживаются только файлы CSV и XLSX")
+
+
+async def read_chunks(rows: Iterator[RawRow], chunk_size: int) -> AsyncIterator[list[RawRow]]:
+    """Читает строки пачками в отдельном потоке: разбор файла не блокирует event loop"""
+
+    def next_chunk() -> list[RawRow]:
+        return [row for _, row in zip(range(chunk_size), rows, strict=False)]
+
+    while chunk := await asyncio.to_thread(next_chunk):
+        yield chunk
+
+
+def _clean(row: RawRow) -> RawRow:
+    """Пустые ячейки — отсутствующие поля (действуют значения по умолчанию); числа Excel — через str, без погрешности float"""
+    cleaned: RawRow = {}
+    for key, value in row.items():
+        if not key or value is None or (isinstance(value, str) and not value.strip()):
+            continue
+        cleaned[key] = str(value) if isinstance(value, float) else value
+    return cleaned
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def validate_row(row_number: int, row: RawRow, errors: list[CaseImportError]) -> CaseCreateRequest | None:
+    """Проверяет строку файла. Ошибки дописываются в errors с номером строки."""
+    try:
+        case = CaseCreateRequest.model_validate(_clean(row))
+    except ValidationError as err:
+        for error in err.errors():
+            field = ".".join(str(part) for part in error["loc"]) or None
+            errors.append(CaseImportError(row=row_number, field=field, message=error["msg"]))
+        return None
+
+    if case.deadline < case.start_date:
+        errors.append(CaseImportError(row=row_number, field="deadline", message="Deadline cannot be before start date"))
+        return None
+    return case
+
+
+@dataclass(slots=True)
+class ImportResult:
+    total_rows: int
+    imported: int
+    errors: list[CaseImportError]
+
+
+class CaseImporter:
+    """
+    Массовая загрузка дел одной транзакцией.
+    Строки проверяются пачками через CaseCreateRequest. На PostgreSQL пачки идут через COPY во временную таблицу,
+    затем одна вставка переносит их в cases, пропуская дубли и неизвестных клиентов.
+    На других СУБД (SQLite в тестах) строки вставляются по одной под точкой сохранения.
+    """
+
+    def __init__(self, db_session: AsyncSession) -> None:
+        self.db = db_session
+        self.errors: list[CaseImportError] = []
+        self.total_rows = 0
+        self.imported = 0
+
+    async def run(self, rows: Iterator[RawRow]) -> ImportResult:
+        is_postgres = self.db.get_bind().dialect.name == "postgresql"
+        if is_postgres:
+            await self._create_staging_table()
+
+        async for chunk in read_chunks(rows, settings.CASE_IMPORT_CHUNK_SIZE):
+            valid: list[tuple[int, CaseCreateRequest]] = []
+            for row in chunk:
+                self.total_rows += 1
+                # Строка 1 — заголовок
+                case = validate_row(self.total_rows + 1, row, self.errors)
+                if case is not None:
+                    valid.append((self.total_rows + 1, case))
+
+            if is_postgres:
+                await self._copy_to_staging(valid)
+            else:
+                await self._insert_one_by_one(valid)
+
+        if is_postgres:
+            await self._merge_staging()
+        await self.db.commit()
+
+        self.errors.sort(key=lambda error: error.row)
+        return ImportResult(total_rows=self.total_rows, imported=self.imported, errors=self.errors)
+
+    @staticmethod
+    def _record(row_number: int, case: CaseCreateRequest) -> tuple[object, ...]:
+        values = case.model_dump()
+        values["id"] = uuid.uuid4()
+        values["assigned_user_id"] = values.pop("assigned_expert_id")
+        values["status"] = case.status.value
+        for field in ("start_date", "deadline", "completion_date"):
+            values[field] = _utc(values[field])
+        return (row_number, *(values[name] for name in IMPORT_COLUMNS))
+
+    async def _create_staging_table(self) -> None:
+        # Без ограничений cases: дубли и неизвестные клиенты отсеиваются при переносе, а не обрывают COPY
+        await self.db.execute(text("CREATE TEMP TABLE case_import (LIKE cases INCLUDING DEFAULTS) ON COMMIT DROP"))
+        await self.db.execute(text("ALTER TABLE case_import ADD COLUMN row_number integer NOT NULL"))
+
+    async def _copy_to_staging(self, valid: list[tuple[int, CaseCreateRequest]]) -> None:
+        if not valid:
+            return
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        # То же asyncpg-соединение и та же транзакция, что у сессии: временная таблица видна и живёт до коммита
+        driver_connection = raw_connection.driver_connection
+        assert driver_connection is not None
+        await driver_connection.copy_records_to_table(
+            "case_import",
+            records=[self._record(row_number, case) for row_number, case in valid],
+            columns=["row_number", *IMPORT_COLUMNS],
+        )
+
+    async def _merge_staging(self) -> None:
+        columns = ", ".join(IMPORT_COLUMNS)
+        inserted = await self.db.execute(
+            text(
+                f"""
+                INSERT INTO cases ({columns})
+                SELECT {columns} FROM case_import
+                WHERE EXISTS (SELECT 1 FROM clients WHERE clients.id = case_import.client_id)
+                ORDER BY row_number
+                ON CONFLICT DO NOTHING
+                RETURNING id
+                """
+            )
+        )
+        self.imported = len(inserted.all())
+
+        rejected = await self.db.execute(
+            text(
+                """
+                SELECT s.row_number, NOT EXISTS (SELECT 1 FROM clients WHERE clients.id = s.client_id) AS unknown_client
+                FROM case_import s
+                WHERE NOT EXISTS (SELECT 1 FROM cases WHERE cases.id = s.id)
+                """
+            )
+        )
+        for row_number, unknown_client in rejected:
+            self.errors.append(self._rejection(row_number, unknown_client))
+
+        if self.imported:
+            await add_cases_to_stats(self.db, select(staging_table.c.id))
+            await record_created_cases(self.db, select(staging_table.c.id))
+
+    @staticmethod
+    def _rejection(row_number: int, unknown_client: bool) -> CaseImportError:
+        if unknown_client:
+            return CaseImportError(row=row_number, field="client_id", message="Клиент не найден")
+        return CaseImportError(row=row_number, field="number", message="Дело с таким номером уже существует")
+
+    async def _insert_one_by_one(self, valid: list[tuple[int, CaseCreateRequest]]) -> None:
+        delta = CaseStatsDelta()
+        history = CaseHistoryBuffer()
+        for row_number, request in valid:
+            record = self._record(row_number, request)
+            case = Case(**dict(zip(IMPORT_COLUMNS, record[1:], strict=True)))
+            unknown_client = not await self.db.scalar(select(exists().where(Client.id == case.client_id)))
+            if unknown_client:
+                self.errors.append(self._rejection(row_number, unknown_client=True))
+                continue
+            try:
+                async with self.db.begin_nested():
+                    self.db.add(case)
+            except IntegrityError:
+                self.errors.append(self._rejection(row_number, unknown_client=False))
+                continue
+            delta.add(case)
+            history.record(case.id, CaseEventType.created)
+            self.imported += 1
+        await delta.apply(self.db)
+        await history.flush(self.db)
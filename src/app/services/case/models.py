@@ -1,10 +1,28 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, Text, func
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    CheckConstraint,
+    Connection,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    event,
+    func,
+    text,
+)
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -28,6 +46,17 @@ class CaseStatus(str, Enum):
     fssp = "fssp"
 
 
+# Дела в этих статусах не считаются активными и не могут быть просрочены
+INACTIVE_STATUSES = (CaseStatus.executed, CaseStatus.cancelled, CaseStatus.archive)
+
+
+class CaseEventType(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    deadline = "deadline"
+
+
 class Case(Base):
     __tablename__ = "cases"
 
@@ -65,10 +94,147 @@ class Case(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())  # Дата создания
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Дата обновления
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True)  # Дата логического удаления
+    deadline_notified_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))  # Когда сработало напоминание о дедлайне
 
     client: Mapped[Client] = relationship("Client", back_populates="cases")
     assigned_user: Mapped[User | None] = relationship("User", back_populates="cases")
     documents: Mapped[list[Document]] = relationship("Document", back_populates="case", cascade="all, delete-orphan")
     mail_messages: Mapped[list[MailMessage]] = relationship("MailMessage", back_populates="case")
 
-    __table_args__ = (Index("ix_cases_client_status", "client_id", "status"),)  # Индекс для фильтрации по клиенту и статусу
+    __table_args__ = (
+        # Инвариант проверяет база: обновление одним UPDATE не читает дело заранее
+        CheckConstraint("deadline >= start_date", name="deadline_after_start"),
+        Index("ix_cases_client_status", "client_id", "status"),  # Индекс для фильтрации по клиенту и статусу
+        # Ключи курсорной пагинации списка: (deadline, id) и (created_at, id) по неудалённым делам
+        Index("ix_cases_deadline_id", "deadline", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_cases_created_at_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        # Фильтры списка по неудалённым делам: статус, эксперт, клиент и период начала работ
+        Index("ix_cases_active_status_deadline", "status", "deadline", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_cases_active_expert_deadline", "assigned_user_id", "deadline", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_cases_active_client_start_date", "client_id", "start_date", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_cases_active_start_date", "start_date", postgresql_where=text("deleted_at IS NULL")),
+        # Дедлайны, о которых ещё не напомнили: окно планировщика читается по нему, и индекс сжимается по мере напоминаний
+        Index("ix_cases_deadline_pending", "deadline", postgresql_where=text("deleted_at IS NULL AND deadline_notified_at IS NULL")),
+    )
+
+
+# Поиск по делам (только PostgreSQL). Обе колонки генерируемые и в модель не отображаются: их не нужно читать,
+# а SQLite таких выражений не поймёт. search_vector — взвешенный tsvector: номера важнее сторон, стороны важнее адреса и органа.
+# search_text — те же поля одной строкой для триграммного поиска с опечатками.
+CASE_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce(number, '') || ' ' || coalesce(case_number, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(plaintiff, '') || ' ' || coalesce(defendant, '')), 'B') || "
+    "setweight(to_tsvector('russian', coalesce(object_address, '')), 'C') || "
+    "setweight(to_tsvector('russian', coalesce(authority, '')), 'D')"
+)
+CASE_SEARCH_TEXT_SQL = (
+    "coalesce(number, '') || ' ' || coalesce(case_number, '') || ' ' || coalesce(plaintiff, '') || ' ' || "
+    "coalesce(defendant, '') || ' ' || coalesce(object_address, '') || ' ' || coalesce(authority, '')"
+)
+
+CASE_SEARCH_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"ALTER TABLE cases ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({CASE_SEARCH_VECTOR_SQL}) STORED",
+    f"ALTER TABLE cases ADD COLUMN search_text text GENERATED ALWAYS AS ({CASE_SEARCH_TEXT_SQL}) STORED",
+    "CREATE INDEX ix_cases_search_vector ON cases USING gin (search_vector) WHERE deleted_at IS NULL",
+    "CREATE INDEX ix_cases_search_text ON cases USING gin (search_text gin_trgm_ops) WHERE deleted_at IS NULL",
+)
+
+
+@event.listens_for(Case.__table__, "after_create")
+def create_case_search_columns(target: Table, connection: Connection, **kw: object) -> None:
+    """Колонки поиска при create_all (тесты, новые базы); в существующих базах их добавляет миграция"""
+    if connection.dialect.name == "postgresql":
+        for statement in CASE_SEARCH_DDL:
+            connection.execute(text(statement))
+
+
+class CaseStats(Base):
+    """
+    Свод по делам в разрезе статуса, эксперта, клиента и месяца начала работ.
+    Обновляется в той же транзакции, что и дела; удалённые дела в свод не входят.
+    """
+
+    __tablename__ = "case_stats"
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)  # Уникальный идентификатор строки свода
+    status: Mapped[CaseStatus] = mapped_column(SQLEnum(CaseStatus, native_enum=False), nullable=False)  # Статус дел
+    # Назначенный эксперт (NULL — без эксперта). Без внешнего ключа: при удалении пользователя его строки не удаляются,
+    # а переходят в группу без эксперта — как и его дела (ON DELETE SET NULL). Это делает триггер CASE_STATS_FOLD_EXPERT_DDL.
+    assigned_user_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    client_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("clients.id", ondelete="CASCADE"), nullable=False)  # Клиент
+    month: Mapped[date] = mapped_column(Date, nullable=False)  # Первое число месяца start_date (UTC)
+    cases_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Количество дел
+    cost: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))  # Сумма стоимости
+    bank_transfer_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))  # Сумма переводов на счёт
+    cash_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))  # Сумма наличных
+    remaining_debt: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=Decimal("0.00"))  # Сумма оставшегося долга
+
+    __table_args__ = (
+        # Ключ группы. NULLS NOT DISTINCT: дела без эксперта тоже сходятся в одну строку и upsert находит её
+        Index(
+            "uq_case_stats_group",
+            "status",
+            "assigned_user_id",
+            "client_id",
+            "month",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+
+# Удаление пользователя (в том числе каскадом от компании) переносит его строки свода в группу без эксперта.
+# В одной группе эксперта не бывает двух строк, поэтому и в группе без эксперта каждая строка upsert встречается один раз.
+CASE_STATS_FOLD_EXPERT_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION case_stats_fold_expert() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO case_stats AS s (id, status, assigned_user_id, client_id, month, cases_count,
+                                     cost, bank_transfer_amount, cash_amount, remaining_debt)
+        SELECT gen_random_uuid(), status, NULL, client_id, month, cases_count,
+               cost, bank_transfer_amount, cash_amount, remaining_debt
+        FROM case_stats
+        WHERE assigned_user_id = OLD.id
+        ON CONFLICT (status, assigned_user_id, client_id, month) DO UPDATE SET
+            cases_count = s.cases_count + excluded.cases_count,
+            cost = s.cost + excluded.cost,
+            bank_transfer_amount = s.bank_transfer_amount + excluded.bank_transfer_amount,
+            cash_amount = s.cash_amount + excluded.cash_amount,
+            remaining_debt = s.remaining_debt + excluded.remaining_debt;
+        DELETE FROM case_stats WHERE assigned_user_id = OLD.id;
+        RETURN OLD;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "CREATE OR REPLACE TRIGGER users_fold_case_stats AFTER DELETE ON users FOR EACH ROW EXECUTE FUNCTION case_stats_fold_expert()",
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_case_stats_fold_trigger(target: MetaData, connection: Connection, **kw: object) -> None:
+    """Триггер при create_all (тесты, новые базы) — после всех таблиц, когда есть и users, и case_stats. В существующих базах — миграция."""
+    if connection.dialect.name == "postgresql":
+        for statement in CASE_STATS_FOLD_EXPERT_DDL:
+            connection.execute(text(statement))
+
+
+class CaseEvent(Base):
+    """
+    Журнал изменений дела, только для дописывания.
+    changes — изменённые поля в виде {"поле": {"old": ..., "new": ...}}; у создания и удаления пуст.
+    """
+
+    __tablename__ = "case_events"
+
+    # Последовательный ключ: порядок событий внутри одной транзакции, где created_at совпадает
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    case_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("cases.id", ondelete="CASCADE"), nullable=False)  # Дело
+    event_type: Mapped[CaseEventType] = mapped_column(SQLEnum(CaseEventType, native_enum=False), nullable=False)  # Тип события
+    changes: Mapped[dict[str, Any] | None] = mapped_column(JSON(none_as_null=True))  # Изменённые поля: старое и новое значение
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())  # Время события
+
+    __table_args__ = (
+        # История дела читается от новых событий к старым
+        Index("ix_case_events_case_created", "case_id", "created_at"),
+    )
@@ -0,0 +1,26 @@
+"""
+Пересчёт свода case_stats с нуля по таблице дел.
+
+Нужен после первого применения миграции, ручных правок дел в БД или при расхождении свода.
+
+Использование:
+    make rebuild-case-stats
+"""
+
+import asyncio
+
+from src.app.core.database import all_models  # noqa: F401
+from src.app.core.database.session import AsyncSessionLocal, engine
+from src.app.services.case.stats import rebuild_case_stats
+
+
+async def main() -> None:
+    async with AsyncSessionLocal() as session:
+        groups = await rebuild_case_stats(session)
+        await session.commit()
+    await engine.dispose()
+    print(f"case_stats rebuilt: {groups} groups")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,13 @@
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Any
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, model_validator
+
+from src.app.services.document.schemas import DocumentResponse
+from src.app.services.mail.models import MailMessageType
 
 
 class CaseStatus(str, Enum):
@@ -35,7 +38,8 @@ class CaseBase(BaseModel):
     cash_amount: Decimal = Decimal("0.00")
     remaining_debt: Decimal = Decimal("0.00")
     completion_date: datetime | None = None
-    assigned_expert_id: str | None = None
+    # В модели это assigned_user_id: из ORM-объекта поле читается по нему
+    assigned_expert_id: uuid.UUID | None = Field(None, validation_alias=AliasChoices("assigned_expert_id", "assigned_user_id"))
     archive_status: str | None = None
     remarks: str | None = None
 
@@ -62,7 +66,7 @@ class CaseUpdateRequest(BaseModel):
     cash_amount: Decimal | None = None
     remaining_debt: Decimal | None = None
     completion_date: datetime | None = None
-    assigned_expert_id: str | None = None
+    assigned_expert_id: uuid.UUID | None = None
     archive_status: str | None = None
     remarks: str | None = None
 
@@ -75,21 +79,80 @@ class CaseResponse(CaseBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-class GetCasesQuery(BaseModel):
+class CaseBulkPatch(BaseModel):
+    """Поля, которые массово меняются у всех выбранных дел. Переданный null снимает эксперта."""
+
+    status: CaseStatus | None = None
+    assigned_expert_id: uuid.UUID | None = None
+
+    @model_validator(mode="after")
+    def status_is_not_null(self) -> CaseBulkPatch:
+        # Статус дела обязателен: null можно передать только для эксперта
+        if "status" in self.model_fields_set and self.status is None:
+            raise ValueError("status cannot be null")
+        return self
+
+
+class CaseBulkUpdateRequest(BaseModel):
+    ids: list[uuid.UUID] = Field(..., min_length=1, max_length=1000)
+    patch: CaseBulkPatch
+
+
+class CaseBulkOutcome(str, Enum):
+    updated = "updated"
+    not_found = "not_found"  # Дела нет или оно удалено
+
+
+class CaseBulkResult(BaseModel):
+    id: uuid.UUID
+    outcome: CaseBulkOutcome
+
+
+class CaseBulkUpdateResponse(BaseModel):
+    updated: int
+    results: list[CaseBulkResult]
+
+
+class CaseSort(str, Enum):
+    deadline = "deadline"
+    created_at = "created_at"
+
+
+class CaseFilterParams(BaseModel):
+    q: str | None = Field(None, max_length=200, description="Поиск по номерам, сторонам, адресу и органу, допускает опечатки")
     status: list[CaseStatus] | None = None
-    expert_id: str | None = None
+    expert_id: uuid.UUID | None = None
     client_id: uuid.UUID | None = None
     start_date: datetime | None = None
     end_date: datetime | None = None
+
+
+class GetCasesQuery(CaseFilterParams):
+    sort: CaseSort = CaseSort.deadline
+    cursor: str | None = Field(
+        None,
+        description="next_cursor из предыдущего ответа. Если передан, page игнорируется. При поиске (q) не выдаётся: выдача по релевантности.",
+    )
     page: int = Field(1, ge=1)
     limit: int = Field(20, ge=1, le=100)
 
 
+class ExportFormat(str, Enum):
+    csv = "csv"
+    ndjson = "ndjson"
+    xlsx = "xlsx"
+
+
+class CaseExportQuery(CaseFilterParams):
+    format: ExportFormat = ExportFormat.csv
+
+
 class PaginationInfo(BaseModel):
     total: int
     page: int
     limit: int
     total_pages: int
+    next_cursor: str | None = None  # None — это последняя страница
 
 
 class CasesSummary(BaseModel):
@@ -104,9 +167,81 @@ class GetCasesResponse(BaseModel):
     summary: CasesSummary
 
 
+class CaseStatsQuery(BaseModel):
+    status: list[CaseStatus] | None = None
+    expert_id: uuid.UUID | None = None
+    client_id: uuid.UUID | None = None
+    month_from: date | None = None
+    month_to: date | None = None
+
+
+class CaseStatsRow(BaseModel):
+    status: CaseStatus
+    assigned_expert_id: uuid.UUID | None = Field(None, validation_alias=AliasChoices("assigned_expert_id", "assigned_user_id"))
+    client_id: uuid.UUID
+    month: date
+    cases_count: int
+    cost: Decimal
+    bank_transfer_amount: Decimal
+    cash_amount: Decimal
+    remaining_debt: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CaseImportError(BaseModel):
+    row: int  # Номер строки в файле, заголовок — строка 1
+    field: str | None = None
+    message: str
+
+
+class CaseImportResponse(BaseModel):
+    total_rows: int
+    imported: int
+    errors: list[CaseImportError]
+
+
+class CaseExpertInfo(BaseModel):
+    id: uuid.UUID
+    full_name: str
+    email: str
+    specialization: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CaseMailEvent(BaseModel):
+    """Письмо по делу в ленте событий: без тела и вложений"""
+
+    id: uuid.UUID
+    subject: str | None = None
+    sender_email: str
+    sender_name: str | None = None
+    message_type: MailMessageType
+    processed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CaseEventType(str, Enum):
+    created = "created"
+    updated = "updated"
+    deleted = "deleted"
+    deadline = "deadline"
+
+
+class CaseHistoryEntry(BaseModel):
+    id: int
+    event_type: CaseEventType
+    changes: dict[str, Any] | None = None  # {"поле": {"old": ..., "new": ...}}
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class CaseDetailsResponse(BaseModel):
     case: CaseResponse
-    assigned_experts: list[dict[str, Any]] = []
-    documents: list[dict[str, Any]] = []
-    events: list[dict[str, Any]] = []
-    history: list[dict[str, Any]] = []
+    assigned_experts: list[CaseExpertInfo] = []
+    documents: list[DocumentResponse] = []
+    events: list[CaseMailEvent] = []  # Последние письма по делу, новые первыми
+    history: list[CaseHistoryEntry] = []  # Последние изменения дела, новые первыми
@@ -0,0 +1,43 @@
+from sqlalchemy import ColumnElement, Text, UnaryExpression, cast, func, literal, literal_column, or_
+from sqlalchemy.dialects import postgresql
+
+from src.app.services.case.models import Case
+
+# Генерируемые колонки поиска из CASE_SEARCH_VECTOR_SQL и CASE_SEARCH_TEXT_SQL. literal_column, а не Column:
+# в модели их нет, а лишняя таблица в FROM не появляется
+search_vector = literal_column("cases.search_vector", postgresql.TSVECTOR)
+search_text = literal_column("cases.search_text", Text)
+
+# Поля, по которым ищет запасной вариант для других СУБД (SQLite в тестах)
+SEARCH_FIELDS = (Case.number, Case.case_number, Case.authority, Case.object_address, Case.plaintiff, Case.defendant)
+
+
+def web_search_query(q: str) -> ColumnElement[str]:
+    """Запрос в синтаксисе поисковиков: слова, "фраза", -исключение, or"""
+    return func.websearch_to_tsquery(cast(literal("russian"), postgresql.REGCONFIG), q, type_=postgresql.TSQUERY)
+
+
+def search_terms(q: str | None) -> str | None:
+    """Строка поиска без крайних пробелов; пустая — поиска нет"""
+    return (q or "").strip() or None
+
+
+def search_condition(q: str, dialect: str) -> ColumnElement[bool]:
+    """
+    Дело подходит, если совпали слова запроса с учётом морфологии или запрос похож на часть текста дела.
+    Второе условие ловит опечатки и незаконченные слова. Обе ветки идут по GIN-индексам и объединяются через BitmapOr.
+    """
+    if dialect != "postgresql":
+        return or_(*(field.icontains(q, autoescape=True) for field in SEARCH_FIELDS))
+    tsquery = web_search_query(q)
+    # %> — word_similarity(q, search_text) выше pg_trgm.word_similarity_threshold
+    return or_(search_vector.bool_op("@@")(tsquery), search_text.bool_op("%>")(literal(q, Text)))
+
+
+def search_order(q: str) -> list[UnaryExpression[float]]:
+    """Сначала точные совпадения по весу полей, затем по похожести текста"""
+    tsquery = web_search_query(q)
+    return [
+        func.ts_rank_cd(search_vector, tsquery).desc(),
+        func.word_similarity(literal(q, Text), search_text).desc(),
+    ]
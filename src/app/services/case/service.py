@@ -1,39 +1,142 @@
+import base64
+import json
+import logging
 import uuid
-from datetime import datetime
-
-from sqlalchemy import func, select
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import ColumnElement, Select, any_, exists, func, literal, select, tuple_, update
+from sqlalchemy import case as sql_case
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from src.app.services.case.models import Case, CaseStatus
+from sqlalchemy.orm import InstrumentedAttribute, joinedload, selectinload
+
+from src.app.core.config import settings
+from src.app.core.database import is_replica_session
+from src.app.core.redis import get_redis_client
+from src.app.services.case.cache import CaseSummaryCache, SummaryEntry, filters_key
+from src.app.services.case.deadlines import publish_deadlines
+from src.app.services.case.exporter import EXPORTERS, stream_batches
+from src.app.services.case.history import CaseHistoryBuffer, field_changes
+from src.app.services.case.importer import CaseImporter, RawRow
+from src.app.services.case.models import INACTIVE_STATUSES, Case, CaseEvent, CaseEventType, CaseStats
 from src.app.services.case.schemas import (
+    CaseBulkOutcome,
+    CaseBulkResult,
+    CaseBulkUpdateRequest,
+    CaseBulkUpdateResponse,
     CaseCreateRequest,
+    CaseDetailsResponse,
+    CaseExpertInfo,
+    CaseExportQuery,
+    CaseFilterParams,
+    CaseHistoryEntry,
+    CaseImportResponse,
+    CaseMailEvent,
     CaseResponse,
+    CaseSort,
     CasesSummary,
+    CaseStatsQuery,
+    CaseStatsRow,
     CaseUpdateRequest,
     GetCasesQuery,
     GetCasesResponse,
     PaginationInfo,
 )
+from src.app.services.case.search import search_condition, search_order, search_terms
+from src.app.services.case.stats import AMOUNT_FIELDS, CaseContribution, CaseStatsDelta
+from src.app.services.document.models import Document
+from src.app.services.document.schemas import DocumentResponse
+from src.app.services.mail.models import MailMessage
+from src.app.services.user.models import User
+
+logger = logging.getLogger(__name__)
+
+# Имя ограничения cases с учётом соглашения об именах метаданных
+DEADLINE_CONSTRAINT = "ck_cases_deadline_after_start"
+
+SORT_COLUMNS: dict[CaseSort, InstrumentedAttribute[datetime]] = {
+    CaseSort.deadline: Case.deadline,
+    CaseSort.created_at: Case.created_at,
+}
+
+
+class InvalidCursorError(ValueError):
+    """Курсор пагинации повреждён или выдан для другого порядка сортировки"""
+
+
+def encode_cursor(sort: CaseSort, sort_value: datetime, case_id: uuid.UUID) -> str:
+    """Курсор — позиция последнего дела страницы в порядке (sort, id). Для клиента это непрозрачная строка."""
+    payload = json.dumps([sort.value, sort_value.isoformat(), case_id.hex])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: CaseSort) -> tuple[datetime, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, sort_value, case_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort.value:
+            raise ValueError("Cursor was issued for a different sort order")
+        return datetime.fromisoformat(sort_value), uuid.UUID(hex=case_id)
+    except (TypeError, ValueError) as err:
+        raise InvalidCursorError("Invalid cursor") from err
 
 
 class CaseService:
     def __init__(self, db_session: AsyncSession) -> None:
         self.db = db_session
 
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    async def _invalidate_summaries(self) -> None:
+        await CaseSummaryCache(await get_redis_client()).invalidate()
+
+    @staticmethod
+    async def _publish_deadlines(cases: list[tuple[uuid.UUID, datetime]]) -> None:
+        """Перевзводит напоминания планировщика дедлайнов по созданным и изменённым делам"""
+        if cases:
+            await publish_deadlines(await get_redis_client(), cases)
+
     async def create_case(self, case_data: CaseCreateRequest) -> CaseResponse:
         """Создает новое дело"""
         if case_data.deadline < case_data.start_date:
             raise ValueError("Deadline cannot be before start date")
 
         data = case_data.model_dump(exclude={"id"})
-        case = Case(**data)
+        data["assigned_user_id"] = data.pop("assigned_expert_id")
+        # id задаётся сразу: событие создания ссылается на дело ещё до вставки
+        case = Case(id=uuid.uuid4(), **data)
 
         self.db.add(case)
+        delta = CaseStatsDelta()
+        delta.add(case)
+        await delta.apply(self.db)
+        history = CaseHistoryBuffer()
+        history.record(case.id, CaseEventType.created)
+        await history.flush(self.db)
         await self.db.commit()
-        await self.db.refresh(case)
+        await self._invalidate_summaries()
+        await self._publish_deadlines([(case.id, case.deadline)])
 
         return CaseResponse.model_validate(case)
 
+    async def import_cases(self, rows: Iterator[RawRow]) -> CaseImportResponse:
+        """Массовая загрузка дел из строк файла; некорректные строки пропускаются и попадают в errors"""
+        result = await CaseImporter(self.db).run(rows)
+        if result.imported:
+            await self._invalidate_summaries()
+        return CaseImportResponse(total_rows=result.total_rows, imported=result.imported, errors=result.errors)
+
+    def export_cases(self, query_params: CaseExportQuery) -> AsyncIterator[bytes]:
+        """Выгрузка всех дел по фильтрам списка. Тело ответа формируется по мере чтения курсора."""
+        batches = stream_batches(self.db, self.list_filters(query_params, self.dialect))
+        return EXPORTERS[query_params.format](batches)
+
     async def get_case_by_id(self, case_id: str) -> CaseResponse | None:
         """Получает дело по ID"""
         stmt = select(Case).where(Case.id == uuid.UUID(case_id), Case.deleted_at.is_(None))
@@ -45,108 +148,341 @@ class CaseService:
 
         return CaseResponse.model_validate(case)
 
-    async def update_case(self, case_id: str, update_data: CaseUpdateRequest) -> CaseResponse | None:
-        """Обновляет дело"""
-        stmt = select(Case).where(Case.id == uuid.UUID(case_id), Case.deleted_at.is_(None))
-        result = await self.db.execute(stmt)
-        case = result.scalars().first()
-
+    async def get_case_details(self, case_id: uuid.UUID) -> CaseDetailsResponse | None:
+        """
+        Карточка дела за четыре запроса при любом числе документов, писем и событий:
+        дело с экспертом одним JOIN, документы одним IN по делу, последние письма и журнал — проекцией колонок с LIMIT.
+        Сессия не допускает параллельных запросов, поэтому они идут друг за другом.
+        """
+        stmt = (
+            select(Case)
+            .where(Case.id == case_id, Case.deleted_at.is_(None))
+            .options(
+                joinedload(Case.assigned_user).load_only(User.full_name, User.email, User.specialization),
+                selectinload(Case.documents.and_(Document.is_archived.is_(False))).load_only(
+                    *(getattr(Document, field) for field in DocumentResponse.model_fields)
+                ),
+            )
+        )
+        case = (await self.db.execute(stmt)).scalars().first()
         if not case:
             return None
 
-        update_dict = update_data.model_dump(exclude_unset=True)
-        for field, value in update_dict.items():
-            if hasattr(case, field):
-                setattr(case, field, value)
+        mail_stmt = (
+            select(*(getattr(MailMessage, field) for field in CaseMailEvent.model_fields))
+            .where(MailMessage.case_id == case_id, MailMessage.is_deleted.is_(False))
+            .order_by(MailMessage.processed_at.desc())
+            .limit(settings.CASE_DETAILS_MAIL_LIMIT)
+        )
+        mail = (await self.db.execute(mail_stmt)).all()
 
-        if case.deadline < case.start_date:
-            raise ValueError("Deadline cannot be before start date")
+        history_stmt = (
+            select(CaseEvent)
+            .where(CaseEvent.case_id == case_id)
+            .order_by(CaseEvent.created_at.desc(), CaseEvent.id.desc())
+            .limit(settings.CASE_DETAILS_HISTORY_LIMIT)
+        )
+        history = (await self.db.execute(history_stmt)).scalars().all()
+
+        return CaseDetailsResponse(
+            case=CaseResponse.model_validate(case),
+            assigned_experts=[CaseExpertInfo.model_validate(case.assigned_user)] if case.assigned_user else [],
+            documents=[DocumentResponse.model_validate(d) for d in sorted(case.documents, key=lambda d: d.created_at, reverse=True)],
+            events=[CaseMailEvent.model_validate(row) for row in mail],
+            history=[CaseHistoryEntry.model_validate(event) for event in history],
+        )
 
+    async def update_case(self, case_id: str, update_data: CaseUpdateRequest) -> CaseResponse | None:
+        """
+        Обновляет дело одним UPDATE ... RETURNING: в ответе и новые значения, и прежние — для свода и журнала.
+        Дедлайн раньше начала работ отклоняет ограничение ck_cases_deadline_after_start.
+        Перенос дедлайна снимает отметку о напоминании: о новом дедлайне планировщик напомнит снова.
+        """
+        values = update_data.model_dump(exclude_unset=True)
+        if "assigned_expert_id" in values:
+            values["assigned_user_id"] = values.pop("assigned_expert_id")
+        values = {field: value for field, value in values.items() if field in Case.__table__.c}
+        if not values:
+            return await self.get_case_by_id(case_id)
+
+        update_values: dict[str, object] = dict(values)
+        if "deadline" in values:
+            # В SET колонки ещё хранят прежние значения
+            update_values["deadline_notified_at"] = sql_case((Case.deadline == values["deadline"], Case.deadline_notified_at), else_=None)
+        try:
+            rows = await self._update_returning(self._locked_cases(Case.id == uuid.UUID(case_id)), update_values)
+        except IntegrityError as err:
+            await self.db.rollback()
+            if DEADLINE_CONSTRAINT in str(err.orig):
+                raise ValueError("Deadline cannot be before start date") from err
+            raise
+        if not rows:
+            return None
+
+        old, case = rows[0]
+        delta = CaseStatsDelta()
+        delta.move(self._contribution(old), self._contribution(case))
+        history = CaseHistoryBuffer()
+        if changes := field_changes(values, old, case):
+            history.record(case["id"], CaseEventType.updated, changes)
+        await delta.apply(self.db)
+        await history.flush(self.db)
         await self.db.commit()
-        await self.db.refresh(case)
+        await self._invalidate_summaries()
+        if "deadline" in values or "status" in values:
+            await self._publish_deadlines([(case["id"], case["deadline"])])
 
         return CaseResponse.model_validate(case)
 
+    @staticmethod
+    def _locked_cases(condition: ColumnElement[bool]) -> Select[tuple[object, ...]]:
+        """Неудалённые дела под блокировкой строк; колонки с префиксом old_ — значения до обновления"""
+        columns = (column.label(f"old_{column.key}") for column in Case.__table__.c)
+        return select(*columns).where(condition, Case.deleted_at.is_(None)).with_for_update()
+
+    async def _update_returning(
+        self, locked: Select[tuple[object, ...]], values: dict[str, object]
+    ) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """
+        Обновляет заблокированные дела и возвращает пары значений колонок: до и после обновления.
+        На PostgreSQL это один UPDATE ... FROM: RETURNING видит и строку подзапроса до изменения, и обновлённую.
+        """
+        names = [column.key for column in Case.__table__.c]
+        if self.dialect == "postgresql":
+            old = locked.subquery("old")
+            stmt = update(Case).where(Case.id == old.c.old_id).values(**values).returning(*old.c, *Case.__table__.c)
+            rows = (await self.db.execute(stmt, execution_options={"synchronize_session": False})).all()
+            return [({name: row._mapping[f"old_{name}"] for name in names}, {name: row._mapping[name] for name in names}) for row in rows]
+
+        # SQLite не отдаёт в RETURNING колонки из FROM: прежние значения читаются отдельным запросом
+        old_rows: dict[uuid.UUID, dict[str, Any]] = {
+            row.old_id: {name: row._mapping[f"old_{name}"] for name in names} for row in await self.db.execute(locked)
+        }
+        if not old_rows:
+            return []
+        stmt = update(Case).where(Case.id.in_(list(old_rows))).values(**values).returning(*Case.__table__.c)
+        rows = (await self.db.execute(stmt, execution_options={"synchronize_session": False})).all()
+        return [(old_rows[row.id], dict(row._mapping)) for row in rows]
+
+    @staticmethod
+    def _contribution(values: dict[str, Any]) -> CaseContribution | None:
+        if values["deleted_at"] is not None:
+            return None
+        amounts = [values[field] for field in AMOUNT_FIELDS]
+        return CaseContribution.of_values(values["status"], values["assigned_user_id"], values["client_id"], values["start_date"], amounts)
+
+    async def bulk_update_cases(self, request: CaseBulkUpdateRequest) -> CaseBulkUpdateResponse:
+        """
+        Массовая смена статуса и эксперта.
+        На PostgreSQL — один UPDATE ... FROM по строкам, заблокированным подзапросом: RETURNING отдаёт прежние статус и эксперта
+        для свода и журнала. Удалённые дела и несуществующий эксперт отсекаются условиями того же запроса.
+        """
+        values = request.patch.model_dump(exclude_unset=True)
+        if not values:
+            raise ValueError("Не указаны поля для изменения")
+        if "assigned_expert_id" in values:
+            values["assigned_user_id"] = values.pop("assigned_expert_id")
+        expert_id = values.get("assigned_user_id")
+        ids = list(dict.fromkeys(request.ids))
+
+        # ANY с одним параметром-массивом: один подготовленный запрос на любое число id
+        id_condition = Case.id == any_(literal(ids, postgresql.ARRAY(Case.id.type))) if self.dialect == "postgresql" else Case.id.in_(ids)
+        locked = self._locked_cases(id_condition)
+        if expert_id is not None:
+            locked = locked.where(exists().where(User.id == expert_id))
+
+        try:
+            rows = await self._update_returning(locked, values)
+        except IntegrityError:
+            await self.db.rollback()
+            raise
+        if not rows and expert_id is not None and not await self.db.scalar(select(exists().where(User.id == expert_id))):
+            raise ValueError("Эксперт не найден")
+
+        delta = CaseStatsDelta()
+        history = CaseHistoryBuffer()
+        for old, case in rows:
+            delta.move(self._contribution(old), self._contribution(case))
+            if changes := field_changes(values, old, case):
+                history.record(case["id"], CaseEventType.updated, changes)
+        await delta.apply(self.db)
+        await history.flush(self.db)
+        await self.db.commit()
+        if rows:
+            await self._invalidate_summaries()
+        if "status" in values:
+            await self._publish_deadlines([(case["id"], case["deadline"]) for _, case in rows])
+
+        updated = {case["id"] for _, case in rows}
+        return CaseBulkUpdateResponse(
+            updated=len(updated),
+            results=[
+                CaseBulkResult(id=case_id, outcome=CaseBulkOutcome.updated if case_id in updated else CaseBulkOutcome.not_found)
+                for case_id in ids
+            ],
+        )
+
     async def soft_delete_case(self, case_id: str) -> bool:
         """Мягкое удаление дела"""
-        stmt = select(Case).where(Case.id == uuid.UUID(case_id), Case.deleted_at.is_(None))
+        stmt = select(Case).where(Case.id == uuid.UUID(case_id), Case.deleted_at.is_(None)).with_for_update()
         result = await self.db.execute(stmt)
         case = result.scalars().first()
 
         if not case:
             return False
 
+        delta = CaseStatsDelta()
+        delta.remove(case)
+        await delta.apply(self.db)
+        history = CaseHistoryBuffer()
+        history.record(case.id, CaseEventType.deleted)
+        await history.flush(self.db)
+
         case.deleted_at = datetime.utcnow()
         await self.db.commit()
+        await self._invalidate_summaries()
         return True
 
-    async def get_cases(self, query_params: GetCasesQuery) -> GetCasesResponse:
-        """Получает список дел с фильтрацией, пагинацией и статистикой"""
-        stmt = select(Case).where(Case.deleted_at.is_(None))
+    @staticmethod
+    def list_filters(query_params: CaseFilterParams, dialect: str) -> list[ColumnElement[bool]]:
+        """Условия списка дел. Одни и те же для страницы, сводки и выгрузки."""
+        filters: list[ColumnElement[bool]] = [Case.deleted_at.is_(None)]
 
+        if q := search_terms(query_params.q):
+            filters.append(search_condition(q, dialect))
         if query_params.status:
-            stmt = stmt.where(Case.status.in_(query_params.status))
+            filters.append(Case.status.in_(query_params.status))
         if query_params.expert_id:
-            stmt = stmt.where(Case.assigned_user_id == query_params.expert_id)
+            filters.append(Case.assigned_user_id == query_params.expert_id)
         if query_params.client_id:
-            stmt = stmt.where(Case.client_id == query_params.client_id)
+            filters.append(Case.client_id == query_params.client_id)
         if query_params.start_date:
-            stmt = stmt.where(Case.start_date >= query_params.start_date)
+            filters.append(Case.start_date >= query_params.start_date)
         if query_params.end_date:
-            stmt = stmt.where(Case.start_date <= query_params.end_date)
-
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total_count = (await self.db.execute(count_stmt)).scalar() or 0
+            filters.append(Case.start_date <= query_params.end_date)
+        return filters
+
+    @staticmethod
+    def summary_statement(filters: list[ColumnElement[bool]], now: datetime) -> Select[tuple[int, int, int, int, datetime]]:
+        """Всего, активные, просроченные, завершённые и ближайший будущий дедлайн — одним проходом по отфильтрованным делам"""
+        is_inactive = Case.status.in_(INACTIVE_STATUSES)
+        return select(
+            func.count().label("total"),
+            func.count().filter(~is_inactive).label("active"),
+            func.count().filter(~is_inactive, Case.deadline < now).label("overdue"),
+            func.count().filter(is_inactive).label("completed"),
+            func.min(Case.deadline).filter(~is_inactive, Case.deadline >= now).label("next_deadline"),
+        ).where(*filters)
+
+    @staticmethod
+    def page_statement(
+        query_params: GetCasesQuery, filters: list[ColumnElement[bool]], position: tuple[datetime, uuid.UUID] | None, dialect: str
+    ) -> Select[tuple[Case]]:
+        """
+        Страница списка с одной лишней строкой: по ней видно, есть ли следующая страница.
+        Результаты поиска на PostgreSQL упорядочены по релевантности и листаются только по номеру страницы.
+        """
+        sort_column = SORT_COLUMNS[query_params.sort]
+        stmt = select(Case).where(*filters).limit(query_params.limit + 1)
+        q = search_terms(query_params.q)
+        if q is not None and dialect == "postgresql":
+            return stmt.order_by(*search_order(q), Case.id).offset((query_params.page - 1) * query_params.limit)
+
+        stmt = stmt.order_by(sort_column, Case.id)
+        if position is None:
+            return stmt.offset((query_params.page - 1) * query_params.limit)
+
+        sort_value, last_id = position
+        return stmt.where(tuple_(sort_column, Case.id) > tuple_(literal(sort_value, sort_column.type), literal(last_id, Case.id.type)))
+
+    async def _compute_summary(self, filters: list[ColumnElement[bool]]) -> tuple[SummaryEntry, float]:
+        """Сводка по БД и через сколько секунд она устареет: в ближайший дедлайн активное дело станет просроченным"""
+        now = datetime.now(UTC)
+        row = (await self.db.execute(self.summary_statement(filters, now))).one()
+
+        ttl_seconds = settings.CASE_SUMMARY_CACHE_TTL_SECONDS
+        if row.next_deadline is not None:
+            next_deadline = row.next_deadline if row.next_deadline.tzinfo else row.next_deadline.replace(tzinfo=UTC)
+            ttl_seconds = min(ttl_seconds, (next_deadline - now).total_seconds())
+        return SummaryEntry(total=row.total, active=row.active, overdue=row.overdue, completed=row.completed), ttl_seconds
+
+    async def _get_summary(self, query_params: GetCasesQuery, filters: list[ColumnElement[bool]]) -> SummaryEntry:
+        """Сводка из Redis, если она ещё действует. Недоступный Redis не ломает список — сводка считается по БД."""
+        key = filters_key(query_params)
+        try:
+            cache = CaseSummaryCache(await get_redis_client())
+            generation, entry = await cache.get(key)
+        except RedisError as e:
+            logger.warning("Case summary cache unavailable: %s", e)
+            entry, _ = await self._compute_summary(filters)
+            return entry
+
+        if entry is not None:
+            return entry
+
+        entry, ttl_seconds = await self._compute_summary(filters)
+        # Сводка с отстающей реплики под новым поколением пережила бы изменения, которых в ней ещё нет
+        if ttl_seconds > 0 and not is_replica_session(self.db):
+            try:
+                await cache.set(generation, key, entry, ttl_seconds)
+            except RedisError as e:
+                logger.warning("Failed to cache case summary: %s", e)
+        return entry
 
-        offset = (query_params.page - 1) * query_params.limit
-        stmt = stmt.offset(offset).limit(query_params.limit)
-
-        result = await self.db.execute(stmt)
-        cases = result.scalars().all()
-
-        now = datetime.utcnow()
-
-        inactive_statuses = [
-            CaseStatus.executed,
-            CaseStatus.cancelled,
-            CaseStatus.archive,
-        ]
-
-        active_stmt = (
-            select(func.count())
-            .select_from(Case)
-            .where(
-                Case.deleted_at.is_(None),
-                Case.status.notin_(inactive_statuses),
-            )
-        )
-        active_count = (await self.db.execute(active_stmt)).scalar() or 0
-
-        overdue_stmt = (
-            select(func.count())
-            .select_from(Case)
-            .where(
-                Case.deleted_at.is_(None),
-                Case.status.notin_(inactive_statuses),
-                Case.deadline < now,
-            )
-        )
-
-        overdue_count = (await self.db.execute(overdue_stmt)).scalar() or 0
-
-        total_pages = max(1, (total_count + query_params.limit - 1) // query_params.limit)
+    async def get_cases(self, query_params: GetCasesQuery) -> GetCasesResponse:
+        """
+        Получает список дел с фильтрацией, пагинацией и статистикой.
+        Сводка по тем же фильтрам берётся из кэша и пересчитывается одним агрегатным запросом.
+        """
+        filters = self.list_filters(query_params, self.dialect)
+        # Курсор к выдаче по релевантности не применим: при поиске страницы только по номеру
+        searching = search_terms(query_params.q) is not None
+        # Битый курсор отклоняется до обращений к БД и Redis
+        position = decode_cursor(query_params.cursor, query_params.sort) if query_params.cursor and not searching else None
+        summary = await self._get_summary(query_params, filters)
+
+        stmt = self.page_statement(query_params, filters, position, self.dialect)
+        cases = (await self.db.execute(stmt)).scalars().all()
+        next_cursor = None
+        if len(cases) > query_params.limit:
+            cases = cases[: query_params.limit]
+            last = cases[-1]
+            if not searching:
+                next_cursor = encode_cursor(query_params.sort, getattr(last, query_params.sort.value), last.id)
+
+        total_pages = max(1, (summary.total + query_params.limit - 1) // query_params.limit)
 
         return GetCasesResponse(
             data=[CaseResponse.model_validate(c) for c in cases],
             pagination=PaginationInfo(
-                total=total_count,
+                total=summary.total,
                 page=query_params.page,
                 limit=query_params.limit,
                 total_pages=total_pages,
+                next_cursor=next_cursor,
             ),
             summary=CasesSummary(
-                active=active_count,
-                overdue=overdue_count,
-                completed=total_count - active_count,
+                active=summary.active,
+                overdue=summary.overdue,
+                completed=summary.completed,
             ),
         )
+
+    async def get_stats(self, query_params: CaseStatsQuery) -> list[CaseStatsRow]:
+        """Свод по делам из case_stats: читается O(групп) строк вместо агрегации всей таблицы дел"""
+        stmt = select(CaseStats).where(CaseStats.cases_count > 0)
+
+        if query_params.status:
+            stmt = stmt.where(CaseStats.status.in_(query_params.status))
+        if query_params.expert_id:
+            stmt = stmt.where(CaseStats.assigned_user_id == query_params.expert_id)
+        if query_params.client_id:
+            stmt = stmt.where(CaseStats.client_id == query_params.client_id)
+        if query_params.month_from:
+            stmt = stmt.where(CaseStats.month >= query_params.month_from.replace(day=1))
+        if query_params.month_to:
+            stmt = stmt.where(CaseStats.month <= query_params.month_to)
+
+        stmt = stmt.order_by(CaseStats.month, CaseStats.client_id, CaseStats.status)
+        result = await self.db.execute(stmt)
+        return [CaseStatsRow.model_validate(row) for row in result.scalars()]
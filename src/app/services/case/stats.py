@@ -0,0 +1,169 @@
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from sqlalchemy import ColumnElement, Date, Select, cast, delete, func, insert, literal_column, select, text, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.services.case.models import Case, CaseStats, CaseStatus
+
+# Суммы дела, которые копятся в своде, в порядке колонок case_stats
+AMOUNT_FIELDS = ("cost", "bank_transfer_amount", "cash_amount", "remaining_debt")
+
+GroupKey = tuple[CaseStatus, uuid.UUID | None, uuid.UUID, date]
+
+
+def stats_month(moment: datetime) -> date:
+    """Месяц свода — первое число месяца по UTC. Наивное время считается UTC."""
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(UTC)
+    return moment.date().replace(day=1)
+
+
+@dataclass(frozen=True, slots=True)
+class CaseContribution:
+    """Вклад одного дела в свод: его группа и суммы"""
+
+    key: GroupKey
+    amounts: tuple[Decimal, ...]
+
+    @classmethod
+    def of(cls, case: Case) -> CaseContribution | None:
+        """None — удалённое дело, в своде его нет"""
+        if case.deleted_at is not None:
+            return None
+        amounts = [getattr(case, field) for field in AMOUNT_FIELDS]
+        return cls.of_values(case.status, case.assigned_user_id, case.client_id, case.start_date, amounts)
+
+    @classmethod
+    def of_values(
+        cls,
+        status: CaseStatus,
+        assigned_user_id: uuid.UUID | None,
+        client_id: uuid.UUID,
+        start_date: datetime,
+        amounts: Iterable[Decimal | None],
+    ) -> CaseContribution:
+        """Вклад по значениям полей, например из RETURNING массового обновления"""
+        key = (status, assigned_user_id, client_id, stats_month(start_date))
+        return cls(key=key, amounts=tuple(Decimal(amount or 0) for amount in amounts))
+
+
+class CaseStatsDelta:
+    """
+    Изменения свода в рамках одной транзакции.
+    remove() снимает вклад дела до изменения, add() — добавляет после; apply() пишет итог одним upsert.
+    """
+
+    def __init__(self) -> None:
+        self._groups: dict[GroupKey, list[Decimal]] = {}
+
+    def _account(self, contribution: CaseContribution | None, sign: int) -> None:
+        if contribution is None:
+            return
+        group = self._groups.setdefault(contribution.key, [Decimal(0)] * (len(AMOUNT_FIELDS) + 1))
+        group[0] += sign
+        for index, amount in enumerate(contribution.amounts, start=1):
+            group[index] += sign * amount
+
+    def add(self, case: Case) -> None:
+        self._account(CaseContribution.of(case), 1)
+
+    def remove(self, case: Case) -> None:
+        self._account(CaseContribution.of(case), -1)
+
+    def move(self, before: CaseContribution | None, after: CaseContribution | None) -> None:
+        """Дело перешло из одной группы в другую без загрузки ORM-объекта"""
+        self._account(before, -1)
+        self._account(after, 1)
+
+    def rows(self) -> list[dict[str, object]]:
+        rows = []
+        # Порядок по ключу: параллельные транзакции блокируют строки свода в одном порядке и не взаимоблокируются
+        for key, values in sorted(self._groups.items(), key=lambda item: tuple(str(part) for part in item[0])):
+            if not any(values):
+                continue
+            status, assigned_user_id, client_id, month = key
+            row: dict[str, object] = {
+                "status": status,
+                "assigned_user_id": assigned_user_id,
+                "client_id": client_id,
+                "month": month,
+                "cases_count": int(values[0]),
+            }
+            row.update(zip(AMOUNT_FIELDS, values[1:], strict=True))
+            rows.append(row)
+        return rows
+
+    async def apply(self, db: AsyncSession) -> None:
+        rows = self.rows()
+        if not rows:
+            return
+
+        dialect_insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(CaseStats).values(rows)
+        counters = ("cases_count", *AMOUNT_FIELDS)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["status", "assigned_user_id", "client_id", "month"],
+            set_={name: getattr(CaseStats, name) + getattr(stmt.excluded, name) for name in counters},
+        )
+        await db.execute(stmt)
+
+
+def _month_expression(dialect: str) -> ColumnElement[date]:
+    # Литералы вместо параметров: выражение повторяется в GROUP BY и должно совпасть с SELECT текстуально
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column("'month'"), func.timezone(literal_column("'UTC'"), Case.start_date)), Date)
+    return type_coerce(func.date(Case.start_date, literal_column("'start of month'")), Date)
+
+
+async def add_cases_to_stats(db: AsyncSession, case_ids: Select[tuple[uuid.UUID]]) -> None:
+    """Добавляет в свод только что вставленные дела одним запросом на PostgreSQL — для массовой загрузки"""
+    month = _month_expression("postgresql")
+    group_columns = (Case.status, Case.assigned_user_id, Case.client_id, month)
+    counters = ("cases_count", *AMOUNT_FIELDS)
+    groups = (
+        select(
+            func.gen_random_uuid(),
+            *group_columns,
+            func.count(),
+            *(func.coalesce(func.sum(getattr(Case, field)), 0) for field in AMOUNT_FIELDS),
+        )
+        .where(Case.id.in_(case_ids), Case.deleted_at.is_(None))
+        .group_by(*group_columns)
+    )
+    stmt = postgresql.insert(CaseStats).from_select(["id", "status", "assigned_user_id", "client_id", "month", *counters], groups)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["status", "assigned_user_id", "client_id", "month"],
+        set_={name: getattr(CaseStats, name) + getattr(stmt.excluded, name) for name in counters},
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_case_stats(db: AsyncSession) -> int:
+    """Пересчитывает свод с нуля по таблице дел. Возвращает число групп. Коммит — за вызывающим."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        # Пишущие транзакции ждут конца пересчёта и применяют свои изменения поверх нового свода
+        await db.execute(text("LOCK TABLE case_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    month = _month_expression(dialect).label("month")
+    group_columns = (Case.status, Case.assigned_user_id, Case.client_id, month)
+    stmt = (
+        select(
+            *group_columns,
+            func.count().label("cases_count"),
+            *(func.coalesce(func.sum(getattr(Case, field)), 0).label(field) for field in AMOUNT_FIELDS),
+        )
+        .where(Case.deleted_at.is_(None))
+        .group_by(*group_columns)
+    )
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+
+    await db.execute(delete(CaseStats))
+    if rows:
+        await db.execute(insert(CaseStats), rows)
+    return len(rows)
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.database import get_db
+from src.app.core.database import get_db, get_read_db
 from src.app.services.client.schemas import (
     ClientCreate,
     ClientFilters,
@@ -24,7 +24,7 @@ router = APIRouter(prefix="/api/clients", tags=["Clients"])
     summary="Создать нового клиента",
     description="Создает клиента и опционально первый контакт",
 )
-async def create_client(client_data: ClientCreate, db: AsyncSession = Depends(get_db)) -> ClientFullResponse:
+async def create_client(client_data: ClientCreate, db: AsyncSession = Depends(get_db, scope="function")) -> ClientFullResponse:
     service = ClientService(db)
     try:
         return await service.create_client(client_data)
@@ -51,7 +51,7 @@ async def get_clients(
     search: str | None = None,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ) -> ClientListResponse:
     service = ClientService(db)
     filters = ClientFilters(type=type, search=search, page=page, limit=limit)
@@ -70,7 +70,7 @@ async def get_clients(
     summary="Получить клиента по ID",
     description="Возвращает полную карточку клиента со всеми контактами",
 )
-async def get_client(client_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> ClientFullResponse:
+async def get_client(client_id: uuid.UUID, db: AsyncSession = Depends(get_db, scope="function")) -> ClientFullResponse:
     service = ClientService(db)
     client = await service.get_client_by_id(str(client_id))
 
@@ -89,7 +89,9 @@ async def get_client(client_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -
     summary="Обновить данные клиента",
     description="Частичное обновление полей клиента",
 )
-async def update_client(client_id: uuid.UUID, update_data: ClientUpdate, db: AsyncSession = Depends(get_db)) -> ClientFullResponse:
+async def update_client(
+    client_id: uuid.UUID, update_data: ClientUpdate, db: AsyncSession = Depends(get_db, scope="function")
+) -> ClientFullResponse:
     service = ClientService(db)
     try:
         updated_client = await service.update_client(str(client_id), update_data)
@@ -112,7 +114,7 @@ async def update_client(client_id: uuid.UUID, update_data: ClientUpdate, db: Asy
     summary="Удалить клиента",
     description="Полное удаление клиента и всех его контактов",
 )
-async def delete_client(client_id: uuid.UUID, db: AsyncSession = Depends(get_db)) -> None:
+async def delete_client(client_id: uuid.UUID, db: AsyncSession = Depends(get_db, scope="function")) -> None:
     service = ClientService(db)
     success = await service.delete_client(str(client_id))
     if not success:
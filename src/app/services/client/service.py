@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -27,20 +27,13 @@ class ClientService:
         contact_data = client_data.initial_contact
         client_dict = client_data.model_dump(exclude={"initial_contact"})
 
-        client = Client(**client_dict)
+        # Коллекцию контактов задаём явно: у нового объекта она известна и не требует загрузки после commit
+        contacts = [Contact(**contact_data.model_dump())] if contact_data else []
+        client = Client(**client_dict, contacts=contacts)
         self.db.add(client)
 
-        if contact_data:
-            contact = Contact(
-                **contact_data.model_dump(),
-                client=client,
-            )
-            self.db.add(contact)
-
         await self.db.commit()
 
-        await self.db.refresh(client, attribute_names=["contacts"])
-
         return ClientFullResponse.model_validate(client)
 
     async def get_client_by_id(self, client_id: str) -> ClientFullResponse | None:
@@ -88,20 +81,27 @@ class ClientService:
         )
 
     async def update_client(self, client_id: str, update_data: ClientUpdate) -> ClientFullResponse | None:
-        """Обновляет данные клиента"""
-        stmt = select(Client).where(Client.id == uuid.UUID(client_id))
-        result = await self.db.execute(stmt)
-        client = result.scalars().first()
+        """Обновляет данные клиента одним UPDATE ... RETURNING; контакты догружаются тем же вызовом"""
+        update_dict = update_data.model_dump(exclude_unset=True)
+        if not update_dict:
+            return await self.get_client_by_id(client_id)
+
+        stmt = (
+            update(Client)
+            .where(Client.id == uuid.UUID(client_id))
+            .values(**update_dict)
+            .returning(Client)
+            .options(selectinload(Client.contacts))
+            .execution_options(populate_existing=True)
+        )
+        client = (await self.db.execute(stmt)).scalars().first()
 
         if not client:
             return None
 
-        update_dict = update_data.model_dump(exclude_unset=True)
-        for field, value in update_dict.items():
-            setattr(client, field, value)
-
+        response = ClientFullResponse.model_validate(client)
         await self.db.commit()
-        return await self.get_client_by_id(client_id)
+        return response
 
     async def delete_client(self, client_id: str) -> bool:
         """Удаляет клиента (каскадно удалятся и контакты из-за ondelete='CASCADE')"""
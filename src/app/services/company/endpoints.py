@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.deps import get_current_user
+from src.app.core.auth.deps import get_session_user
+from src.app.core.auth.session import SessionUser
 from src.app.core.database.session import get_db
 from src.app.services.company.models import Company
 from src.app.services.company.schemas import CompanyRegister, CompanyResponse
 from src.app.services.company.service import CompanyService
-from src.app.services.user.models import User
 
 router = APIRouter(prefix="/api/companies", tags=["Companies"])
 
@@ -15,7 +15,7 @@ router = APIRouter(prefix="/api/companies", tags=["Companies"])
 async def register_company(
     payload: CompanyRegister,
     response: Response,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> Company:
     company_service = CompanyService(db)
 
@@ -34,14 +34,15 @@ async def register_company(
 
 
 @router.get("/me", response_model=CompanyResponse)
-async def get_my_company(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)) -> Company:
+async def get_my_company(current_user: SessionUser = Depends(get_session_user), db: AsyncSession = Depends(get_db, scope="function")) -> Company:
     """
     Получение данных о компании, к которой принадлежит текущий пользователь.
     """
-    if not current_user.company:
+    company = await db.get(Company, current_user.company_id)
+    if not company:
         raise HTTPException(status_code=404, detail="Компания не найдена")
 
-    return current_user.company
+    return company
 
 
 # @router.patch("/me", response_model=CompanyResponse)
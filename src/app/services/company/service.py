@@ -2,9 +2,8 @@ from fastapi import HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.security import hash_password
-from src.app.core.auth.session import SessionManager
-from src.app.core.redis import get_redis_client
+from src.app.core.auth.security import hash_password_async
+from src.app.core.auth.session import get_session_manager
 from src.app.services.company.models import Company
 from src.app.services.company.schemas import CompanyRegister
 from src.app.services.user.models import User
@@ -30,7 +29,7 @@ class CompanyService:
 
             new_ceo = User(
                 email=data.email,
-                hashed_password=hash_password(data.password),
+                hashed_password=await hash_password_async(data.password),
                 full_name=data.full_name,
                 role="CEO",
                 company_id=new_company.id,
@@ -41,15 +40,8 @@ class CompanyService:
 
             await self.db.commit()
 
-            await self.db.refresh(new_company)
-            await self.db.refresh(new_ceo)
-
-            redis_client = await get_redis_client()
-            session_manager = SessionManager(redis_client)
-
-            session_id = await session_manager.create_session(
-                user_id=str(new_ceo.id), data={"role": new_ceo.role, "company_id": str(new_company.id)}
-            )
+            session_manager = await get_session_manager()
+            session_id = await session_manager.create_session(new_ceo)
 
             return new_company, session_id
 
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Upload
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.core.database.replica import get_read_db
 from src.app.core.database.session import get_db
 from src.app.services.document.models import Folder
 from src.app.services.document.schemas import DocumentDownloadUrl, DocumentResponse, FileSystemEntry, FolderCreate, FolderResponse
@@ -29,7 +30,7 @@ async def list_assets(
     order: str = Query("desc", pattern="^(asc|desc)$"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
 ) -> list[FileSystemEntry]:
     return await DocumentService(db).get_unified_list(
         folder_id=folder_id, case_id=case_id, search=search, sort_by=sort_by, order=order, limit=limit, offset=offset
@@ -44,7 +45,7 @@ async def list_assets(
 )
 async def create_folder(
     folder_data: FolderCreate,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> FolderResponse:
     service = DocumentService(db)
     result = await service.create_folder(folder_data, user_id=None)
@@ -62,7 +63,7 @@ async def upload_document(
     case_id: uuid.UUID | None = Form(None),
     folder_id: uuid.UUID | None = Form(None),
     title: str | None = Form(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> DocumentResponse:
     service = DocumentService(db)
     result = await service.upload_document(file=file, case_id=case_id, folder_id=folder_id, title=title, user_id=None)
@@ -75,7 +76,7 @@ async def upload_document(
 )
 async def get_document_url(
     document_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> DocumentDownloadUrl:
     service = DocumentService(db)
     url = await service.get_presigned_url(document_id)
@@ -91,7 +92,7 @@ async def get_document_url(
 )
 async def delete_document(
     document_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> None:
     service = DocumentService(db)
     success = await service.delete_document(document_id)
@@ -106,7 +107,7 @@ async def delete_document(
 )
 async def delete_folder(
     folder_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ) -> None:
     await db.execute(delete(Folder).where(Folder.id == folder_id))
     await db.commit()
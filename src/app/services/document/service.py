@@ -19,7 +19,6 @@ class DocumentService:
         db_folder = Folder(**folder_data.model_dump(), created_by_id=user_id)
         self.db.add(db_folder)
         await self.db.commit()
-        await self.db.refresh(db_folder)
         return db_folder
 
     async def get_unified_list(
@@ -111,7 +110,6 @@ class DocumentService:
         )
         self.db.add(db_doc)
         await self.db.commit()
-        await self.db.refresh(db_doc)
         return db_doc
 
     async def get_presigned_url(self, doc_id: uuid.UUID) -> str | None:
@@ -118,5 +118,7 @@ class MailMessage(Base):
     __table_args__ = (
         Index("ix_mail_messages_user_inbox", "user_id", "is_deleted", "is_spam", "processed_at"),
         Index("ix_mail_messages_user_unread", "user_id", "is_read", "is_deleted"),
+        # Последние письма по делу для карточки дела
+        Index("ix_mail_messages_case_processed", "case_id", "processed_at", postgresql_where=text("case_id IS NOT NULL")),
         Index("ix_mail_messages_subject_search", text("to_tsvector('russian', subject)"), postgresql_using="gin"),
     )
@@ -0,0 +1,54 @@
+import hashlib
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from redis.typing import EncodableT
+
+from src.app.core.config import settings
+from src.app.services.case.cache import CASES_GENERATION_KEY
+from src.app.services.report.schemas import ReceivablesQuery, ReceivablesReport
+
+logger = logging.getLogger(__name__)
+
+# Текущее поколение дел и отчёт для набора фильтров в нём — одним обращением к Redis.
+# KEYS[1] — счётчик поколений; ARGV[1] — префикс ключа отчёта, ARGV[2] — ключ набора фильтров.
+READ_REPORT_SCRIPT = """
+local generation = redis.call('GET', KEYS[1]) or '0'
+return {generation, redis.call('GET', ARGV[1] .. generation .. ':' .. ARGV[2])}
+"""
+
+
+def receivables_key(query_params: ReceivablesQuery) -> str:
+    return hashlib.sha1(query_params.model_dump_json().encode()).hexdigest()
+
+
+class ReceivablesCache:
+    """
+    Отчёт по дебиторке по наборам фильтров.
+    Ключ включает поколение дел из сводок списка: любое изменение дел переводит чтения на новые ключи, старые истекают сами.
+    Просрочка растёт со временем, поэтому отчёт живёт не дольше REPORT_RECEIVABLES_CACHE_TTL_SECONDS.
+    Суммы хранятся строками и читаются в Decimal без потери точности.
+    """
+
+    def __init__(self, redis: Redis) -> None:
+        self.redis = redis
+        self.prefix = "receivables:"
+        self._read_report = redis.register_script(READ_REPORT_SCRIPT)
+
+    async def get(self, key: str) -> tuple[str, ReceivablesReport | None]:
+        """Поколение, в которое нужно записать пересчитанный отчёт, и сам отчёт, если он есть"""
+        args: list[EncodableT] = [self.prefix, key]
+        generation, *cached = await self._read_report(keys=[CASES_GENERATION_KEY], args=args)
+        if isinstance(generation, bytes):
+            generation = generation.decode()
+        # Redis обрезает массив на nil, поэтому отсутствующая запись — это пустой хвост
+        if not cached or cached[0] is None:
+            return generation, None
+        return generation, ReceivablesReport.model_validate_json(cached[0])
+
+    async def set(self, generation: str, key: str, report: ReceivablesReport) -> None:
+        try:
+            await self.redis.set(f"{self.prefix}{generation}:{key}", report.model_dump_json(), ex=settings.REPORT_RECEIVABLES_CACHE_TTL_SECONDS)
+        except RedisError as e:
+            logger.warning("Failed to cache receivables report: %s", e)
@@ -0,0 +1,43 @@
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.auth.rbac import RoleChecker
+from src.app.core.database import get_read_db
+from src.app.services.report.schemas import ReceivablesQuery, ReceivablesReport
+from src.app.services.report.service import ReportService
+from src.app.services.user.models import UserRole
+
+router = APIRouter(prefix="/api/reports", tags=["Reports"])
+
+REPORT_ROLES = [UserRole.ADMIN, UserRole.CEO, UserRole.ACCOUNTANT]
+
+
+@router.get(
+    "/receivables",
+    response_model=ReceivablesReport,
+    summary="Дебиторская задолженность",
+    description="Долг, корзины просрочки по дедлайну (0-30, 31-90, 90+ дней) и полученные суммы по клиентам и экспертам",
+    dependencies=[Depends(RoleChecker(REPORT_ROLES))],
+)
+async def get_receivables(params: ReceivablesQuery = Query(), db: AsyncSession = Depends(get_read_db, scope="function")) -> ReceivablesReport:
+    return await ReportService(db).get_receivables(params)
+
+
+@router.get(
+    "/receivables/export",
+    summary="Выгрузка дебиторской задолженности",
+    description="Тот же отчёт в CSV: строки клиентов, экспертов и итог. Ответ передаётся потоком.",
+    response_class=StreamingResponse,
+    dependencies=[Depends(RoleChecker(REPORT_ROLES))],
+)
+async def export_receivables(params: ReceivablesQuery = Query(), db: AsyncSession = Depends(get_read_db)) -> StreamingResponse:
+    # Сессия с областью запроса: курсор читается, пока отправляется тело
+    filename = f"receivables-{datetime.now(UTC):%Y%m%d}.csv"
+    return StreamingResponse(
+        ReportService(db).export_receivables(params),
+        media_type="text/csv; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
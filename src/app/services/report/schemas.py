@@ -0,0 +1,44 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ReceivablesQuery(BaseModel):
+    client_id: uuid.UUID | None = None
+    expert_id: uuid.UUID | None = None
+    start_date: datetime | None = None  # Дела, начатые не раньше
+    end_date: datetime | None = None  # Дела, начатые не позже
+
+
+class ReceivablesTotals(BaseModel):
+    cases_count: int
+    cost: Decimal
+    collected: Decimal  # Перевод на счёт и наличные
+    bank_transfer_amount: Decimal
+    cash_amount: Decimal
+    outstanding_debt: Decimal  # Весь оставшийся долг; равен сумме not_due и трёх корзин просрочки
+    not_due: Decimal  # Долг по делам, дедлайн которых ещё не наступил
+    overdue_0_30: Decimal  # Долг по делам, дедлайн которых прошёл 0-30 дней назад
+    overdue_31_90: Decimal
+    overdue_90_plus: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ClientReceivables(ReceivablesTotals):
+    client_id: uuid.UUID
+    client_name: str
+
+
+class ExpertReceivables(ReceivablesTotals):
+    expert_id: uuid.UUID | None  # None — дела без эксперта
+    expert_name: str | None
+
+
+class ReceivablesReport(BaseModel):
+    generated_at: datetime  # Момент, от которого считается просрочка
+    total: ReceivablesTotals
+    clients: list[ClientReceivables]  # По убыванию долга
+    experts: list[ExpertReceivables]  # По убыванию долга
@@ -0,0 +1,189 @@
+import csv
+import io
+import logging
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import (
+    ColumnElement,
+    ColumnExpressionArgument,
+    CompoundSelect,
+    Label,
+    RowMapping,
+    Select,
+    func,
+    literal,
+    literal_column,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.core.config import settings
+from src.app.core.database import is_replica_session
+from src.app.core.redis import get_redis_client
+from src.app.services.case.models import Case
+from src.app.services.client.models import Client
+from src.app.services.report.cache import ReceivablesCache, receivables_key
+from src.app.services.report.schemas import (
+    ClientReceivables,
+    ExpertReceivables,
+    ReceivablesQuery,
+    ReceivablesReport,
+    ReceivablesTotals,
+)
+from src.app.services.user.models import User
+
+logger = logging.getLogger(__name__)
+
+# Уровни группировки строк отчёта. На PostgreSQL это GROUPING(client_id, assigned_user_id): бит 1 — не сгруппировано
+CLIENT_LEVEL = 1
+EXPERT_LEVEL = 2
+TOTAL_LEVEL = 3
+
+CSV_LEVELS = {CLIENT_LEVEL: "client", EXPERT_LEVEL: "expert", TOTAL_LEVEL: "total"}
+TOTAL_FIELDS = list(ReceivablesTotals.model_fields)
+CSV_HEADER = ["group", "id", "name", *TOTAL_FIELDS]
+
+
+def _sum(expression: ColumnExpressionArgument[Decimal]) -> ColumnElement[Decimal]:
+    # Суммы NUMERIC: Decimal без погрешности float; пустая группа даёт 0, а не NULL
+    return func.coalesce(func.sum(expression), 0)
+
+
+def receivables_aggregates(now: datetime) -> list[Label[Any]]:
+    """Показатели группы. Корзины просрочки делят долг по тому, сколько дней назад прошёл дедлайн."""
+    debt = Case.remaining_debt
+    days_30, days_90 = now - timedelta(days=30), now - timedelta(days=90)
+    return [
+        func.count().label("cases_count"),
+        _sum(Case.cost).label("cost"),
+        _sum(Case.bank_transfer_amount + Case.cash_amount).label("collected"),
+        _sum(Case.bank_transfer_amount).label("bank_transfer_amount"),
+        _sum(Case.cash_amount).label("cash_amount"),
+        _sum(debt).label("outstanding_debt"),
+        func.coalesce(func.sum(debt).filter(Case.deadline >= now), 0).label("not_due"),
+        func.coalesce(func.sum(debt).filter(Case.deadline < now, Case.deadline >= days_30), 0).label("overdue_0_30"),
+        func.coalesce(func.sum(debt).filter(Case.deadline < days_30, Case.deadline >= days_90), 0).label("overdue_31_90"),
+        func.coalesce(func.sum(debt).filter(Case.deadline < days_90), 0).label("overdue_90_plus"),
+    ]
+
+
+class ReportService:
+    def __init__(self, db_session: AsyncSession) -> None:
+        self.db = db_session
+
+    @property
+    def dialect(self) -> str:
+        return self.db.get_bind().dialect.name
+
+    @staticmethod
+    def receivables_filters(query_params: ReceivablesQuery) -> list[ColumnElement[bool]]:
+        filters: list[ColumnElement[bool]] = [Case.deleted_at.is_(None)]
+        if query_params.client_id:
+            filters.append(Case.client_id == query_params.client_id)
+        if query_params.expert_id:
+            filters.append(Case.assigned_user_id == query_params.expert_id)
+        if query_params.start_date:
+            filters.append(Case.start_date >= query_params.start_date)
+        if query_params.end_date:
+            filters.append(Case.start_date <= query_params.end_date)
+        return filters
+
+    @staticmethod
+    def receivables_statement(query_params: ReceivablesQuery, now: datetime, dialect: str) -> Select[Any] | CompoundSelect[Any]:
+        """
+        Строки отчёта по клиентам, по экспертам и итог — одним запросом.
+        На PostgreSQL — GROUPING SETS: один проход по делам на все три группировки.
+        Другие СУБД (SQLite в тестах) их не знают: там три группировки объединяются через UNION ALL.
+        Строки идут по уровню, внутри уровня — по убыванию долга.
+        """
+        filters = ReportService.receivables_filters(query_params)
+        aggregates = receivables_aggregates(now)
+
+        def grouped(level: ColumnElement[int], *columns: ColumnExpressionArgument[Any]) -> Select[Any]:
+            return (
+                select(level.label("group_level"), *columns, *aggregates)
+                .select_from(Case)
+                .join(Client, Client.id == Case.client_id)
+                .outerjoin(User, User.id == Case.assigned_user_id)
+                .where(*filters)
+            )
+
+        if dialect == "postgresql":
+            client = (Case.client_id, Client.name)
+            expert = (Case.assigned_user_id, User.full_name)
+            stmt: Select[Any] | CompoundSelect[Any] = grouped(
+                func.grouping(Case.client_id, Case.assigned_user_id),
+                Case.client_id,
+                Client.name.label("client_name"),
+                Case.assigned_user_id.label("expert_id"),
+                User.full_name.label("expert_name"),
+            ).group_by(func.grouping_sets(tuple_(*client), tuple_(*expert), tuple_()))
+        else:
+            # NULL с типом колонки: иначе UNION не знает, как читать id
+            no_client = (literal(None, Case.client_id.type).label("client_id"), literal(None, Client.name.type).label("client_name"))
+            no_expert = (literal(None, Case.assigned_user_id.type).label("expert_id"), literal(None, User.full_name.type).label("expert_name"))
+            by_client = grouped(literal(CLIENT_LEVEL), Case.client_id, Client.name.label("client_name"), *no_expert)
+            by_expert = grouped(literal(EXPERT_LEVEL), *no_client, Case.assigned_user_id.label("expert_id"), User.full_name.label("expert_name"))
+            stmt = union_all(
+                by_client.group_by(Case.client_id, Client.name),
+                by_expert.group_by(Case.assigned_user_id, User.full_name),
+                grouped(literal(TOTAL_LEVEL), *no_client, *no_expert),
+            )
+        return stmt.order_by(literal_column("group_level"), literal_column("outstanding_debt").desc())
+
+    async def _compute_receivables(self, query_params: ReceivablesQuery) -> ReceivablesReport:
+        now = datetime.now(UTC)
+        rows = (await self.db.execute(self.receivables_statement(query_params, now, self.dialect))).mappings().all()
+
+        levels: dict[int, list[RowMapping]] = {CLIENT_LEVEL: [], EXPERT_LEVEL: [], TOTAL_LEVEL: []}
+        for row in rows:
+            levels[row["group_level"]].append(row)
+        # Агрегат без группировки даёт строку итога всегда, даже если дел нет
+        total = ReceivablesTotals.model_validate(levels[TOTAL_LEVEL][0])
+        clients = [ClientReceivables.model_validate(row) for row in levels[CLIENT_LEVEL]]
+        experts = [ExpertReceivables.model_validate(row) for row in levels[EXPERT_LEVEL]]
+        return ReceivablesReport(generated_at=now, total=total, clients=clients, experts=experts)
+
+    async def get_receivables(self, query_params: ReceivablesQuery) -> ReceivablesReport:
+        """Отчёт по дебиторке из Redis, если он ещё действует. Недоступный Redis не ломает отчёт — он считается по БД."""
+        key = receivables_key(query_params)
+        try:
+            cache = ReceivablesCache(await get_redis_client())
+            generation, report = await cache.get(key)
+        except RedisError as e:
+            logger.warning("Receivables report cache unavailable: %s", e)
+            return await self._compute_receivables(query_params)
+
+        if report is None:
+            report = await self._compute_receivables(query_params)
+            # Отчёт с отстающей реплики под новым поколением пережил бы изменения, которых в нём ещё нет
+            if not is_replica_session(self.db):
+                await cache.set(generation, key, report)
+        return report
+
+    async def export_receivables(self, query_params: ReceivablesQuery) -> AsyncIterator[bytes]:
+        """Тот же отчёт в CSV: строки читаются серверным курсором и отдаются по мере чтения, без кэша"""
+        stmt = self.receivables_statement(query_params, datetime.now(UTC), self.dialect)
+        result = await self.db.stream(stmt.execution_options(yield_per=settings.CASE_EXPORT_BATCH_SIZE))
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM: Excel иначе открывает UTF-8 как cp1251
+        buffer.write("\ufeff")
+        writer.writerow(CSV_HEADER)
+        async for partition in result.mappings().partitions():
+            for row in partition:
+                level = row["group_level"]
+                group_id, name = (row["client_id"], row["client_name"]) if level == CLIENT_LEVEL else (row["expert_id"], row["expert_name"])
+                writer.writerow([CSV_LEVELS[level], group_id, name, *(row[field] for field in TOTAL_FIELDS)])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.deps import get_current_user
-from src.app.core.auth.session import SessionManager
+from src.app.core.auth.cache import invalidate_session, revoke_user
+from src.app.core.auth.deps import get_current_user, get_session_user
+from src.app.core.auth.session import SessionUser, get_session_manager
+from src.app.core.auth.throttling import get_login_throttle
+from src.app.core.database.replica import get_read_db
 from src.app.core.database.session import get_db
 from src.app.core.redis import get_redis_client
 from src.app.services.user.models import User
@@ -19,17 +22,19 @@ router = APIRouter(prefix="/api/users", tags=["Users & Auth"])
 
 
 @router.post("/login", response_model=UserRead)
-async def login(credentials: UserLoginSchema, response: Response, db: AsyncSession = Depends(get_db)) -> User:
+async def login(credentials: UserLoginSchema, request: Request, response: Response, db: AsyncSession = Depends(get_db, scope="function")) -> User:
+    login_throttle = await get_login_throttle()
+    await login_throttle.check_rate(credentials.email, request.client.host if request.client else "unknown")
+
     user_service = UserService(db)
-    user = await user_service.authenticate(credentials)
+    async with login_throttle.verification_slot():
+        user = await user_service.authenticate(credentials)
 
     if not user or not user.can_authenticate:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Неверные учетные данные или доступ запрещен")
 
-    redis_client = await get_redis_client()
-    session_manager = SessionManager(redis_client)
-
-    session_id = await session_manager.create_session(user_id=str(user.id), data={"role": user.role})
+    session_manager = await get_session_manager()
+    session_id = await session_manager.create_session(user)
 
     response.set_cookie(key="session_id", value=session_id, httponly=True, secure=True, samesite="lax", max_age=86400)
 
@@ -40,19 +45,37 @@ async def login(credentials: UserLoginSchema, response: Response, db: AsyncSessi
 
 @router.post("/logout", response_model=LogoutResponse)
 async def logout(
-    request: Request, response: Response, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db, scope="function"),
+    current_user: SessionUser = Depends(get_session_user),
 ) -> LogoutResponse:
     session_id = request.cookies.get("session_id")
 
     if session_id:
-        redis_client = await get_redis_client()
-        session_manager = SessionManager(redis_client)
-        await session_manager.delete_session(session_id)
+        session_manager = await get_session_manager()
+        await session_manager.delete_session(session_id, current_user.id)
+        await invalidate_session(await get_redis_client(), session_id)
+
+    response.delete_cookie("session_id")
+
+    user_service = UserService(db)
+    await user_service.mark_offline(current_user.id)
+
+    return LogoutResponse()
+
+
+@router.post("/logout-all", response_model=LogoutResponse)
+async def logout_all(
+    response: Response, db: AsyncSession = Depends(get_db, scope="function"), current_user: SessionUser = Depends(get_session_user)
+) -> LogoutResponse:
+    """Завершает все сессии текущего пользователя на всех устройствах"""
+    await revoke_user(await get_redis_client(), current_user.id)
 
     response.delete_cookie("session_id")
 
     user_service = UserService(db)
-    await user_service.set_online_status(current_user, False)
+    await user_service.mark_offline(current_user.id)
 
     return LogoutResponse()
 
@@ -63,14 +86,18 @@ async def get_me(current_user: User = Depends(get_current_user)) -> User:
 
 
 @router.post("/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-async def create_user(user_in: UserCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)) -> User:
+async def create_user(
+    user_in: UserCreate, db: AsyncSession = Depends(get_db, scope="function"), current_user: SessionUser = Depends(get_session_user)
+) -> User:
     user_service = UserService(db)
     return await user_service.create_user(creator=current_user, user_in=user_in)
 
 
 @router.get("/", response_model=list[UserRead])
 async def list_users(
-    params: UserFilterParams = Depends(), db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
+    params: UserFilterParams = Depends(),
+    db: AsyncSession = Depends(get_read_db, scope="function"),
+    current_user: SessionUser = Depends(get_session_user),
 ) -> list[User]:
     user_service = UserService(db)
     return await user_service.get_users_list(current_user, params)
@@ -1,15 +1,24 @@
+import uuid
 from collections.abc import Sequence
 from datetime import UTC, datetime
 
 from fastapi import HTTPException, status
-from sqlalchemy import asc, desc, or_, select
+from sqlalchemy import asc, desc, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.security import hash_password, verify_password
-from src.app.core.auth.session import SessionManager
+from src.app.core.auth.cache import invalidate_user
+from src.app.core.auth.rbac import MANAGEABLE_ROLES, check_hierarchy
+from src.app.core.auth.security import (
+    PasswordHasherOverloadedError,
+    hash_password_async,
+    needs_rehash,
+    password_hasher,
+    verify_password_async,
+)
+from src.app.core.auth.session import SessionManager, SessionUser
+from src.app.core.redis import get_redis_client
 from src.app.services.user.models import User, UserEmailConfig
 from src.app.services.user.schemas import (
-    ROLE_PERMISSIONS,
     UserCreate,
     UserFilterParams,
     UserLoginSchema,
@@ -29,11 +38,22 @@ class UserService:
         if not user:
             return None
 
-        if not verify_password(credentials.password, user.hashed_password):
+        if not await verify_password_async(credentials.password, user.hashed_password):
             return None
 
+        if needs_rehash(user.hashed_password, password_hasher.rounds):
+            await self._rehash_password(user, credentials.password)
+
         return user
 
+    async def _rehash_password(self, user: User, password: str) -> None:
+        """Перехеширует пароль с актуальным cost factor. Пароль уже проверен, поэтому при перегрузке просто откладываем до следующего входа."""
+        try:
+            user.hashed_password = await hash_password_async(password)
+        except PasswordHasherOverloadedError:
+            return
+        await self.db.commit()
+
     async def set_online_status(self, user: User, is_online: bool) -> None:
         user.is_active = is_online
 
@@ -41,10 +61,13 @@ class UserService:
             user.last_login = datetime.now(UTC)
 
         await self.db.commit()
-        await self.db.refresh(user)
 
-    async def create_user(self, creator: User, user_in: UserCreate) -> User:
-        if user_in.role not in ROLE_PERMISSIONS.get(creator.role, []):
+    async def mark_offline(self, user_id: uuid.UUID) -> None:
+        await self.db.execute(update(User).where(User.id == user_id).values(is_active=False))
+        await self.db.commit()
+
+    async def create_user(self, creator: SessionUser, user_in: UserCreate) -> User:
+        if not check_hierarchy(creator.role, user_in.role):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Вы не можете создавать пользователя с ролью {user_in.role}",
@@ -57,11 +80,12 @@ class UserService:
 
         new_user = User(
             email=user_in.email,
-            hashed_password=hash_password(user_in.password),
+            hashed_password=await hash_password_async(user_in.password),
             full_name=user_in.full_name,
             role=user_in.role,
             specialization=user_in.specialization,
             settings=user_in.settings or {},
+            company_id=creator.company_id,
         )
 
         self.db.add(new_user)
@@ -72,12 +96,10 @@ class UserService:
             self.db.add(email_cfg)
 
         await self.db.commit()
-        await self.db.refresh(new_user)
         return new_user
 
-    async def get_users_list(self, current_user: User, params: UserFilterParams) -> list[User]:
-        allowed_roles = ROLE_PERMISSIONS.get(current_user.role, [])
-        query = select(User).where(User.role.in_(allowed_roles))
+    async def get_users_list(self, current_user: SessionUser, params: UserFilterParams) -> list[User]:
+        query = select(User).where(User.role.in_(MANAGEABLE_ROLES[current_user.role]))
 
         if params.role:
             query = query.where(User.role == params.role)
@@ -102,10 +124,11 @@ class UserService:
         return list(users_seq)
 
     async def update_access(self, user_id: str, can_auth: bool) -> User:
-        user = await self.db.get(User, user_id)
+        user = await self.db.get(User, uuid.UUID(user_id))
         if not user:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
 
         user.can_authenticate = can_auth
         await self.db.commit()
+        await invalidate_user(await get_redis_client(), user)
         return user
@@ -1,13 +1,20 @@
-from sqlalchemy import select
+from sqlalchemy import select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.core.auth.security import hash_password
+from src.app.core.auth.security import hash_password_async
 from src.app.core.config.settings import settings
 from src.app.services.company.models import Company
 from src.app.services.user.models import User, UserRole
 
+# Ключ advisory-блокировки: воркеры, стартующие одновременно, создают администратора по очереди
+FIRST_ADMIN_LOCK_KEY = 0x41444D494E  # "ADMIN"
+
 
 async def create_first_admin(db: AsyncSession) -> None:
+    if db.get_bind().dialect.name == "postgresql":
+        # Блокировка транзакционная и снимается при commit/rollback
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": FIRST_ADMIN_LOCK_KEY})
+
     query_comp = select(Company).where(Company.inn == "0000000000")
     result_comp = await db.execute(query_comp)
     system_company = result_comp.scalar_one_or_none()
@@ -24,7 +31,7 @@ async def create_first_admin(db: AsyncSession) -> None:
     if not admin_exists:
         new_admin = User(
             email=settings.ADMIN_EMAIL,
-            hashed_password=hash_password(settings.ADMIN_PASSWORD),
+            hashed_password=await hash_password_async(settings.ADMIN_PASSWORD),
             full_name=settings.ADMIN_FULL_NAME,
             role=UserRole.ADMIN,
             can_authenticate=True,
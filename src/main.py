@@ -1,64 +1,107 @@
+import asyncio
+import time
 from collections.abc import AsyncIterator, Awaitable
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 from typing import Any, cast
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from sqlalchemy import text
 
+from src.app.core.auth.cache import start_invalidation_listener
+from src.app.core.auth.security import PasswordHasherOverloadedError, password_hasher
+from src.app.core.config import settings
 from src.app.core.database import all_models  # noqa: F401
+from src.app.core.database.replica import pin_primary_after_write, read_engine
 from src.app.core.database.session import AsyncSessionLocal, engine
+from src.app.core.monitoring.endpoints import router as monitoring_router
+from src.app.core.monitoring.sql import sql_stats_middleware
 from src.app.core.redis import get_redis_client
+from src.app.core.startup import print_check, run_check, run_checks
 from src.app.core.storage.s3 import s3_storage
+from src.app.services.case.deadlines import start_deadline_scheduler
 from src.app.services.case.endpoints import router as cases_router
 from src.app.services.client.endpoints import router as client_router
 from src.app.services.company.endpoints import router as company_router
 from src.app.services.document.endpoints import router as document_router
+from src.app.services.report.endpoints import router as report_router
 from src.app.services.user.endpoints import router as user_router
 from src.app.services.user.setup import create_first_admin
 
 
+async def check_postgres() -> None:
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+async def check_redis() -> None:
+    redis_client = await get_redis_client()
+    await cast(Awaitable[Any], redis_client.ping())
+
+
+async def init_first_admin() -> None:
+    async with AsyncSessionLocal() as session:
+        await create_first_admin(session)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     print("Starting system health checks...")
-
-    try:
-        async with engine.connect() as conn:
-            await conn.execute(text("SELECT 1"))
-        print("PostgreSQL connection: OK")
-    except Exception as e:
-        print(f"PostgreSQL connection: FAILED | {e}")
-        raise e
-
-    try:
-        redis_client = await get_redis_client()
-        await cast(Awaitable[Any], redis_client.ping())
-        print("Redis connection: OK")
-    except Exception as e:
-        print(f"Redis connection: FAILED | {e}")
-
-    try:
-        await s3_storage.init_bucket()
-        print("S3 Storage initialization: OK")
-    except Exception as e:
-        print(f"S3 Storage initialization: FAILED | {e}")
-
-    try:
-        async with AsyncSessionLocal() as session:
-            await create_first_admin(session)
-        print("Admin initialization check: OK")
-    except Exception as e:
-        print(f"Admin initialization: FAILED | {e}")
-
-    print("Application is ready to serve requests.")
+    started = time.perf_counter()
+
+    # Независимые проверки идут параллельно, каждая ограничена STARTUP_CHECK_TIMEOUT_SECONDS
+    results = await run_checks(
+        {
+            "PostgreSQL connection": check_postgres,
+            "Redis connection": check_redis,
+            "S3 Storage initialization": s3_storage.init_bucket,
+            "bcrypt calibration": password_hasher.calibrate,
+        },
+        timeout=settings.STARTUP_CHECK_TIMEOUT_SECONDS,
+    )
+    for result in results.values():
+        print_check(result)
+
+    postgres = results["PostgreSQL connection"]
+    if postgres.error is not None:
+        raise postgres.error
+    print(f"bcrypt cost factor: {password_hasher.rounds}")
+
+    # Создание администратора зависит от БД и подобранного cost factor, поэтому идёт после проверок
+    admin = await run_check("Admin initialization check", init_first_admin, timeout=settings.STARTUP_CHECK_TIMEOUT_SECONDS)
+    print_check(admin)
+
+    invalidation_listener = start_invalidation_listener(await get_redis_client())
+    deadline_scheduler = start_deadline_scheduler(await get_redis_client())
+
+    print(f"Application is ready to serve requests. Startup took {(time.perf_counter() - started) * 1000:.0f} ms")
 
     yield
 
     print("Shutting down application...")
+    for task in (invalidation_listener, deadline_scheduler):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
     await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+    password_hasher.shutdown()
     print("Cleanup complete.")
 
 
 app = FastAPI(title="CRM Expertiz API", lifespan=lifespan)
+app.middleware("http")(pin_primary_after_write)
+app.middleware("http")(sql_stats_middleware)
+
+
+@app.exception_handler(PasswordHasherOverloadedError)
+async def password_hasher_overloaded_handler(request: Request, exc: PasswordHasherOverloadedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Сервер перегружен, повторите попытку позже"},
+        headers={"Retry-After": "1"},
+    )
 
 
 app.include_router(cases_router)
@@ -66,6 +109,8 @@ app.include_router(client_router)
 app.include_router(document_router)
 app.include_router(user_router)
 app.include_router(company_router)
+app.include_router(report_router)
+app.include_router(monitoring_router)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,31 @@
-from collections.abc import AsyncGenerator
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
 
+import pytest
 import pytest_asyncio
+from fakeredis import FakeAsyncRedis, FakeServer
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from src.app.core.auth.cache import session_user_cache
+from src.app.core.auth.deps import get_session_user
+from src.app.core.auth.session import SessionManager, SessionUser, get_session_manager
+from src.app.core.auth.throttling import LoginThrottle
 from src.app.core.database.all_models import Base
+from src.app.core.database.replica import get_read_db
 from src.app.core.database.session import get_db
+from src.app.core.monitoring.sql import install_sql_instrumentation
+from src.app.services.case.models import Case, CaseStatus
+from src.app.services.client.models import Client, ClientType
+from src.app.services.user.models import UserRole
 from src.main import app
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
 engine_test = create_async_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+install_sql_instrumentation(engine_test.sync_engine)
 AsyncSessionLocalTest = async_sessionmaker(engine_test, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -41,9 +56,93 @@ async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
 
     app.dependency_overrides.clear()
+
+
+@pytest_asyncio.fixture
+async def redis_client(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[FakeAsyncRedis]:
+    """Подменяет Redis приложения на fakeredis и очищает кэш снимков сессий между тестами"""
+    server = FakeServer()
+    fake = FakeAsyncRedis(server=server, decode_responses=True)
+    fake_binary = FakeAsyncRedis(server=server)
+
+    async def get_fake_redis_client() -> FakeAsyncRedis:
+        return fake
+
+    for module in (
+        "src.app.services.user.endpoints",
+        "src.app.services.user.service",
+        "src.app.services.case.service",
+        "src.app.services.report.service",
+    ):
+        monkeypatch.setattr(f"{module}.get_redis_client", get_fake_redis_client)
+    monkeypatch.setattr("src.app.core.auth.session._session_manager", SessionManager(fake_binary))
+    monkeypatch.setattr("src.app.core.auth.throttling._login_throttle", LoginThrottle(fake))
+
+    session_user_cache.clear()
+    yield fake
+    session_user_cache.clear()
+    await fake.aclose()
+    await fake_binary.aclose()
+
+
+@pytest_asyncio.fixture
+async def session_manager(redis_client: FakeAsyncRedis) -> SessionManager:
+    return await get_session_manager()
+
+
+@pytest.fixture
+def as_role() -> Iterator[Callable[[UserRole], SessionUser]]:
+    """Запросы теста идут от пользователя с заданной ролью. Повторный вызов меняет роль посреди теста."""
+
+    def override(role: UserRole) -> SessionUser:
+        user = SessionUser(id=uuid.uuid4(), role=role, company_id=uuid.uuid4(), can_authenticate=True)
+        app.dependency_overrides[get_session_user] = lambda: user
+        return user
+
+    yield override
+    app.dependency_overrides.pop(get_session_user, None)
+
+
+@pytest.fixture
+def make_case() -> Callable[..., Case]:
+    """Несохранённое дело клиента с заполненными обязательными полями; любое поле задаётся аргументом"""
+
+    def build(client_id: uuid.UUID, **fields: object) -> Case:
+        suffix = uuid.uuid4().hex[:12]
+        now = datetime.now(UTC)
+        defaults: dict[str, object] = {
+            "id": uuid.uuid4(),
+            "number": f"N-{suffix}",
+            "case_number": f"CN-{suffix}",
+            "authority": "Суд",
+            "case_type": "civil",
+            "object_type": "land",
+            "object_address": "г. Москва",
+            "status": CaseStatus.in_work,
+            "start_date": now,
+            "deadline": now + timedelta(days=30),
+            "cost": Decimal("1000.00"),
+        }
+        return Case(client_id=client_id, **(defaults | fields))
+
+    return build
+
+
+@pytest.fixture
+def create_owner(db_session: AsyncSession) -> Callable[[], Awaitable[Client]]:
+    """Сохранённый клиент, которому принадлежат дела теста"""
+
+    async def create() -> Client:
+        owner = Client(name=f"Клиент {uuid.uuid4().hex[:8]}", type=ClientType.legal)
+        db_session.add(owner)
+        await db_session.commit()
+        return owner
+
+    return create
@@ -0,0 +1,104 @@
+import asyncio
+import uuid
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.app.core.auth.cache import (
+    INVALIDATION_CHANNEL,
+    SessionUserCache,
+    apply_invalidation,
+    listen_for_invalidations,
+    session_user_cache,
+)
+from src.app.core.auth.session import SessionUser
+from src.app.services.user.models import UserRole
+
+
+def make_user(user_id: uuid.UUID | None = None) -> SessionUser:
+    return SessionUser(id=user_id or uuid.uuid4(), role=UserRole.EXPERT, company_id=uuid.uuid4(), can_authenticate=True)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = SessionUserCache(max_size=2, ttl_seconds=60)
+    cache.set("a", make_user())
+    cache.set("b", make_user())
+
+    assert cache.get("a") is not None
+    cache.set("c", make_user())
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+
+
+def test_cache_entry_expires(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("src.app.core.auth.cache.time.monotonic", lambda: now)
+    cache = SessionUserCache(max_size=10, ttl_seconds=30)
+    cache.set("a", make_user())
+
+    now += 31
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_discard_user_drops_all_sessions_of_user() -> None:
+    cache = SessionUserCache(max_size=10, ttl_seconds=60)
+    user_id = uuid.uuid4()
+    cache.set("a", make_user(user_id))
+    cache.set("b", make_user(user_id))
+    cache.set("c", make_user())
+
+    cache.discard_user(user_id)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_snapshot_round_trips_through_session_data() -> None:
+    user = make_user()
+
+    assert SessionUser.from_session(user.to_session()) == user
+
+
+def test_legacy_session_data_has_no_snapshot() -> None:
+    assert SessionUser.from_session({"user_id": uuid.uuid4().bytes, "role": "ceo"}) is None
+
+
+def test_apply_invalidation_rejects_unknown_message() -> None:
+    with pytest.raises(ValueError):
+        apply_invalidation("garbage")
+
+
+def test_apply_invalidation_by_user_and_session() -> None:
+    user = make_user()
+    session_user_cache.clear()
+    session_user_cache.set("a", user)
+    session_user_cache.set("b", make_user())
+
+    apply_invalidation(f"user:{user.id}")
+    apply_invalidation("session:b")
+
+    assert len(session_user_cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_listener_survives_malformed_message() -> None:
+    redis = FakeAsyncRedis(decode_responses=True)
+    user = make_user()
+    listener = asyncio.create_task(listen_for_invalidations(redis))
+    while not (await redis.pubsub_numsub(INVALIDATION_CHANNEL))[0][1]:
+        await asyncio.sleep(0.01)
+
+    session_user_cache.set("a", user)
+    await redis.publish(INVALIDATION_CHANNEL, "user:not-a-uuid")
+    await redis.publish(INVALIDATION_CHANNEL, f"user:{user.id}")
+    async with asyncio.timeout(2):
+        while session_user_cache.get("a") is not None:
+            await asyncio.sleep(0.01)
+
+    assert not listener.done()
+    listener.cancel()
+    await redis.aclose()
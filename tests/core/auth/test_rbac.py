@@ -0,0 +1,30 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from src.app.core.auth.rbac import RoleChecker, check_hierarchy
+from src.app.core.auth.session import SessionUser
+from src.app.services.user.models import UserRole
+from src.app.services.user.schemas import ROLE_PERMISSIONS
+
+
+def make_user(role: UserRole) -> SessionUser:
+    return SessionUser(id=uuid.uuid4(), role=role, company_id=uuid.uuid4(), can_authenticate=True)
+
+
+@pytest.mark.parametrize("creator_role", list(UserRole))
+@pytest.mark.parametrize("target_role", list(UserRole))
+def test_check_hierarchy_matches_role_permissions(creator_role: UserRole, target_role: UserRole) -> None:
+    assert check_hierarchy(creator_role, target_role) == (target_role in ROLE_PERMISSIONS[creator_role])
+
+
+def test_role_checker_uses_session_snapshot() -> None:
+    checker = RoleChecker([UserRole.ADMIN, UserRole.CEO])
+    ceo = make_user(UserRole.CEO)
+
+    assert checker(ceo) is ceo
+    with pytest.raises(HTTPException) as exc_info:
+        checker(make_user(UserRole.EXPERT))
+
+    assert exc_info.value.status_code == 403
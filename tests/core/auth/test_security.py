@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from src.app.core.auth.security import (
+    PasswordHasher,
+    PasswordHasherOverloadedError,
+    calibrate_bcrypt_rounds,
+    get_hash_rounds,
+    hash_password,
+    needs_rehash,
+)
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip_through_pool() -> None:
+    hasher = PasswordHasher(executor_kind="thread", max_workers=2, max_pending=4)
+    try:
+        hashed = await hasher.hash("correct horse battery")
+
+        assert await hasher.verify("correct horse battery", hashed)
+        assert not await hasher.verify("wrong password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full() -> None:
+    hasher = PasswordHasher(executor_kind="thread", max_workers=1, max_pending=2)
+    try:
+        results = await asyncio.gather(*(hasher.hash("password") for _ in range(3)), return_exceptions=True)
+
+        assert sum(isinstance(r, PasswordHasherOverloadedError) for r in results) == 1
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pending_is_released_when_worker_raises() -> None:
+    hasher = PasswordHasher(executor_kind="thread", max_workers=1, max_pending=1)
+    try:
+        with pytest.raises(ValueError):
+            await hasher.verify("password", "not-a-bcrypt-hash")
+
+        assert hasher.pending == 0
+        assert isinstance(await hasher.hash("password"), str)
+    finally:
+        hasher.shutdown()
+
+
+def test_calibration_extrapolates_from_min_rounds(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("src.app.core.auth.security.measure_hash_ms", lambda rounds: 40.0)
+
+    assert calibrate_bcrypt_rounds(target_ms=250, min_rounds=10, max_rounds=14) == 12
+    assert calibrate_bcrypt_rounds(target_ms=10_000, min_rounds=10, max_rounds=14) == 14
+    assert calibrate_bcrypt_rounds(target_ms=10, min_rounds=10, max_rounds=14) == 10
+
+
+def test_needs_rehash_only_raises_cost_factor() -> None:
+    hashed = hash_password("password", rounds=5)
+
+    assert get_hash_rounds(hashed) == 5
+    assert not needs_rehash(hashed, 5)
+    assert needs_rehash(hashed, 6)
+    # Воркер с меньшим калиброванным cost не понижает хеш, записанный соседом
+    assert not needs_rehash(hashed, 4)
+    assert needs_rehash("not-a-bcrypt-hash", 4)
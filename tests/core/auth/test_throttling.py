@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from fastapi import HTTPException
+
+from src.app.core.auth.throttling import LoginThrottle
+from src.app.core.config import settings
+
+
+@pytest.mark.asyncio
+async def test_ip_window_counts_attempts_across_emails(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_IP", 3)
+    throttle = LoginThrottle(FakeAsyncRedis(decode_responses=True))
+
+    for i in range(3):
+        await throttle.check_rate(f"user{i}@example.com", "10.0.0.1")
+    with pytest.raises(HTTPException) as exc_info:
+        await throttle.check_rate("another@example.com", "10.0.0.1")
+    await throttle.check_rate("another@example.com", "10.0.0.2")
+
+    assert exc_info.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_rejected_attempt_is_not_counted(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_EMAIL", 1)
+    redis = FakeAsyncRedis(decode_responses=True)
+    throttle = LoginThrottle(redis)
+
+    await throttle.check_rate("user@example.com", "10.0.0.1")
+    with pytest.raises(HTTPException):
+        await throttle.check_rate("user@example.com", "10.0.0.1")
+
+    assert await redis.zcard("login_rate:ip:10.0.0.1") == 1
+
+
+@pytest.mark.asyncio
+async def test_verification_slots_are_capped_and_released(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOGIN_MAX_CONCURRENT_VERIFICATIONS", 1)
+    throttle = LoginThrottle(FakeAsyncRedis(decode_responses=True))
+
+    async with throttle.verification_slot():
+        with pytest.raises(HTTPException) as exc_info:
+            async with throttle.verification_slot():
+                pass
+    async with throttle.verification_slot():
+        pass
+
+    assert exc_info.value.status_code == 429
+
+
+@pytest.mark.asyncio
+async def test_expired_verification_lease_is_reclaimed(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOGIN_MAX_CONCURRENT_VERIFICATIONS", 1)
+    monkeypatch.setattr(settings, "LOGIN_VERIFICATION_LEASE_SECONDS", 0.05)
+    throttle = LoginThrottle(FakeAsyncRedis(decode_responses=True))
+
+    # Имитируем воркер, упавший с занятым слотом
+    await throttle._acquire_slot(keys=[throttle.slots_key], args=[50, 1, "crashed-worker"])
+    await asyncio.sleep(0.1)
+
+    async with throttle.verification_slot():
+        pass
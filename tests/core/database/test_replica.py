@@ -0,0 +1,84 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.core.database import replica
+from src.app.core.database.replica import PRIMARY_PIN_COOKIE, get_read_db, is_replica_session, pin_primary_after_write
+
+
+def make_request(method: str = "GET", headers: dict[str, str] | None = None) -> Request:
+    raw_headers = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "path": "/", "headers": raw_headers, "query_string": b""})
+
+
+@pytest_asyncio.fixture
+async def engines(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> AsyncIterator[tuple[AsyncEngine, AsyncEngine]]:
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    read = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monkeypatch.setattr(replica, "AsyncSessionLocal", async_sessionmaker(primary, class_=AsyncSession))
+    monkeypatch.setattr(replica, "ReadSessionLocal", async_sessionmaker(read, class_=AsyncSession))
+    monkeypatch.setattr(replica, "_replica_down_until", 0.0)
+    yield primary, read
+    await primary.dispose()
+    await read.dispose()
+
+
+async def session_engine(request: Request) -> AsyncEngine:
+    generator = get_read_db(request)
+    session = await anext(generator)
+    bind = session.bind
+    await generator.aclose()
+    assert isinstance(bind, AsyncEngine)
+    return bind
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica(engines: tuple[AsyncEngine, AsyncEngine]) -> None:
+    _, read = engines
+
+    assert await session_engine(make_request()) is read
+
+
+@pytest.mark.asyncio
+async def test_only_replica_sessions_are_marked(engines: tuple[AsyncEngine, AsyncEngine]) -> None:
+    for request, expected in ((make_request(), True), (make_request(headers={"X-Consistency": "primary"}), False)):
+        generator = get_read_db(request)
+        assert is_replica_session(await anext(generator)) is expected
+        await generator.aclose()
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_uses_primary(engines: tuple[AsyncEngine, AsyncEngine]) -> None:
+    primary, _ = engines
+    pinned = make_request(headers={"Cookie": f"{PRIMARY_PIN_COOKIE}=1"})
+
+    assert await session_engine(make_request(headers={"X-Consistency": "primary"})) is primary
+    assert await session_engine(pinned) is primary
+
+
+@pytest.mark.asyncio
+async def test_unavailable_replica_falls_back_to_primary(engines: tuple[AsyncEngine, AsyncEngine], monkeypatch: pytest.MonkeyPatch) -> None:
+    primary, _ = engines
+    broken = create_async_engine("sqlite+aiosqlite:////nonexistent-dir/replica.db")
+    monkeypatch.setattr(replica, "ReadSessionLocal", async_sessionmaker(broken, class_=AsyncSession))
+
+    assert await session_engine(make_request()) is primary
+    assert not replica.replica_is_available()
+    await broken.dispose()
+
+
+@pytest.mark.asyncio
+async def test_successful_write_pins_reads_to_primary(engines: tuple[AsyncEngine, AsyncEngine]) -> None:
+    async def ok(request: Request) -> Response:
+        return Response(status_code=201)
+
+    async def failed(request: Request) -> Response:
+        return Response(status_code=400)
+
+    assert PRIMARY_PIN_COOKIE in (await pin_primary_after_write(make_request("POST"), ok)).headers.get("set-cookie", "")
+    assert "set-cookie" not in (await pin_primary_after_write(make_request("POST"), failed)).headers
+    assert "set-cookie" not in (await pin_primary_after_write(make_request("GET"), ok)).headers
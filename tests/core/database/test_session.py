@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.app.core.monitoring.pool import InstrumentedQueuePool
+
+
+@pytest.mark.asyncio
+async def test_session_holds_connection_only_between_first_query_and_commit() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=InstrumentedQueuePool)
+    pool = engine.pool
+    assert isinstance(pool, InstrumentedQueuePool)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as session:
+            assert pool.checkedout() == 0
+
+            await session.execute(text("SELECT 1"))
+            assert pool.checkedout() == 1
+
+            await session.commit()
+            assert pool.checkedout() == 0
+    finally:
+        await engine.dispose()
@@ -0,0 +1,42 @@
+from collections.abc import Callable
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette import status
+
+from src.app.core.auth.session import SessionUser
+from src.app.core.monitoring.pool import InstrumentedQueuePool, collect_pool_stats
+from src.app.services.user.models import UserRole
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_checkouts_and_timeouts() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    try:
+        async with engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+
+            stats = collect_pool_stats(engine.pool)
+
+        assert stats.checked_out == 1
+        assert stats.checkouts == 1
+        assert stats.timeouts == 1
+        assert stats.max_wait_ms >= 50
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("role", "expected_status"), [(UserRole.ADMIN, status.HTTP_200_OK), (UserRole.CEO, status.HTTP_403_FORBIDDEN)])
+async def test_pool_endpoint_is_admin_only(
+    client: AsyncClient, as_role: Callable[[UserRole], SessionUser], role: UserRole, expected_status: int
+) -> None:
+    as_role(role)
+
+    response = await client.get("/internal/db/pool")
+
+    assert response.status_code == expected_status
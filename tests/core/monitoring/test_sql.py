@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.app.core.config import settings
+from src.app.core.monitoring.sql import _START_TIMES_KEY, QueryStats, current_query_stats, install_sql_instrumentation, parameter_shape
+
+
+def test_parameter_shape_hides_values() -> None:
+    assert parameter_shape({"email": "a@b.c", "limit": 10}, executemany=False) == "{email: str, limit: int}"
+    assert parameter_shape(("secret", None), executemany=False) == "(str, NoneType)"
+    assert parameter_shape([("a",), ("b",)], executemany=True) == "2 x (str)"
+
+
+@pytest.mark.asyncio
+async def test_statements_are_recorded_in_request_stats(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    monkeypatch.setattr(settings, "SQL_SLOW_QUERY_MS", 0.0)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_sql_instrumentation(engine.sync_engine)
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        with caplog.at_level(logging.WARNING, logger="src.app.core.monitoring.sql"):
+            async with engine.connect() as conn:
+                for value in range(3):
+                    await conn.execute(text("SELECT :value"), {"value": value})
+    finally:
+        current_query_stats.reset(token)
+        await engine.dispose()
+
+    assert stats.count == 3
+    assert stats.repeated_statements(threshold=2) == [("SELECT ?", 3)]
+    assert stats.slowest_parameters == "(int)"
+    assert [getattr(record, "statement", None) for record in caplog.records] == ["SELECT ?"] * 3
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_do_not_leak_start_times() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_sql_instrumentation(engine.sync_engine)
+    try:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            raw = await conn.get_raw_connection()
+            assert raw.info[_START_TIMES_KEY] == {}
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_response_reports_db_time(client: AsyncClient) -> None:
+    response = await client.get("/api/clients")
+
+    assert response.headers["Server-Timing"].startswith("db;dur=")
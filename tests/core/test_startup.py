@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from src.app.core.startup import run_check, run_checks
+
+
+async def sleep_for(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_checks_run_concurrently() -> None:
+    started = time.perf_counter()
+
+    results = await run_checks({"a": lambda: sleep_for(0.1), "b": lambda: sleep_for(0.1)}, timeout=1)
+
+    assert time.perf_counter() - started < 0.19
+    assert all(result.ok for result in results.values())
+
+
+@pytest.mark.asyncio
+async def test_slow_check_is_cut_off_by_deadline() -> None:
+    result = await run_check("slow", lambda: sleep_for(10), timeout=0.05)
+
+    assert isinstance(result.error, TimeoutError)
+    assert result.elapsed_ms < 1000
+
+
+@pytest.mark.asyncio
+async def test_failing_check_does_not_raise() -> None:
+    async def broken() -> None:
+        raise ConnectionError("refused")
+
+    result = await run_check("broken", broken, timeout=1)
+
+    assert isinstance(result.error, ConnectionError)
@@ -0,0 +1,73 @@
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette import status
+
+from src.app.services.case.deadlines import DEADLINE_CHANNEL, DeadlineScheduler
+from src.app.services.case.models import Case, CaseEvent, CaseEventType, CaseStatus
+from src.app.services.client.models import Client
+
+
+@pytest.mark.asyncio
+async def test_only_one_scheduler_holds_leadership(redis_client: FakeAsyncRedis, db_session: AsyncSession) -> None:
+    sessions = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    leader = DeadlineScheduler(redis_client, sessions)
+    follower = DeadlineScheduler(redis_client, sessions)
+
+    assert await leader.acquire_leadership()
+    assert not await follower.acquire_leadership()
+    # Лидер продлевает свою аренду тем же вызовом
+    assert await leader.acquire_leadership()
+
+    await leader.release_leadership()
+    assert await follower.acquire_leadership()
+
+
+@pytest.mark.asyncio
+async def test_reminder_fires_once_and_rearms_on_deadline_change(
+    client: AsyncClient,
+    redis_client: FakeAsyncRedis,
+    db_session: AsyncSession,
+    create_owner: Callable[[], Awaitable[Client]],
+    make_case: Callable[..., Case],
+) -> None:
+    owner = await create_owner()
+    now = datetime.now(UTC)
+    start_date = datetime(2026, 1, 1, tzinfo=UTC)
+    soon = make_case(owner.id, start_date=start_date, deadline=now + timedelta(hours=2))
+    later = make_case(owner.id, start_date=start_date, deadline=now + timedelta(days=30))
+    finished = make_case(owner.id, start_date=start_date, deadline=now + timedelta(hours=2), status=CaseStatus.executed)
+    db_session.add_all([soon, later, finished])
+    await db_session.commit()
+    soon_id, later_id, finished_id = soon.id, later.id, finished.id
+
+    sessions = async_sessionmaker(db_session.bind, expire_on_commit=False)
+    scheduler = DeadlineScheduler(redis_client, sessions)
+    await scheduler.load_window(now)
+    fired = await scheduler.fire_due(now)
+
+    assert soon_id in fired
+    assert later_id not in fired
+    assert finished_id not in fired
+    # Второй лидер после смены аренды о том же дедлайне не напоминает
+    failover = DeadlineScheduler(redis_client, sessions)
+    await failover.load_window(now)
+    assert soon_id not in await failover.fire_due(now)
+
+    async with redis_client.pubsub(ignore_subscribe_messages=True) as pubsub:
+        await pubsub.subscribe(DEADLINE_CHANNEL)
+        new_deadline = (now + timedelta(hours=5)).replace(tzinfo=None, microsecond=0)
+        response = await client.patch(f"/api/cases/{soon_id}", json={"deadline": new_deadline.isoformat()})
+        assert response.status_code == status.HTTP_200_OK
+        message = await anext(pubsub.listen())
+
+    scheduler.apply_message(message["data"], now)
+    assert await scheduler.fire_due(now) == [soon_id]
+
+    events = (await db_session.execute(select(CaseEvent.event_type).where(CaseEvent.case_id == soon_id).order_by(CaseEvent.id))).scalars().all()
+    assert events == [CaseEventType.deadline, CaseEventType.updated, CaseEventType.deadline]
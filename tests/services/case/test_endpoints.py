@@ -0,0 +1,305 @@
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import cast
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.app.core.config import settings
+from src.app.core.database.replica import REPLICA_SESSION_KEY
+from src.app.services.case.models import Case, CaseStatus
+from src.app.services.client.models import Client
+from src.app.services.company.models import Company
+from src.app.services.document.models import Document
+from src.app.services.mail.models import MailMessage, MailMessageType
+from src.app.services.user.models import User, UserRole
+
+pytestmark = pytest.mark.usefixtures("redis_client")
+
+
+CasesFactory = Callable[[list[tuple[CaseStatus, timedelta]]], Awaitable[Client]]
+
+
+@pytest.fixture
+def create_client_with_cases(
+    db_session: AsyncSession, create_owner: Callable[[], Awaitable[Client]], make_case: Callable[..., Case]
+) -> CasesFactory:
+    """Клиент с делами в заданных статусах. Дедлайн — смещение от текущего момента."""
+
+    async def create(statuses: list[tuple[CaseStatus, timedelta]]) -> Client:
+        owner = await create_owner()
+        now = datetime.now(UTC)
+        db_session.add_all(
+            [
+                make_case(owner.id, status=case_status, start_date=now - timedelta(days=30), deadline=now + offset)
+                for case_status, offset in statuses
+            ]
+        )
+        await db_session.commit()
+        return owner
+
+    return create
+
+
+@pytest.mark.asyncio
+async def test_get_cases_summary_follows_filters(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases(
+        [
+            (CaseStatus.in_work, timedelta(days=-1)),
+            (CaseStatus.in_work, timedelta(days=10)),
+            (CaseStatus.debt, timedelta(days=-5)),
+            (CaseStatus.executed, timedelta(days=-5)),
+        ],
+    )
+    # Дела другого клиента не должны попадать в сводку
+    await create_client_with_cases([(CaseStatus.in_work, timedelta(days=-1))])
+
+    response = await client.get("/api/cases", params={"client_id": str(owner.id)})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["pagination"]["total"] == 4
+    assert data["summary"] == {"active": 3, "overdue": 2, "completed": 1}
+    # Сводка и страница — два запроса вместо четырёх
+    assert response.headers["Server-Timing"].endswith('desc="2 queries"')
+
+    response = await client.get("/api/cases", params={"client_id": str(owner.id), "status": ["in_work"]})
+
+    data = response.json()
+    assert data["pagination"]["total"] == 2
+    assert data["summary"] == {"active": 2, "overdue": 1, "completed": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_cases_pages_are_ordered_by_deadline(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=days)) for days in (3, 1, 2)])
+
+    first = await client.get("/api/cases", params={"client_id": str(owner.id), "limit": 2})
+    second = await client.get("/api/cases", params={"client_id": str(owner.id), "limit": 2, "page": 2})
+
+    deadlines = [case["deadline"] for case in first.json()["data"] + second.json()["data"]]
+    assert len(deadlines) == 3
+    assert deadlines == sorted(deadlines)
+
+
+@pytest.mark.asyncio
+async def test_get_cases_cursor_walks_all_pages(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=days)) for days in (5, 1, 4, 2, 3)])
+    params: dict[str, str | int] = {"client_id": str(owner.id), "limit": 2}
+
+    seen: list[str] = []
+    response = await client.get("/api/cases", params=params)
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        seen.extend(case["id"] for case in body["data"])
+        cursor = body["pagination"]["next_cursor"]
+        if cursor is None:
+            break
+        response = await client.get("/api/cases", params={**params, "cursor": cursor})
+
+    assert len(seen) == len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_get_cases_rejects_foreign_cursor(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=days)) for days in (1, 2)])
+    first = await client.get("/api/cases", params={"client_id": str(owner.id), "limit": 1})
+    cursor = first.json()["pagination"]["next_cursor"]
+
+    response = await client.get("/api/cases", params={"client_id": str(owner.id), "cursor": cursor, "sort": "created_at"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = await client.get("/api/cases", params={"cursor": "not-a-cursor"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_cases_summary_is_cached_until_cases_change(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=-1)), (CaseStatus.in_work, timedelta(days=1))])
+    params = {"client_id": str(owner.id)}
+
+    first = await client.get("/api/cases", params=params)
+    cached = await client.get("/api/cases", params={**params, "limit": 1})
+
+    assert cached.json()["summary"] == first.json()["summary"] == {"active": 2, "overdue": 1, "completed": 0}
+    # Во второй раз из БД читается только страница
+    assert cached.headers["Server-Timing"].endswith('desc="1 queries"')
+
+    deleted_id = first.json()["data"][0]["id"]
+    assert (await client.delete(f"/api/cases/{deleted_id}")).status_code == status.HTTP_204_NO_CONTENT
+
+    after_delete = await client.get("/api/cases", params=params)
+    assert after_delete.json()["pagination"]["total"] == 1
+    assert after_delete.json()["summary"] == {"active": 1, "overdue": 0, "completed": 0}
+
+
+@pytest.mark.asyncio
+async def test_summary_read_from_replica_is_not_cached(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch, create_client_with_cases: CasesFactory
+) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=1))])
+    monkeypatch.setitem(db_session.info, REPLICA_SESSION_KEY, True)
+    params = {"client_id": str(owner.id)}
+
+    await client.get("/api/cases", params=params)
+    second = await client.get("/api/cases", params=params)
+
+    # Сводка снова считается по БД: с реплики в кэш ничего не записано
+    assert second.headers["Server-Timing"].endswith('desc="2 queries"')
+
+
+@pytest.mark.asyncio
+async def test_cached_summary_expires_at_next_deadline(
+    client: AsyncClient, redis_client: FakeAsyncRedis, create_client_with_cases: CasesFactory
+) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(seconds=5))])
+
+    await client.get("/api/cases", params={"client_id": str(owner.id)})
+
+    generation = await redis_client.get("case_summary:generation") or "0"
+    entries = await cast(Awaitable[dict[str, str]], redis_client.hgetall(f"case_summary:{generation}"))
+    expires_at = max(json.loads(value)["expires_at"] for value in entries.values())
+    assert expires_at - time.time() <= 5
+
+
+@pytest.mark.asyncio
+async def test_get_cases_search_filters_page_and_summary(
+    client: AsyncClient, db_session: AsyncSession, create_client_with_cases: CasesFactory
+) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=10)), (CaseStatus.executed, timedelta(days=-5))])
+    case = (await db_session.execute(select(Case).where(Case.client_id == owner.id, Case.status == CaseStatus.in_work))).scalar_one()
+    case.object_address = "г. Москва, ул. Ленина, д. 5"
+    case.plaintiff = "ООО «Ромашка»"
+    await db_session.commit()
+
+    response = await client.get("/api/cases", params={"client_id": str(owner.id)})
+    assert response.json()["pagination"]["total"] == 2
+
+    for q in ("Ленина", "Ромашка"):
+        response = await client.get("/api/cases", params={"client_id": str(owner.id), "q": f" {q} "})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [item["id"] for item in data["data"]] == [str(case.id)]
+        # Сводка кэшируется по набору фильтров вместе со строкой поиска
+        assert data["pagination"] == {"total": 1, "page": 1, "limit": 20, "total_pages": 1, "next_cursor": None}
+        assert data["summary"] == {"active": 1, "overdue": 0, "completed": 0}
+
+
+@pytest.mark.asyncio
+async def test_get_case_details_loads_relations_in_bounded_queries(
+    client: AsyncClient, db_session: AsyncSession, create_client_with_cases: CasesFactory
+) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=10))])
+    case = (await db_session.execute(select(Case).where(Case.client_id == owner.id))).scalar_one()
+    company = Company(name="ООО Эксперт", inn=str(uuid.uuid4().int)[:10])
+    db_session.add(company)
+    await db_session.flush()
+    expert = User(
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        hashed_password="not-a-real-hash",
+        full_name="Эксперт Экспертов",
+        role=UserRole.EXPERT,
+        company_id=company.id,
+    )
+    db_session.add(expert)
+    await db_session.flush()
+    case.assigned_user_id = expert.id
+
+    for n in range(3):
+        db_session.add(
+            Document(
+                case_id=case.id,
+                title=f"Документ {n}",
+                original_filename=f"doc{n}.pdf",
+                file_path=f"cases/{case.id}/doc{n}.pdf",
+                file_size=100,
+                mime_type="application/pdf",
+                file_extension="pdf",
+                is_archived=n == 2,
+            )
+        )
+    now = datetime.now(UTC)
+    for n in range(settings.CASE_DETAILS_MAIL_LIMIT + 2):
+        db_session.add(
+            MailMessage(
+                user_id=expert.id,
+                case_id=case.id,
+                sender_email="court@example.com",
+                subject=f"Письмо {n}",
+                message_type=MailMessageType.INCOMING,
+                processed_at=now - timedelta(hours=n),
+                is_deleted=False,
+            )
+        )
+    await db_session.commit()
+
+    response = await client.get(f"/api/cases/{case.id}")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["case"]["assigned_expert_id"] == str(expert.id)
+    assert data["assigned_experts"] == [{"id": str(expert.id), "full_name": "Эксперт Экспертов", "email": expert.email, "specialization": None}]
+    # Архивные документы в карточку не попадают
+    assert sorted(document["title"] for document in data["documents"]) == ["Документ 0", "Документ 1"]
+    assert [event["subject"] for event in data["events"]] == [f"Письмо {n}" for n in range(settings.CASE_DETAILS_MAIL_LIMIT)]
+    # Дело с экспертом, документы, письма и журнал — четыре запроса независимо от их числа
+    assert response.headers["Server-Timing"].endswith('desc="4 queries"')
+
+
+@pytest.mark.asyncio
+async def test_case_mutations_are_recorded_in_history(client: AsyncClient, create_client_with_cases: CasesFactory) -> None:
+    owner = await create_client_with_cases([])
+    payload = {
+        "number": f"H-{uuid.uuid4().hex[:12]}",
+        "case_number": f"HC-{uuid.uuid4().hex[:12]}",
+        "authority": "Суд",
+        "client_id": str(owner.id),
+        "case_type": "civil",
+        "object_type": "land",
+        "object_address": "г. Москва",
+        "start_date": "2026-01-01T00:00:00",
+        "deadline": "2026-06-01T00:00:00",
+        "cost": "1000.00",
+    }
+    case_id = (await client.post("/api/cases", json=payload)).json()["id"]
+
+    # Неизменившееся поле в журнал не попадает
+    response = await client.patch(f"/api/cases/{case_id}", json={"status": "executed", "cost": "1500.00", "authority": "Суд"})
+    assert response.status_code == status.HTTP_200_OK
+
+    history = (await client.get(f"/api/cases/{case_id}")).json()["history"]
+
+    assert [entry["event_type"] for entry in history] == ["updated", "created"]
+    assert history[0]["changes"] == {"status": {"old": "in_work", "new": "executed"}, "cost": {"old": "1000.00", "new": "1500.00"}}
+    assert history[1]["changes"] is None
+
+
+@pytest.mark.asyncio
+async def test_update_case_rejects_deadline_before_start(
+    client: AsyncClient, db_session: AsyncSession, create_client_with_cases: CasesFactory
+) -> None:
+    owner = await create_client_with_cases([(CaseStatus.in_work, timedelta(days=10))])
+    case = (await db_session.execute(select(Case).where(Case.client_id == owner.id))).scalar_one()
+    case_id, start_date = case.id, case.start_date.replace(tzinfo=None)
+
+    response = await client.patch(f"/api/cases/{case_id}", json={"deadline": (start_date - timedelta(days=1)).isoformat()})
+
+    # Проверку выполняет ограничение ck_cases_deadline_after_start, а не чтение дела перед обновлением
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"] == "Deadline cannot be before start date"
+
+    response = await client.patch(f"/api/cases/{case_id}", json={"remarks": "Проверено"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["remarks"] == "Проверено"
+
+    response = await client.patch(f"/api/cases/{uuid.uuid4()}", json={"remarks": "Нет такого"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
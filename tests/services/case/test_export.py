@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from openpyxl import load_workbook
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.app.core.auth.session import SessionUser
+from src.app.services.case.models import Case
+from src.app.services.client.models import Client
+from src.app.services.user.models import UserRole
+
+
+@pytest.fixture(autouse=True)
+def as_accountant(as_role: Callable[[UserRole], SessionUser]) -> None:
+    as_role(UserRole.ACCOUNTANT)
+
+
+@pytest.fixture
+def create_owner_with_cases(
+    db_session: AsyncSession, create_owner: Callable[[], Awaitable[Client]], make_case: Callable[..., Case]
+) -> Callable[[int], Awaitable[Client]]:
+    async def create(count: int) -> Client:
+        owner = await create_owner()
+        now = datetime.now(UTC)
+        db_session.add_all(
+            [
+                make_case(
+                    owner.id,
+                    object_address="г. Москва, ул. Ленина, 1",
+                    start_date=now,
+                    deadline=now + timedelta(days=index + 1),
+                    cost=Decimal("1234.50"),
+                )
+                for index in range(count)
+            ]
+        )
+        await db_session.commit()
+        return owner
+
+    return create
+
+
+@pytest.mark.asyncio
+async def test_export_csv_streams_all_filtered_cases(client: AsyncClient, create_owner_with_cases: Callable[[int], Awaitable[Client]]) -> None:
+    owner = await create_owner_with_cases(3)
+
+    response = await client.get("/api/cases/export", params={"client_id": str(owner.id), "format": "csv"})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"].startswith('attachment; filename="cases-')
+    rows = list(csv.DictReader(io.StringIO(response.content.decode("utf-8-sig"))))
+    assert len(rows) == 3
+    assert {row["client_id"] for row in rows} == {str(owner.id)}
+    assert rows[0]["cost"] == "1234.50"
+    assert [row["deadline"] for row in rows] == sorted(row["deadline"] for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_xlsx(client: AsyncClient, create_owner_with_cases: Callable[[int], Awaitable[Client]]) -> None:
+    owner = await create_owner_with_cases(2)
+
+    ndjson = await client.get("/api/cases/export", params={"client_id": str(owner.id), "format": "ndjson"})
+    records = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [record["object_address"] for record in records] == ["г. Москва, ул. Ленина, 1"] * 2
+
+    xlsx = await client.get("/api/cases/export", params={"client_id": str(owner.id), "format": "xlsx"})
+    sheet = load_workbook(io.BytesIO(xlsx.content), read_only=True).active
+    values = list(sheet.iter_rows(values_only=True))
+    assert values[0][:2] == ("id", "number")
+    assert len(values) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_is_not_available_to_experts(client: AsyncClient, as_role: Callable[[UserRole], SessionUser]) -> None:
+    as_role(UserRole.EXPERT)
+
+    response = await client.get("/api/cases/export")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,78 @@
+import io
+import uuid
+from collections.abc import Awaitable, Callable
+
+import pytest
+from httpx import AsyncClient
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.app.core.auth.session import SessionUser
+from src.app.services.case.models import Case
+from src.app.services.client.models import Client
+from src.app.services.user.models import UserRole
+
+pytestmark = pytest.mark.usefixtures("redis_client")
+
+HEADER = ["number", "case_number", "authority", "client_id", "case_type", "object_type", "object_address", "start_date", "deadline", "cost"]
+
+
+@pytest.fixture(autouse=True)
+def as_admin(as_role: Callable[[UserRole], SessionUser]) -> None:
+    as_role(UserRole.ADMIN)
+
+
+def import_row(client_id: uuid.UUID | str, number: str, cost: str = "1000.00") -> list[str]:
+    return [number, f"C{number}", "Суд", str(client_id), "civil", "land", "г. Москва", "2026-01-10T00:00:00", "2026-03-01T00:00:00", cost]
+
+
+@pytest.mark.asyncio
+async def test_import_csv_reports_row_errors(
+    client: AsyncClient, db_session: AsyncSession, create_owner: Callable[[], Awaitable[Client]]
+) -> None:
+    owner = await create_owner()
+    prefix = uuid.uuid4().hex[:8]
+    rows = [
+        import_row(owner.id, f"{prefix}-1"),
+        import_row(owner.id, f"{prefix}-2", cost="много"),
+        import_row(owner.id, f"{prefix}-1"),  # дубль номера из этого же файла
+        import_row(uuid.uuid4(), f"{prefix}-3"),
+        import_row(owner.id, f"{prefix}-4"),
+    ]
+    body = "\n".join(",".join(row) for row in [HEADER, *rows])
+
+    response = await client.post("/api/cases/import", files={"file": ("cases.csv", body.encode(), "text/csv")})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["total_rows"] == 5
+    assert data["imported"] == 2
+    assert [(error["row"], error["field"]) for error in data["errors"]] == [(3, "cost"), (4, "number"), (5, "client_id")]
+
+    imported = await db_session.scalar(select(func.count()).select_from(Case).where(Case.client_id == owner.id))
+    assert imported == 2
+
+
+@pytest.mark.asyncio
+async def test_import_xlsx(client: AsyncClient, create_owner: Callable[[], Awaitable[Client]]) -> None:
+    owner = await create_owner()
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(HEADER)
+    sheet.append(import_row(owner.id, uuid.uuid4().hex[:12]))
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    response = await client.post("/api/cases/import", files={"file": ("cases.xlsx", buffer.getvalue())})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["imported"] == 1
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_unknown_format(client: AsyncClient) -> None:
+    response = await client.post("/api/cases/import", files={"file": ("cases.txt", b"number\n1")})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
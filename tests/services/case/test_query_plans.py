@@ -0,0 +1,125 @@
+"""
+Планы запросов списка дел на PostgreSQL при настройках планировщика по умолчанию.
+Сводка по каждой комбинации фильтров должна идти по своему индексу, страницы — без последовательного скана cases.
+Таблица засевается так, чтобы фильтры были избирательны, как в рабочей базе: большинство дел в архиве, у клиента и периода — малая доля.
+SQLite индексы с WHERE не проверит, поэтому тест запускается только с TEST_POSTGRES_URL — пустой одноразовой базой.
+"""
+
+import os
+import uuid
+from collections.abc import AsyncGenerator, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import Select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.app.core.database.all_models import Base
+from src.app.services.case.models import CaseStatus
+from src.app.services.case.schemas import CaseSort, GetCasesQuery
+from src.app.services.case.service import CaseService
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_POSTGRES_URL, reason="нужен PostgreSQL: задайте TEST_POSTGRES_URL")
+
+EXPERT_ID = uuid.uuid4()
+CLIENT_ID = uuid.uuid4()
+OTHER_CLIENT_ID = uuid.uuid4()
+NOW = datetime.now(UTC)
+PERIOD: dict[str, object] = {"start_date": NOW - timedelta(days=120), "end_date": NOW - timedelta(days=30)}
+
+SEARCH_INDEXES = frozenset({"ix_cases_search_vector", "ix_cases_search_text"})
+CLIENT_INDEXES = frozenset({"ix_cases_active_client_start_date", "ix_cases_client_status"})
+
+# Фильтры и индексы, по одному из которых должна идти сводка. Без фильтров сводка читает почти всю таблицу,
+# и последовательный скан для неё правильный выбор: проверяются только страницы.
+FILTER_COMBINATIONS: list[tuple[dict[str, object], frozenset[str] | None]] = [
+    ({}, None),
+    ({"status": [CaseStatus.in_work, CaseStatus.debt]}, frozenset({"ix_cases_active_status_deadline"})),
+    ({"expert_id": EXPERT_ID}, frozenset({"ix_cases_active_expert_deadline"})),
+    ({"client_id": CLIENT_ID}, CLIENT_INDEXES),
+    (PERIOD, frozenset({"ix_cases_active_start_date"})),
+    ({"status": [CaseStatus.in_work], "expert_id": EXPERT_ID}, frozenset({"ix_cases_active_status_deadline", "ix_cases_active_expert_deadline"})),
+    ({"status": [CaseStatus.in_work], "client_id": CLIENT_ID}, CLIENT_INDEXES | {"ix_cases_active_status_deadline"}),
+    ({"client_id": CLIENT_ID, **PERIOD}, frozenset({"ix_cases_active_client_start_date"})),
+    ({"expert_id": EXPERT_ID, **PERIOD}, frozenset({"ix_cases_active_expert_deadline", "ix_cases_active_start_date"})),
+    ({"q": "Ленина"}, SEARCH_INDEXES),
+    ({"q": "Ленона", "status": [CaseStatus.in_work]}, SEARCH_INDEXES | {"ix_cases_active_status_deadline"}),
+]
+
+# 50 000 дел за десять лет: в работе и в долгу — по 1%, у CLIENT_ID — 2%, удалено — 10%. У EXPERT_ID дел нет.
+SEED_SQL = """
+INSERT INTO cases (id, client_id, number, case_number, authority, case_type, object_type, object_address,
+                   status, start_date, deadline, cost, deleted_at)
+SELECT gen_random_uuid(), CASE WHEN n % 50 = 0 THEN :client_id ELSE :other_client_id END,
+       'P-' || n, 'PC-' || n, 'Суд', 'civil', 'land', 'адрес',
+       CASE n % 100 WHEN 1 THEN 'in_work' WHEN 2 THEN 'debt' ELSE (ARRAY['archive', 'executed'])[1 + n % 2] END,
+       now() - (n % 3650) * interval '1 day', now() - (n % 3650) * interval '1 day' + (1 + n % 90) * interval '1 day', 1000,
+       CASE WHEN n % 10 = 3 THEN now() END
+FROM generate_series(1, 50000) AS n
+"""
+
+
+@pytest_asyncio.fixture(scope="module")
+async def pg_engine() -> AsyncGenerator[AsyncEngine]:
+    assert TEST_POSTGRES_URL is not None
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        for client_id in (CLIENT_ID, OTHER_CLIENT_ID):
+            await conn.execute(text("INSERT INTO clients (id, name, type) VALUES (:id, 'План', 'legal')"), {"id": client_id})
+        await conn.execute(text(SEED_SQL), {"client_id": CLIENT_ID, "other_client_id": OTHER_CLIENT_ID})
+        await conn.execute(text("ANALYZE cases"))
+
+    yield engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+def plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def list_statements(filters: dict[str, object]) -> dict[str, Select[Any]]:
+    statements: dict[str, Select[Any]] = {}
+    for sort in CaseSort:
+        query = GetCasesQuery.model_validate({**filters, "sort": sort})
+        conditions = CaseService.list_filters(query, "postgresql")
+        statements["summary"] = CaseService.summary_statement(conditions, datetime.now(UTC))
+        statements[f"page by {sort.value}"] = CaseService.page_statement(query, conditions, None, "postgresql")
+        position = (datetime.now(UTC), uuid.uuid4())
+        statements[f"cursor by {sort.value}"] = CaseService.page_statement(query, conditions, position, "postgresql")
+    return statements
+
+
+def used_indexes(plan: dict[str, Any]) -> set[str]:
+    return {node["Index Name"] for node in plan_nodes(plan) if "Index Name" in node}
+
+
+def scans_cases_sequentially(plan: dict[str, Any]) -> bool:
+    return any(node["Node Type"] == "Seq Scan" and node.get("Relation Name") == "cases" for node in plan_nodes(plan))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("filters", "summary_indexes"), FILTER_COMBINATIONS, ids=["+".join(filters) or "no filters" for filters, _ in FILTER_COMBINATIONS]
+)
+async def test_case_list_queries_use_indexes(pg_engine: AsyncEngine, filters: dict[str, object], summary_indexes: frozenset[str] | None) -> None:
+    async with pg_engine.connect() as conn:
+        for name, stmt in list_statements(filters).items():
+            sql = stmt.compile(dialect=pg_engine.dialect, compile_kwargs={"literal_binds": True})
+            plan = (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()[0]["Plan"]
+            if name != "summary":
+                assert not scans_cases_sequentially(plan), f"{name} with {filters or 'no filters'} scans cases sequentially"
+            elif summary_indexes is not None:
+                used = used_indexes(plan)
+                assert used & summary_indexes, (
+                    f"summary with {filters} uses {sorted(used) or 'no index'}, expected one of {sorted(summary_indexes)}"
+                )
@@ -0,0 +1,216 @@
+import os
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette import status
+
+from src.app.core.auth.session import SessionUser
+from src.app.core.database.all_models import Base
+from src.app.services.case.models import Case, CaseStats
+from src.app.services.case.service import CaseService
+from src.app.services.case.stats import CaseStatsDelta, rebuild_case_stats
+from src.app.services.client.models import Client, ClientType
+from src.app.services.company.models import Company
+from src.app.services.user.models import User, UserRole
+
+pytestmark = pytest.mark.usefixtures("redis_client")
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+Groups = dict[tuple[str, uuid.UUID | None, uuid.UUID, str], tuple[Decimal, ...]]
+
+
+async def stats_groups(db_session: AsyncSession, client_id: uuid.UUID) -> Groups:
+    """Свод клиента по группам; пустые группы не учитываются"""
+    rows = (await db_session.execute(select(CaseStats).where(CaseStats.client_id == client_id))).scalars().all()
+    groups: dict[tuple[str, uuid.UUID | None, uuid.UUID, str], list[Decimal]] = defaultdict(lambda: [Decimal(0)] * 5)
+    for row in rows:
+        values = groups[(row.status.value, row.assigned_user_id, row.client_id, row.month.isoformat())]
+        for index, value in enumerate((Decimal(row.cases_count), row.cost, row.bank_transfer_amount, row.cash_amount, row.remaining_debt)):
+            values[index] += value
+    return {key: tuple(values) for key, values in groups.items() if any(values)}
+
+
+def case_payload(client_id: uuid.UUID, number: str, start_date: datetime, cost: str) -> dict[str, str]:
+    return {
+        "number": number,
+        "case_number": f"C{number}",
+        "authority": "Арбитражный суд",
+        "client_id": str(client_id),
+        "case_type": "civil",
+        "object_type": "land",
+        "object_address": "г. Москва",
+        "start_date": start_date.isoformat(),
+        "deadline": datetime(2030, 1, 1, tzinfo=UTC).isoformat(),
+        "cost": cost,
+        "remaining_debt": cost,
+    }
+
+
+@pytest.mark.asyncio
+async def test_case_writes_keep_stats_equal_to_rebuild(
+    client: AsyncClient, db_session: AsyncSession, create_owner: Callable[[], Awaitable[Client]]
+) -> None:
+    owner = await create_owner()
+    suffix = uuid.uuid4().hex[:8]
+
+    january = datetime(2026, 1, 15, tzinfo=UTC)
+    created = [
+        await client.post("/api/cases", json=case_payload(owner.id, f"{suffix}-{index}", january, cost))
+        for index, cost in enumerate(("100.00", "250.50", "40.00"))
+    ]
+    assert all(response.status_code == status.HTTP_201_CREATED for response in created)
+    first_id, second_id, third_id = (response.json()["id"] for response in created)
+
+    # Смена статуса и месяца переносит вклад дела в другую группу, удаление — убирает
+    await client.patch(f"/api/cases/{first_id}", json={"status": "executed", "remaining_debt": "0.00"})
+    await client.patch(f"/api/cases/{second_id}", json={"start_date": "2026-02-01T00:00:00"})
+    await client.delete(f"/api/cases/{third_id}")
+
+    incremental = await stats_groups(db_session, owner.id)
+    zero = Decimal("0.00")
+    expected: Groups = {
+        ("executed", None, owner.id, "2026-01-01"): (Decimal(1), Decimal("100.00"), zero, zero, zero),
+        ("in_work", None, owner.id, "2026-02-01"): (Decimal(1), Decimal("250.50"), zero, zero, Decimal("250.50")),
+    }
+    assert incremental == expected
+
+    await rebuild_case_stats(db_session)
+    await db_session.commit()
+    assert await stats_groups(db_session, owner.id) == incremental
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("role", "expected_status"),
+    [(UserRole.ACCOUNTANT, status.HTTP_200_OK), (UserRole.EXPERT, status.HTTP_403_FORBIDDEN)],
+)
+async def test_case_stats_endpoint_roles(
+    client: AsyncClient, as_role: Callable[[UserRole], SessionUser], role: UserRole, expected_status: int
+) -> None:
+    as_role(role)
+
+    response = await client.get("/api/cases/stats", params={"month_from": "2026-01-01"})
+
+    assert response.status_code == expected_status
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_moves_stats_and_reports_each_id(
+    client: AsyncClient, db_session: AsyncSession, as_role: Callable[[UserRole], SessionUser], create_owner: Callable[[], Awaitable[Client]]
+) -> None:
+    as_role(UserRole.CEO)
+    owner = await create_owner()
+    suffix = uuid.uuid4().hex[:8]
+    january = datetime(2026, 1, 15, tzinfo=UTC)
+    ids = [
+        (await client.post("/api/cases", json=case_payload(owner.id, f"{suffix}-{index}", january, "100.00"))).json()["id"] for index in range(3)
+    ]
+    await client.delete(f"/api/cases/{ids[2]}")
+    missing_id = str(uuid.uuid4())
+
+    response = await client.patch("/api/cases/bulk", json={"ids": [*ids, missing_id], "patch": {"status": "executed"}})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {
+        "updated": 2,
+        "results": [
+            {"id": ids[0], "outcome": "updated"},
+            {"id": ids[1], "outcome": "updated"},
+            {"id": ids[2], "outcome": "not_found"},
+            {"id": missing_id, "outcome": "not_found"},
+        ],
+    }
+    incremental = await stats_groups(db_session, owner.id)
+    assert incremental == {("executed", None, owner.id, "2026-01-01"): (Decimal(2), Decimal("200.00"), Decimal(0), Decimal(0), Decimal("200.00"))}
+    history = (await client.get(f"/api/cases/{ids[0]}")).json()["history"]
+    assert history[0]["changes"] == {"status": {"old": "in_work", "new": "executed"}}
+
+    await rebuild_case_stats(db_session)
+    await db_session.commit()
+    assert await stats_groups(db_session, owner.id) == incremental
+
+    response = await client.patch("/api/cases/bulk", json={"ids": ids, "patch": {"assigned_expert_id": str(uuid.uuid4())}})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_null_status_and_constraint_violations(
+    client: AsyncClient, as_role: Callable[[UserRole], SessionUser], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    as_role(UserRole.ADMIN)
+    ids = [str(uuid.uuid4())]
+
+    response = await client.patch("/api/cases/bulk", json={"ids": ids, "patch": {"status": None}})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    async def violate(*args: object) -> list[object]:
+        raise IntegrityError("UPDATE cases", {}, Exception("foreign key violation"))
+
+    monkeypatch.setattr(CaseService, "_update_returning", violate)
+    response = await client.patch("/api/cases/bulk", json={"ids": ids, "patch": {"assigned_expert_id": None}})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not TEST_POSTGRES_URL, reason="нужен PostgreSQL: задайте TEST_POSTGRES_URL")
+async def test_deleted_expert_stats_fold_into_unassigned_group(make_case: Callable[..., Case]) -> None:
+    assert TEST_POSTGRES_URL is not None
+    engine = create_async_engine(TEST_POSTGRES_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            company = Company(name="Свод", inn=str(uuid.uuid4().int)[:12])
+            expert = User(
+                email=f"{uuid.uuid4().hex[:8]}@example.com", hashed_password="-", full_name="Эксперт", role=UserRole.EXPERT, company=company
+            )
+            owner = Client(name="Свод", type=ClientType.legal)
+            db.add_all([company, expert, owner])
+            await db.flush()
+
+            # Дела эксперта в двух месяцах и дело без эксперта в той же группе, что и одно из них
+            delta = CaseStatsDelta()
+            for assigned_user_id, start_date in [
+                (expert.id, datetime(2026, 1, 15, tzinfo=UTC)),
+                (expert.id, datetime(2026, 2, 15, tzinfo=UTC)),
+                (None, datetime(2026, 1, 20, tzinfo=UTC)),
+            ]:
+                case = make_case(
+                    owner.id,
+                    assigned_user_id=assigned_user_id,
+                    start_date=start_date,
+                    cost=Decimal("100.00"),
+                    bank_transfer_amount=Decimal("0.00"),
+                    cash_amount=Decimal("0.00"),
+                    remaining_debt=Decimal("100.00"),
+                )
+                db.add(case)
+                delta.add(case)
+            await db.flush()
+            await delta.apply(db)
+            await db.commit()
+
+            await db.execute(delete(User).where(User.id == expert.id))
+            await db.commit()
+            folded = await stats_groups(db, owner.id)
+
+            assert {(key[1], key[3], values[0]) for key, values in folded.items()} == {
+                (None, "2026-01-01", Decimal(2)),
+                (None, "2026-02-01", Decimal(1)),
+            }
+            await rebuild_case_stats(db)
+            await db.commit()
+            assert await stats_groups(db, owner.id) == folded
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
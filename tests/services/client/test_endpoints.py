@@ -1,5 +1,9 @@
+import uuid
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
 
@@ -40,3 +44,49 @@ async def test_get_client_not_found(client: AsyncClient) -> None:
     response = await client.get(f"/api/clients/{random_uuid}")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_create_client_does_not_reload_after_commit(client: AsyncClient, db_session: AsyncSession) -> None:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = await client.post("/api/clients", json={"name": "Клиент без refresh", "type": "individual", "initial_contact": None})
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["created_at"]
+    assert not [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+
+
+@pytest.mark.asyncio
+async def test_update_client_is_single_update_returning(client: AsyncClient, db_session: AsyncSession) -> None:
+    created = await client.post("/api/clients", json={"name": "До", "type": "legal", "initial_contact": None})
+    client_id = created.json()["id"]
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: object) -> None:
+        statements.append(str(args[2]).lstrip().upper())
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = await client.patch(f"/api/clients/{client_id}", json={"name": "После"})
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["name"] == "После"
+    assert response.json()["contacts"] == []
+    # Клиент не читается ни до, ни после обновления: только UPDATE ... RETURNING и загрузка контактов
+    assert [sql.split()[0] for sql in statements] == ["UPDATE", "SELECT"]
+    assert "FROM CONTACTS" in statements[1]
+
+    response = await client.patch(f"/api/clients/{uuid.uuid4()}", json={"name": "Нет такого"})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,123 @@
+import csv
+import io
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.app.core.auth.session import SessionUser
+from src.app.core.database.replica import REPLICA_SESSION_KEY
+from src.app.services.case.models import Case
+from src.app.services.client.models import Client
+from src.app.services.user.models import UserRole
+
+pytestmark = pytest.mark.usefixtures("redis_client")
+
+
+@pytest.mark.asyncio
+async def test_receivables_report_buckets_debt_by_days_past_deadline(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    as_role: Callable[[UserRole], SessionUser],
+    create_owner: Callable[[], Awaitable[Client]],
+    make_case: Callable[..., Case],
+) -> None:
+    as_role(UserRole.ACCOUNTANT)
+    owner = await create_owner()
+    now = datetime.now(UTC)
+    # Дедлайн относительно сейчас, стоимость, оплачено переводом, долг; последнее дело удалено и в отчёт не входит
+    cases = [
+        (5, "1000.00", "500.00", "500.00"),
+        (-10, "400.00", "0.00", "400.00"),
+        (-60, "250.50", "0.00", "250.50"),
+        (-120, "199.99", "100.00", "99.99"),
+    ]
+    db_session.add_all(
+        [
+            *(
+                make_case(
+                    owner.id,
+                    start_date=datetime(2025, 1, 1, tzinfo=UTC),
+                    deadline=now + timedelta(days=days),
+                    cost=Decimal(cost),
+                    bank_transfer_amount=Decimal(paid),
+                    cash_amount=Decimal("0.00"),
+                    remaining_debt=Decimal(debt),
+                )
+                for days, cost, paid, debt in cases
+            ),
+            make_case(
+                owner.id,
+                start_date=datetime(2025, 1, 1, tzinfo=UTC),
+                deadline=now - timedelta(days=10),
+                cost=Decimal("999.00"),
+                remaining_debt=Decimal("999.00"),
+                deleted_at=now,
+            ),
+        ]
+    )
+    await db_session.commit()
+    owner_id, owner_name = owner.id, owner.name
+
+    response = await client.get("/api/reports/receivables", params={"client_id": str(owner_id)})
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    expected = {
+        "cases_count": 4,
+        "cost": "1850.49",
+        "collected": "600.00",
+        "bank_transfer_amount": "600.00",
+        "cash_amount": "0.00",
+        "outstanding_debt": "1250.49",
+        "not_due": "500.00",
+        "overdue_0_30": "400.00",
+        "overdue_31_90": "250.50",
+        "overdue_90_plus": "99.99",
+    }
+    assert {field: report["total"][field] for field in expected} == expected
+    assert [(row["client_id"], row["client_name"], row["outstanding_debt"]) for row in report["clients"]] == [
+        (str(owner_id), owner_name, "1250.49")
+    ]
+    assert [(row["expert_id"], row["cases_count"]) for row in report["experts"]] == [(None, 4)]
+
+    cached = await client.get("/api/reports/receivables", params={"client_id": str(owner_id)})
+    assert cached.json() == report
+    assert "Server-Timing" not in cached.headers
+
+    export = await client.get("/api/reports/receivables/export", params={"client_id": str(owner_id)})
+    assert export.status_code == status.HTTP_200_OK
+    rows = list(csv.DictReader(io.StringIO(export.content.decode("utf-8-sig"))))
+    assert [(row["group"], row["outstanding_debt"], row["overdue_90_plus"]) for row in rows] == [
+        ("client", "1250.49", "99.99"),
+        ("expert", "1250.49", "99.99"),
+        ("total", "1250.49", "99.99"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_receivables_report_read_from_replica_is_not_cached(
+    client: AsyncClient, db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch, as_role: Callable[[UserRole], SessionUser]
+) -> None:
+    as_role(UserRole.CEO)
+    monkeypatch.setitem(db_session.info, REPLICA_SESSION_KEY, True)
+    params = {"expert_id": str(uuid.uuid4())}
+
+    await client.get("/api/reports/receivables", params=params)
+    second = await client.get("/api/reports/receivables", params=params)
+
+    assert second.headers["Server-Timing"].endswith('desc="1 queries"')
+
+
+@pytest.mark.asyncio
+async def test_receivables_export_requires_report_role(client: AsyncClient, as_role: Callable[[UserRole], SessionUser]) -> None:
+    as_role(UserRole.EXPERT)
+
+    response = await client.get("/api/reports/receivables/export")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
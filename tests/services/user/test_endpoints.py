@@ -0,0 +1,192 @@
+import json
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import msgpack
+import pytest
+from fakeredis import FakeAsyncRedis
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette import status
+
+from src.app.core.auth.security import get_hash_rounds, hash_password, password_hasher
+from src.app.core.auth.session import SessionManager
+from src.app.core.config import settings
+from src.app.services.company.models import Company
+from src.app.services.user.models import User, UserRole
+from src.app.services.user.service import UserService
+
+
+async def create_user(db_session: AsyncSession, role: UserRole = UserRole.CEO, password: str | None = None) -> User:
+    company = Company(name="ООО Тест", inn=str(uuid.uuid4().int)[:10])
+    db_session.add(company)
+    await db_session.flush()
+
+    user = User(
+        email=f"{uuid.uuid4().hex[:12]}@example.com",
+        hashed_password=hash_password(password, rounds=4) if password else "not-a-real-hash",
+        full_name="Тестовый Пользователь",
+        role=role,
+        company_id=company.id,
+        can_authenticate=True,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return user
+
+
+async def login_as(client: AsyncClient, session_manager: SessionManager, user: User) -> str:
+    session_id = await session_manager.create_session(user)
+    client.cookies.set("session_id", session_id)
+    return session_id
+
+
+@contextmanager
+def captured_sql(db_session: AsyncSession) -> Iterator[list[str]]:
+    statements: list[str] = []
+
+    def before_cursor_execute(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+async def test_get_me_with_session(client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager) -> None:
+    user = await create_user(db_session)
+    await login_as(client, session_manager, user)
+
+    response = await client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["email"] == user.email
+
+
+@pytest.mark.asyncio
+async def test_session_user_skips_db_when_snapshot_is_current(
+    client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager
+) -> None:
+    user = await create_user(db_session)
+    await login_as(client, session_manager, user)
+    db_session.expunge_all()
+
+    with captured_sql(db_session) as statements:
+        response = await client.get("/api/companies/me")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not [sql for sql in statements if "FROM users" in sql]
+
+
+@pytest.mark.asyncio
+async def test_session_ttl_slides_on_read(
+    client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager, redis_client: FakeAsyncRedis
+) -> None:
+    user = await create_user(db_session)
+    session_id = await login_as(client, session_manager, user)
+    await redis_client.expire(f"session:{session_id}", 60)
+
+    response = await client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert await redis_client.ttl(f"session:{session_id}") > 60
+
+
+@pytest.mark.asyncio
+async def test_update_access_blocks_next_request(client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager) -> None:
+    user = await create_user(db_session)
+    await login_as(client, session_manager, user)
+    assert (await client.get("/api/users/me")).status_code == status.HTTP_200_OK
+
+    await UserService(db_session).update_access(str(user.id), False)
+    response = await client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.asyncio
+async def test_logout_all_revokes_every_session(
+    client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager, redis_client: FakeAsyncRedis
+) -> None:
+    user = await create_user(db_session)
+    other_session_id = await session_manager.create_session(user)
+    session_id = await login_as(client, session_manager, user)
+
+    response = await client.post("/api/users/logout-all")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not await redis_client.exists(f"session:{session_id}", f"session:{other_session_id}", f"user_sessions:{user.id}")
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_session_is_rebuilt(
+    client: AsyncClient, db_session: AsyncSession, session_manager: SessionManager, redis_client: FakeAsyncRedis
+) -> None:
+    user = await create_user(db_session)
+    await redis_client.setex("session:legacy", 60, json.dumps({"user_id": str(user.id), "role": user.role.value}))
+    client.cookies.set("session_id", "legacy")
+
+    response = await client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_200_OK
+    stored = msgpack.unpackb(await session_manager.redis.get("session:legacy"))
+    assert stored["company_id"] == user.company_id.bytes
+    assert "legacy" in await session_manager._user_session_ids(user.id)
+
+
+@pytest.mark.asyncio
+async def test_malformed_session_payload_is_rejected(client: AsyncClient, redis_client: FakeAsyncRedis) -> None:
+    await redis_client.setex("session:broken", 60, json.dumps({"role": "ceo"}))
+    client.cookies.set("session_id", "broken")
+
+    response = await client.get("/api/users/me")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_password_hasher_is_overloaded(
+    client: AsyncClient, db_session: AsyncSession, redis_client: FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = await create_user(db_session, password="correct horse battery")
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = await client.post("/api/users/login", json={"email": user.email, "password": "correct horse battery"})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_password_with_current_cost(
+    client: AsyncClient, db_session: AsyncSession, redis_client: FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = await create_user(db_session, password="correct horse battery")
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+
+    response = await client.post("/api/users/login", json={"email": user.email, "password": "correct horse battery"})
+
+    assert response.status_code == status.HTTP_200_OK
+    await db_session.refresh(user)
+    assert get_hash_rounds(user.hashed_password) == 5
+
+
+@pytest.mark.asyncio
+async def test_login_is_rate_limited_per_email(
+    client: AsyncClient, db_session: AsyncSession, redis_client: FakeAsyncRedis, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    user = await create_user(db_session, password="correct horse battery")
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_PER_EMAIL", 2)
+
+    codes = [(await client.post("/api/users/login", json={"email": user.email, "password": "wrong"})).status_code for _ in range(3)]
+    response = await client.post("/api/users/login", json={"email": user.email, "password": "correct horse battery"})
+
+    assert codes == [status.HTTP_401_UNAUTHORIZED, status.HTTP_401_UNAUTHORIZED, status.HTTP_429_TOO_MANY_REQUESTS]
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) > 0